@@ -16,7 +16,7 @@ import vendor_setup  # noqa: F401
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, UploadFile, File, Form
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 import tempfile
@@ -29,6 +29,14 @@ from backend.smq_agent import SMQAgent
 from backend.langgraph_agent import LangGraphAgent
 from backend.tools import parse_semantic_models, read_file, edit_file, convert_smq_to_sql
 from backend.routers import semantic_router, semantic_router_v2
+from backend.semantic.utils.compile_metrics import compile_metrics
+from backend.semantic.utils.request_profiler import ProfilingMiddleware, request_profiler
+from backend.semantic.utils.tracing import tracer
+from backend.semantic.services.request_executor import (
+    ExecutorSaturated,
+    ExecutorTimeout,
+    request_executor,
+)
 
 load_dotenv()
 
@@ -38,6 +46,9 @@ app = FastAPI(title="Semantic Agent API")
 app.include_router(semantic_router)
 app.include_router(semantic_router_v2)
 
+# 요청 프로파일링 (SMQ_PROFILE_SAMPLE_RATE 확률, 또는 허용된 경우 X-Profile: 1 헤더 / ?profile=1)
+app.add_middleware(ProfilingMiddleware)
+
 # CORS 설정
 app.add_middleware(
     CORSMiddleware,
@@ -205,6 +216,8 @@ class ExecuteSQLResult(BaseModel):
 
 class ExecutePostgreSQLRequest(BaseModel):
     sql: str
+    # parameterize=True로 생성한 SQL의 bind 값 (placeholder %s 순서). 있으면 prepared statement로 실행
+    params: Optional[List[Any]] = None
 
 class ExecutePostgreSQLResult(BaseModel):
     success: bool
@@ -396,6 +409,30 @@ async def root():
         return FileResponse(frontend_index)
     return {"message": "Semantic Agent API"}
 
+@app.exception_handler(ExecutorSaturated)
+async def executor_saturated_handler(request, exc: ExecutorSaturated):
+    """request_executor가 가득 찬 경우 429와 Retry-After로 응답합니다."""
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after_s)},
+    )
+
+@app.exception_handler(ExecutorTimeout)
+async def executor_timeout_handler(request, exc: ExecutorTimeout):
+    """request_executor 작업이 제한 시간을 넘은 경우 504로 응답합니다."""
+    return JSONResponse(status_code=504, content={"detail": str(exc)})
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_api():
+    """
+    SMQ 변환 지표(단계별 소요 시간 histogram, 성공/실패, JoinError 분할, 캐시 hit/miss)를
+    Prometheus text exposition 형식으로 반환합니다.
+    """
+    return PlainTextResponse(
+        compile_metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
 @app.get("/api/files")
 async def list_files():
     """Playground 디렉토리의 모든 파일 목록 반환"""
@@ -499,7 +536,7 @@ async def edit_file_endpoint(request: EditRequest):
 @app.post("/api/parse")
 async def parse_models():
     """Semantic Model 파싱"""
-    result = parse_semantic_models(PLAYGROUND_DIR)
+    result = await request_executor.run(parse_semantic_models, PLAYGROUND_DIR)
     return result
 
 @app.post("/api/ddl/create")
@@ -747,12 +784,16 @@ def combine_smq_prompt_parts(parts: Dict[str, Any]) -> str:
 async def convert_smq_endpoint(request: SMQConvertRequest):
     """SMQ를 SQL 쿼리로 변환"""
     try:
-        result = convert_smq_to_sql(
+        # CPU 바운드 작업이므로 request_executor에서 실행 (포화 시 429, 제한 시간 초과 시 504)
+        result = await request_executor.run(
+            convert_smq_to_sql,
             smq_json=request.smq,
             manifest_path=request.manifest_path,
             dialect=request.dialect
         )
         return result
+    except (ExecutorSaturated, ExecutorTimeout):
+        raise
     except Exception as e:
         import traceback
         raise HTTPException(
@@ -761,6 +802,38 @@ async def convert_smq_endpoint(request: SMQConvertRequest):
             headers={"X-Traceback": traceback.format_exc()}
         )
 
+def _execute_prepared(cursor, sql: str, params: List[Any]) -> None:
+    """
+    %s placeholder SQL을 서버 prepared statement(PREPARE/EXECUTE)로 실행합니다.
+    psycopg2의 execute(sql, params)는 값을 클라이언트에서 SQL에 채워 보내므로, 값마다 다른 SQL로 파싱/계획됩니다.
+    """
+    import hashlib
+    import re
+
+    position = 0
+
+    def to_positional(match):
+        nonlocal position
+        if match.group(0) == "%%":
+            return "%"
+        position += 1
+        return f"${position}"
+
+    # PREPARE 본문은 PostgreSQL이 직접 읽으므로 %s -> $n, %% -> % 로 바꿉니다.
+    statement = re.sub(r"%%|%s", to_positional, sql)
+    if position != len(params):
+        raise ValueError(f"placeholder 개수({position})와 params 개수({len(params)})가 다릅니다.")
+
+    name = "smq_" + hashlib.sha1(statement.encode("utf-8")).hexdigest()[:16]
+    cursor.execute("SELECT 1 FROM pg_prepared_statements WHERE name = %s", (name,))
+    if cursor.fetchone() is None:
+        cursor.execute(f"PREPARE {name} AS {statement}")
+    if params:
+        cursor.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+    else:
+        cursor.execute(f"EXECUTE {name}")
+
+
 @app.post("/api/smq/execute", response_model=ExecutePostgreSQLResult)
 async def execute_sql_endpoint(request: ExecutePostgreSQLRequest):
     """생성된 SQL 쿼리를 PostgreSQL 데이터베이스에서 실행"""
@@ -786,19 +859,21 @@ async def execute_sql_endpoint(request: ExecutePostgreSQLRequest):
         cleaned_sql = cleaned_sql.strip()
         
         # Oracle SQL을 PostgreSQL로 변환 (필요한 경우)
-        try:
-            import sqlglot
-            # Oracle dialect로 파싱 시도
+        # bind 값이 있는 SQL은 이미 postgres용으로 생성된 것이고 placeholder(%s)는 sqlglot이 읽지 못하므로 변환하지 않습니다.
+        if request.params is None:
             try:
-                parsed = sqlglot.parse_one(cleaned_sql, dialect='oracle')
-                # PostgreSQL로 변환
-                cleaned_sql = parsed.sql(dialect='postgres')
-            except Exception:
-                # Oracle 파싱 실패 시 그대로 사용 (이미 PostgreSQL일 수도 있음)
+                import sqlglot
+                # Oracle dialect로 파싱 시도
+                try:
+                    parsed = sqlglot.parse_one(cleaned_sql, dialect='oracle')
+                    # PostgreSQL로 변환
+                    cleaned_sql = parsed.sql(dialect='postgres')
+                except Exception:
+                    # Oracle 파싱 실패 시 그대로 사용 (이미 PostgreSQL일 수도 있음)
+                    pass
+            except ImportError:
+                # sqlglot이 없으면 그대로 사용
                 pass
-        except ImportError:
-            # sqlglot이 없으면 그대로 사용
-            pass
         
         # PostgreSQL 연결 및 쿼리 실행
         try:
@@ -840,10 +915,15 @@ async def execute_sql_endpoint(request: ExecutePostgreSQLRequest):
             cursor = conn.cursor(cursor_factory=RealDictCursor)
             
             try:
-                cursor.execute(cleaned_sql)
+                if request.params is not None:
+                    _execute_prepared(cursor, cleaned_sql, request.params)
+                    is_select = cursor.description is not None
+                else:
+                    cursor.execute(cleaned_sql)
+                    is_select = cleaned_sql.strip().upper().startswith('SELECT')
                 
                 # SELECT 쿼리인 경우 결과 반환
-                if cleaned_sql.strip().upper().startswith('SELECT'):
+                if is_select:
                     rows = cursor.fetchall()
                     columns = list(rows[0].keys()) if rows else []
                     rows_data = [[row[col] for col in columns] for row in rows] if rows else []
@@ -1232,8 +1312,24 @@ async def websocket_chat(websocket: WebSocket):
                     cancelled = True
                     raise
             
-            # Agent 실행 Task 생성
+            # 메시지에 "profile": true가 있거나(opt-in 허용 또는 "profile_token"이 맞을 때) sample_rate로 뽑히면
+            # 이번 메시지 처리(agent 노드, SMQ 변환)를 프로파일링합니다.
+            profile_session = request_profiler.start(
+                data.get("request_id"),
+                bool(data.get("profile")),
+                label=f"ws/chat {agent_type}",
+                token=data.get("profile_token"),
+            )
+
+            # 메시지 처리 전체를 root span으로 남깁니다. (tracing이 꺼져 있으면 no-op)
+            chat_span = tracer.span("agent.chat", agent_type=agent_type)
+
+            # Agent 실행 Task 생성 (Task는 생성 시점의 contextvars를 복사하므로 프로파일 session과 span을 이어받습니다.)
+            profile_token = request_profiler.activate(profile_session)
+            span_token = tracer.activate(chat_span)
             agent_task = asyncio.create_task(run_agent())
+            tracer.deactivate(span_token)
+            request_profiler.deactivate(profile_token)
             
             try:
                 await agent_task
@@ -1253,6 +1349,18 @@ async def websocket_chat(websocket: WebSocket):
                     "content": f"Agent 실행 오류: {str(e)}"
                 })
                 continue
+            finally:
+                chat_span.end()
+                if profile_session is not None:
+                    profile = await asyncio.get_running_loop().run_in_executor(
+                        None, request_profiler.finish, profile_session
+                    )
+                    if profile is not None:
+                        await websocket.send_json({
+                            "type": "profile",
+                            "content": profile["request_id"],
+                            "total_ms": profile["total_ms"]
+                        })
             
             # 에러가 발생하지 않았고 취소되지 않은 경우에만 complete 이벤트 전송
             if not cancelled and not error_occurred:
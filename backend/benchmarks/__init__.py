@@ -0,0 +1 @@
+"""SMQ 컴파일 경로 성능 측정 스크립트 모음"""
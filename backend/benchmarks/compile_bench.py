@@ -0,0 +1,367 @@
+"""
+SMQ → SQL 컴파일 경로 벤치마크
+
+prepare_smq_to_sql을 케이스별로 반복 실행해 ops/sec, p50/p95 지연 시간, 최대 메모리(tracemalloc peak)를 재고
+결과를 JSON으로 남깁니다. 저장해 둔 결과(--baseline)와 비교해서 p50이 --max-regression 배를 넘게 느려진
+케이스가 있으면 exit code 1로 실패합니다.
+
+- compile_cache는 쓰지 않고(use_cache=False) 매번 새로 변환합니다.
+  측정 전에 케이스마다 compile_cache hit 결과가 새로 변환한 결과와 같은지(params 포함) 한 번 확인하고, 다르면 실패로 기록합니다.
+- manifest는 manifest_registry에 한 번 등록하고 manifest_id로 넘깁니다. (요청마다 manifest를 다시 해시하지 않는 운영 경로)
+- INFO 로그는 끕니다. (--with-logging으로 켤 수 있습니다.)
+
+사용법 (repo 루트에서):
+    python -m backend.benchmarks.compile_bench
+    python -m backend.benchmarks.compile_bench --output bench.json
+    python -m backend.benchmarks.compile_bench --baseline bench.json --max-regression 1.2
+    python -m backend.benchmarks.compile_bench --case filter_heavy --dialect postgres --iterations 200
+    python -m backend.benchmarks.compile_bench --manifest other_manifest.json --workload workload.json
+
+--workload 파일은 [{"name": ..., "smq": {...}, "cte": true, "parameterize": false}] 형식의 JSON 목록입니다. (cte, parameterize는 생략 가능)
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+for path in (str(REPO_ROOT), str(REPO_ROOT / "backend")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+DEFAULT_MANIFEST = REPO_ROOT / "backend" / "playground" / "semantic_manifest.json"
+DEFAULT_ITERATIONS = int(os.getenv("COMPILE_BENCH_ITERATIONS", "50"))
+DEFAULT_WARMUP = int(os.getenv("COMPILE_BENCH_WARMUP", "5"))
+DEFAULT_MAX_REGRESSION = float(os.getenv("COMPILE_BENCH_MAX_REGRESSION", "1.2"))
+
+
+def default_cases(manifest: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """playground manifest 기준 케이스 (이름, SMQ, cte)"""
+    deposit_dimensions = [
+        f"deposit__{dimension['name']}"
+        for model in manifest.get("semantic_models", [])
+        if model["name"] == "deposit"
+        for dimension in model.get("dimensions", [])
+    ]
+    metric_names = [metric["name"] for metric in manifest.get("metrics", [])]
+    multi_model_join = {
+        "metrics": ["total_acco_bal", "branch__brn_stcd", "goods__dep_gds_gpcd"],
+        "group_by": ["branch__brn_stcd", "goods__dep_gds_gpcd"],
+        "filters": ["deposit__base_dt = '20240131'"],
+    }
+    return [
+        {
+            # 단일 model의 simple metric + dimension
+            "name": "single_model_metric",
+            "smq": {
+                "metrics": ["total_acco_bal", "avg_aply_rt", "deposit__gds_type"],
+                "group_by": ["deposit__gds_type"],
+            },
+        },
+        {
+            # derived metric(다른 metric을 참조하는 metric)과 그 위의 식
+            "name": "derived_metric_chain",
+            "smq": {
+                "metrics": [
+                    "avg_tax_inv_unit_price",
+                    "total_tax_inv_vat_refund_amt",
+                    "avg_tax_inv_unit_price * 100 / NULLIF(total_tax_inv_vat_refund_amt, 0) AS unit_price_ratio",
+                    "tax_inv__com_nm",
+                ],
+                "group_by": ["tax_inv__com_nm"],
+                "order_by": ["-unit_price_ratio"],
+            },
+        },
+        {
+            # 여러 model을 default join(add_default_join)으로 묶는 경우
+            "name": "multi_model_default_join",
+            "smq": multi_model_join,
+        },
+        {
+            # 서로 join 할 수 없는 model들 -> JoinError로 model set별 SMQ로 나눠 변환
+            "name": "join_error_distributed",
+            "smq": {
+                "metrics": ["total_acco_bal", "total_tax_inv_amt", "deposit__base_dt"],
+                "group_by": ["deposit__base_dt"],
+            },
+        },
+        {
+            # filter가 많은 경우 (push_down_predicates, subquery, metric filter)
+            "name": "filter_heavy",
+            "smq": {
+                "metrics": ["total_acco_bal", "avg_aply_rt", "deposit__gds_type", "deposit__base_dt"],
+                "group_by": ["deposit__gds_type", "deposit__base_dt"],
+                "filters": [
+                    "deposit__base_dt >= '20240101'",
+                    "deposit__base_dt <= '20241231'",
+                    "deposit__gds_type IN ('A', 'B', 'C', 'D')",
+                    "deposit__gds_type <> 'Z'",
+                    "deposit__acco_bal > 0",
+                    "deposit__aply_rt BETWEEN 0.5 AND 10",
+                    "deposit__gds_type LIKE 'A%' OR deposit__gds_type LIKE 'B%'",
+                    "deposit__base_dt IN (SELECT MAX(deposit__base_dt) FROM deposit)",
+                    "total_acco_bal > 1000",
+                    "avg_aply_rt < 5",
+                ],
+                "order_by": ["-total_acco_bal"],
+                "limit": 100,
+            },
+        },
+        {
+            # 칼럼이 많은 SMQ (metric 20개 + deposit dimension 15개)
+            "name": "wide_projection",
+            "smq": {
+                "metrics": metric_names[:20] + deposit_dimensions[:15],
+                "group_by": deposit_dimensions[:15],
+            },
+        },
+        {
+            # multi_model_default_join을 CTE 대신 인라인 뷰로 (conver_cte_to_inline)
+            "name": "multi_model_default_join_inline",
+            "smq": multi_model_join,
+            "cte": False,
+        },
+        {
+            # filter 값을 bind 변수로 뺀 SQL (parameterize=True, 결과에 params 포함)
+            "name": "filter_heavy_parameterized",
+            "smq": {
+                "metrics": ["total_acco_bal", "deposit__gds_type"],
+                "group_by": ["deposit__gds_type"],
+                "filters": ["deposit__base_dt = '20240131'", "deposit__gds_type IN ('A', 'B')"],
+            },
+            "parameterize": True,
+        },
+    ]
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_case(
+    case: Dict[str, Any],
+    manifest_id: str,
+    dialect: str,
+    iterations: int,
+    warmup: int,
+    optimize: str,
+) -> Dict[str, Any]:
+    from backend.semantic.services.smq2sql_service import prepare_smq_to_sql
+
+    cte = case.get("cte", True)
+    parameterize = case.get("parameterize", False)
+    smq_json = json.dumps(case["smq"], ensure_ascii=False)
+
+    def compile_once(use_cache: bool = False) -> Dict[str, Any]:
+        # 요청마다 새 dict가 들어오는 것과 같게 매번 SMQ를 새로 만듭니다.
+        return prepare_smq_to_sql(
+            json.loads(smq_json),
+            None,
+            dialect,
+            cte,
+            use_cache=use_cache,
+            manifest_id=manifest_id,
+            optimize=optimize,
+            parameterize=parameterize,
+        )
+
+    result = compile_once()
+    if not result.get("success"):
+        return {"success": False, "error": result.get("error", "Unknown error")}
+    # 첫 호출은 cache에 넣고 두 번째 호출은 cache hit입니다. 둘 다 새로 변환한 결과와 같아야 합니다.
+    for _ in range(2):
+        if compile_once(use_cache=True).get("results") != result["results"]:
+            return {"success": False, "error": "compile_cache hit result differs from a fresh compile"}
+    query_count = len(result["results"]["queries"])
+
+    for _ in range(warmup):
+        compile_once()
+
+    gc.collect()
+    samples_ms = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        compile_once()
+        samples_ms.append((time.perf_counter() - t0) * 1000)
+    elapsed = time.perf_counter() - started
+
+    # tracemalloc은 실행을 느리게 하므로 시간 측정과 따로 한 번만 잽니다.
+    gc.collect()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        compile_once()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    samples_ms.sort()
+    return {
+        "success": True,
+        "cte": cte,
+        "queries": query_count,
+        "iterations": iterations,
+        "ops_per_sec": iterations / elapsed if elapsed > 0 else 0.0,
+        "mean_ms": statistics.fmean(samples_ms),
+        "p50_ms": _percentile(samples_ms, 0.50),
+        "p95_ms": _percentile(samples_ms, 0.95),
+        "min_ms": samples_ms[0],
+        "max_ms": samples_ms[-1],
+        "peak_kib": peak_bytes / 1024,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=str(REPO_ROOT),
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def run(
+    manifest_path: Path,
+    cases: List[Dict[str, Any]],
+    dialect: str,
+    iterations: int,
+    warmup: int,
+    optimize: str,
+) -> Dict[str, Any]:
+    from backend.semantic.services.manifest_registry import manifest_registry
+
+    registered = manifest_registry.register(manifest_path.read_text(encoding="utf-8"))
+    results = {}
+    for case in cases:
+        results[case["name"]] = run_case(
+            case, registered.manifest_id, dialect, iterations, warmup, optimize
+        )
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "manifest": str(manifest_path),
+            "dialect": dialect,
+            "optimize": optimize,
+            "iterations": iterations,
+            "warmup": warmup,
+        },
+        "cases": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], max_regression: float) -> List[str]:
+    """baseline 대비 p50 비율을 출력하고, max_regression 배를 넘은 케이스 이름 목록을 반환합니다."""
+    regressed = []
+    print(f"\nvs baseline ({baseline.get('meta', {}).get('git_commit')}), max regression x{max_regression:.2f}:")
+    for name, result in current["cases"].items():
+        base = baseline.get("cases", {}).get(name)
+        if not result.get("success") or not base or not base.get("success"):
+            print(f"  {name:36s}  (no comparable baseline)")
+            continue
+        ratio = result["p50_ms"] / base["p50_ms"] if base["p50_ms"] > 0 else float("inf")
+        mark = ""
+        if ratio > max_regression:
+            regressed.append(name)
+            mark = "  <-- REGRESSION"
+        print(f"  {name:36s}  p50 {base['p50_ms']:8.2f} -> {result['p50_ms']:8.2f} ms  x{ratio:.2f}{mark}")
+    return regressed
+
+
+def _print_table(report: Dict[str, Any]) -> None:
+    meta = report["meta"]
+    print(
+        f"dialect={meta['dialect']} optimize={meta['optimize']} "
+        f"iterations={meta['iterations']} commit={meta['git_commit']}"
+    )
+    print(f"  {'case':36s}  {'ops/s':>8s}  {'p50 ms':>8s}  {'p95 ms':>8s}  {'peak KiB':>9s}  queries")
+    for name, result in report["cases"].items():
+        if not result.get("success"):
+            print(f"  {name:36s}  FAILED: {result.get('error')}")
+            continue
+        print(
+            f"  {name:36s}  {result['ops_per_sec']:8.1f}  {result['p50_ms']:8.2f}  "
+            f"{result['p95_ms']:8.2f}  {result['peak_kib']:9.1f}  {result['queries']}"
+        )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="SMQ → SQL 컴파일 벤치마크")
+    parser.add_argument("--manifest", type=Path, default=DEFAULT_MANIFEST)
+    parser.add_argument("--workload", type=Path, help="추가 케이스 JSON 목록 [{name, smq, cte?}]")
+    parser.add_argument("--no-default-cases", action="store_true", help="--workload 케이스만 실행")
+    parser.add_argument("--case", action="append", default=[], help="실행할 케이스 이름 (여러 번 지정 가능)")
+    parser.add_argument("--dialect", default="bigquery")
+    parser.add_argument("--optimize", default="none")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP)
+    parser.add_argument("--output", type=Path, help="결과 JSON 파일 경로")
+    parser.add_argument("--baseline", type=Path, help="비교할 이전 결과 JSON 파일 경로")
+    parser.add_argument("--max-regression", type=float, default=DEFAULT_MAX_REGRESSION)
+    parser.add_argument("--with-logging", action="store_true", help="INFO 로그를 끄지 않습니다.")
+    args = parser.parse_args(argv)
+
+    if not args.with_logging:
+        logging.disable(logging.INFO)
+
+    manifest = json.loads(args.manifest.read_text(encoding="utf-8"))
+    cases = [] if args.no_default_cases else default_cases(manifest)
+    if args.workload:
+        cases += json.loads(args.workload.read_text(encoding="utf-8"))
+    if args.case:
+        unknown = sorted(set(args.case) - {case["name"] for case in cases})
+        if unknown:
+            parser.error(f"unknown case(s): {unknown}")
+        cases = [case for case in cases if case["name"] in args.case]
+
+    report = run(
+        args.manifest,
+        cases,
+        args.dialect,
+        max(1, args.iterations),
+        max(0, args.warmup),
+        args.optimize,
+    )
+    _print_table(report)
+
+    if args.output:
+        args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\nwrote {args.output}")
+
+    failed = [name for name, result in report["cases"].items() if not result.get("success")]
+    if failed:
+        print(f"FAIL: cases failed to compile: {failed}")
+    regressed = []
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressed = compare(report, baseline, args.max_regression)
+        if regressed:
+            print(f"FAIL: p50 regressed more than x{args.max_regression:.2f}: {regressed}")
+    return 1 if failed or regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+SMQ 컴파일 경로의 cold start(import) 시간 측정
+
+새 python 프로세스에서 `python -X importtime -c "import <module>"`을 여러 번 실행해
+대상 모듈의 누적 import 시간(중앙값)을 재고, 예산을 넘거나 컴파일 경로에서 쓰지 않아야 할
+무거운 모듈(pandas 등)이 import 되면 exit code 1로 실패합니다.
+
+사용법 (repo 루트에서):
+    python -m backend.benchmarks.import_time
+    python -m backend.benchmarks.import_time --budget-ms 400 --runs 7
+    IMPORT_TIME_BUDGET_MS=400 python -m backend.benchmarks.import_time
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_MODULE = "backend.semantic.services.smq2sql_service"
+DEFAULT_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "600"))
+DEFAULT_RUNS = int(os.getenv("IMPORT_TIME_RUNS", "5"))
+
+# 컴파일 경로에서 import 되면 안 되는 모듈 (lazy import 대상)
+FORBIDDEN_MODULES = (
+    "pandas",
+    "numpy",
+    "yaml",
+    "sqlglot.optimizer",
+    "backend.semantic.model_manager.linter",
+    "backend.semantic.model_manager.draft",
+)
+
+
+def _run_importtime(module: str) -> List[Tuple[str, int, int]]:
+    """새 프로세스에서 module을 import 하고 (모듈 이름, self us, cumulative us) 목록을 반환합니다."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [str(REPO_ROOT), str(REPO_ROOT / "backend"), env.get("PYTHONPATH", "")]
+    ).rstrip(os.pathsep)
+    # 이미 컴파일된 .pyc를 쓰는 실제 배포 환경과 맞추기 위해 바이트코드 캐시는 그대로 둡니다.
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=str(REPO_ROOT),
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{completed.stderr[-2000:]}")
+
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time:       542 |     414485 | backend.semantic.services.smq2sql_service"
+        head, cumulative_us, name = line.split("|", 2)
+        rows.append((name.strip(), int(head.split(":", 1)[1]), int(cumulative_us)))
+    return rows
+
+
+def measure(module: str, runs: int) -> Dict:
+    totals_ms: List[float] = []
+    last_rows: List[Tuple[str, int, int]] = []
+    for _ in range(runs):
+        rows = _run_importtime(module)
+        # 마지막 줄이 최상위 import(module 자신)의 누적 시간
+        totals_ms.append(rows[-1][2] / 1000)
+        last_rows = rows
+
+    imported = {name for name, _, _ in last_rows}
+    forbidden = sorted(
+        name
+        for name in imported
+        if any(name == prefix or name.startswith(prefix + ".") for prefix in FORBIDDEN_MODULES)
+    )
+    slowest = sorted(last_rows, key=lambda row: row[1], reverse=True)[:15]
+    return {
+        "median_ms": statistics.median(totals_ms),
+        "min_ms": min(totals_ms),
+        "max_ms": max(totals_ms),
+        "forbidden": forbidden,
+        "slowest": slowest,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="SMQ 컴파일 경로 import 시간 예산 검사")
+    parser.add_argument("--module", default=DEFAULT_MODULE)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    args = parser.parse_args(argv)
+
+    result = measure(args.module, max(1, args.runs))
+
+    print(f"module: {args.module}")
+    print(
+        f"import time (ms): median={result['median_ms']:.1f} "
+        f"min={result['min_ms']:.1f} max={result['max_ms']:.1f} budget={args.budget_ms:.1f}"
+    )
+    print("slowest modules (self ms):")
+    for name, self_us, cumulative_us in result["slowest"]:
+        print(f"  {self_us / 1000:8.1f}  {cumulative_us / 1000:8.1f}  {name}")
+
+    failed = False
+    if result["forbidden"]:
+        print(f"FAIL: compile path imports lazy-only modules: {result['forbidden']}")
+        failed = True
+    if result["median_ms"] > args.budget_ms:
+        print(f"FAIL: median import time {result['median_ms']:.1f}ms > budget {args.budget_ms:.1f}ms")
+        failed = True
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
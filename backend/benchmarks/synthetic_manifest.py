@@ -0,0 +1,655 @@
+"""
+합성(synthetic) semantic model 프로젝트 생성기
+
+운영 규모(semantic model 300개, metric 5,000개 수준)의 프로젝트를 만들어서 assemble_manifest,
+lint_semantic_models, smq_to_sql이 규모에 따라 어떻게 느려지는지 잴 때 사용합니다.
+같은 --seed면 항상 같은 파일이 만들어집니다.
+
+출력 디렉터리 구성 (assemble_manifest / lint_semantic_models가 읽는 형식 그대로):
+    sources.yml                 source 하나, model마다 테이블 하나 (stats.row_count 포함)
+    ddl.sql                     -- postgres 주석 + model별 CREATE TABLE (모든 컬럼이 dimension/measure/entity에서 쓰임)
+    semantic_models/<model>.yml semantic model 하나 + 그 model의 metrics
+    semantic_manifest.json      assemble_manifest 결과 (--no-manifest로 생략)
+    workload.json               compile_bench --workload 형식의 SMQ 목록 [{name, smq, cte?}]
+
+- entity 그래프: component(--components)마다 model들이 트리를 이룹니다. 각 model은 앞선 model 하나의
+  primary entity를 같은 이름의 foreign entity로 가지므로 find_join_path/JoinGraph가 부모-자식 model을 조인합니다.
+  workload에는 root까지의 경로 전체를 요청하는 여러 단계 조인과, 중간(bridge) model이 빠졌거나
+  component가 달라서 조인할 수 없는 model 조합(JoinError 분할 변환)이 함께 들어갑니다.
+- metric: model마다 simple metric(SUM/AVG/MAX/COUNT)을 만들고, 그 위에 --derived-depth 단계의
+  derived metric 사슬(앞 단계 derived metric + simple metric)을 쌓습니다.
+- --identifiers ko면 model/dimension/measure/metric 이름을 한글로 만듭니다. (테이블/컬럼은 항상 영문)
+
+사용법 (repo 루트에서):
+    python -m backend.benchmarks.synthetic_manifest --out /tmp/synthetic
+    python -m backend.benchmarks.synthetic_manifest --out /tmp/synthetic --models 300 --metrics 5000 --derived-depth 4
+    python -m backend.benchmarks.synthetic_manifest --out /tmp/synthetic --identifiers ko --components 3
+    python -m backend.benchmarks.compile_bench --manifest /tmp/synthetic/semantic_manifest.json \\
+        --workload /tmp/synthetic/workload.json --no-default-cases
+
+    # 여러 규모로 만들어서 assemble_manifest / lint / smq_to_sql 시간을 비교
+    python -m backend.benchmarks.synthetic_manifest --scale 10:100 --scale 100:1000 --scale 300:5000
+"""
+import argparse
+import json
+import logging
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+for path in (str(REPO_ROOT), str(REPO_ROOT / "backend")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+import yaml  # noqa: E402
+
+
+SOURCE_NAME = "synthetic"
+SCHEMA_NAME = "synthetic"
+
+# (영문 이름, 한글 이름)
+SUBJECTS = [
+    ("customer", "고객"),
+    ("account", "계좌"),
+    ("branch", "지점"),
+    ("product", "상품"),
+    ("order", "주문"),
+    ("payment", "결제"),
+    ("card", "카드"),
+    ("loan", "대출"),
+    ("deposit", "예금"),
+    ("employee", "직원"),
+    ("region", "지역"),
+    ("channel", "채널"),
+    ("campaign", "캠페인"),
+    ("contract", "계약"),
+    ("invoice", "세금계산서"),
+    ("merchant", "가맹점"),
+]
+DIMENSIONS = [
+    ("status_cd", "상태코드"),
+    ("type_cd", "유형코드"),
+    ("grade_cd", "등급코드"),
+    ("region_cd", "지역코드"),
+    ("channel_cd", "채널코드"),
+    ("open_dt", "개설일자"),
+    ("close_dt", "해지일자"),
+    ("mgr_emp_no", "관리직원번호"),
+    ("currency_cd", "통화코드"),
+    ("segment_cd", "세그먼트코드"),
+    ("use_yn", "사용여부"),
+    ("reg_dt", "등록일자"),
+]
+MEASURES = [
+    ("bal_amt", "잔액"),
+    ("tx_amt", "거래금액"),
+    ("fee_amt", "수수료"),
+    ("int_rt", "이율"),
+    ("tx_cnt", "거래건수"),
+    ("limit_amt", "한도금액"),
+    ("dly_amt", "연체금액"),
+    ("pnt_amt", "포인트"),
+]
+AGGREGATIONS = [
+    ("SUM", "total", "합계"),
+    ("AVG", "avg", "평균"),
+    ("MAX", "max", "최대"),
+    ("COUNT", "count", "건수"),
+]
+
+
+class SyntheticProject:
+    """
+    생성할 프로젝트의 내용 (파일로 쓰기 전)
+
+    - models: semantic model dict 목록 (yml에 쓰는 형식), metrics_by_model: model 이름 -> metric dict 목록
+    - parents: model 이름 -> foreign entity로 조인하는 부모 model 이름 (component의 root는 None)
+    - components: component별 model 이름 목록 (앞쪽이 root)
+    """
+
+    def __init__(self, identifiers: str):
+        self.identifiers = identifiers
+        self.models: List[Dict[str, Any]] = []
+        self.metrics_by_model: Dict[str, List[Dict[str, Any]]] = {}
+        self.tables: Dict[str, List[Tuple[str, str]]] = {}
+        self.row_counts: Dict[str, int] = {}
+        self.parents: Dict[str, Optional[str]] = {}
+        self.components: List[List[str]] = []
+        self.simple_metrics: Dict[str, List[str]] = {}
+        self.derived_chains: Dict[str, List[str]] = {}
+
+    def name(self, pair: Tuple[str, str]) -> str:
+        return pair[1] if self.identifiers == "ko" else pair[0]
+
+    @property
+    def metric_count(self) -> int:
+        return sum(len(metrics) for metrics in self.metrics_by_model.values())
+
+    def depth(self, model: str) -> int:
+        depth = 0
+        while self.parents.get(model):
+            model = self.parents[model]
+            depth += 1
+        return depth
+
+
+def _split_evenly(total: int, parts: int) -> List[int]:
+    base, extra = divmod(total, parts)
+    return [base + (1 if i < extra else 0) for i in range(parts)]
+
+
+def build_project(
+    models: int = 30,
+    metrics: int = 300,
+    derived_depth: int = 3,
+    dimensions: int = 8,
+    measures: int = 4,
+    components: int = 1,
+    identifiers: str = "en",
+    seed: int = 0,
+) -> SyntheticProject:
+    """파일을 쓰지 않고 프로젝트 내용만 만듭니다. (metric 수는 model마다 최소 1개가 되도록 올려 잡힙니다.)"""
+    if models < 1:
+        raise ValueError("models는 1 이상이어야 합니다.")
+    rng = random.Random(seed)
+    project = SyntheticProject(identifiers)
+    components = max(1, min(components, models))
+    dimensions = max(1, min(dimensions, len(DIMENSIONS)))
+    measures = max(1, min(measures, len(MEASURES)))
+    derived_depth = max(0, derived_depth)
+
+    model_names = []
+    for index in range(models):
+        subject = SUBJECTS[index % len(SUBJECTS)]
+        model_names.append(f"{project.name(subject)}_{index:03d}")
+
+    # component마다 앞 model이 root, 나머지는 같은 component의 앞선 model 하나를 부모로 가집니다.
+    for component_index in range(components):
+        members = model_names[component_index::components]
+        project.components.append(members)
+        for position, model in enumerate(members):
+            project.parents[model] = rng.choice(members[:position]) if position else None
+
+    metric_budget = _split_evenly(max(metrics, models), models)
+    for index, model in enumerate(model_names):
+        table = f"tb_{SUBJECTS[index % len(SUBJECTS)][0]}_{index:03d}"
+        key_column = f"{SUBJECTS[index % len(SUBJECTS)][0]}_{index:03d}_id"
+        entity = f"{model}_key"
+        columns = [(key_column, "varchar(20)"), ("base_dt", "varchar(8)")]
+        entities = [{"name": entity, "type": "primary", "expr": key_column}]
+
+        parent = project.parents[model]
+        if parent is not None:
+            parent_key = project.models[model_names.index(parent)]["entities"][0]
+            columns.append((parent_key["expr"], "varchar(20)"))
+            entities.append({"name": parent_key["name"], "type": "foreign", "expr": parent_key["expr"]})
+
+        dimension_list = [
+            {
+                "name": project.name(("base_dt", "기준일자")),
+                "type": "varchar",
+                "label": "기준일자",
+                "expr": "base_dt",
+                "description": "기준일자 (YYYYMMDD)",
+            }
+        ]
+        for pair in rng.sample(DIMENSIONS, dimensions):
+            columns.append((pair[0], "varchar(20)"))
+            dimension_list.append(
+                {
+                    "name": project.name(pair),
+                    "type": "varchar",
+                    "label": pair[1],
+                    "expr": pair[0],
+                    "description": f"{pair[1]} ({pair[0]})",
+                }
+            )
+        # entity 컬럼(자기 key, 부모 key)도 dimension으로 노출해서 DDL의 모든 컬럼이 쓰이게 합니다.
+        for column in [entity_def["expr"] for entity_def in entities]:
+            dimension_list.append(
+                {
+                    "name": f"{column}_dim",
+                    "type": "varchar",
+                    "label": f"{column} 식별자",
+                    "expr": column,
+                    "description": f"{column} 식별자",
+                }
+            )
+
+        measure_list = []
+        for pair in rng.sample(MEASURES, measures):
+            columns.append((pair[0], "decimal(18, 2)"))
+            measure_list.append(
+                {
+                    "name": project.name(pair),
+                    "label": pair[1],
+                    "type": "decimal",
+                    "description": f"{pair[1]} ({pair[0]})",
+                    "expr": pair[0],
+                }
+            )
+
+        project.tables[table] = columns
+        project.row_counts[table] = 10 ** rng.randint(3, 8)
+        project.models.append(
+            {
+                "name": model,
+                "table": f"{SOURCE_NAME}('{table}')",
+                "description": f"합성 semantic model {model} ({table})",
+                "entities": entities,
+                "dimensions": dimension_list,
+                "measures": measure_list,
+            }
+        )
+        _add_metrics(project, model, measure_list, metric_budget[index], derived_depth)
+    return project
+
+
+def _add_metrics(
+    project: SyntheticProject,
+    model: str,
+    measure_list: List[Dict[str, Any]],
+    budget: int,
+    derived_depth: int,
+) -> None:
+    """
+    model의 metric을 budget개 만듭니다. derived 사슬에 쓸 만큼(derived_depth)을 먼저 떼어 두고
+    나머지는 measure x 집계 함수 조합의 simple metric으로 채웁니다.
+    """
+    derived_count = min(derived_depth, budget - 1) if budget > 1 else 0
+    simple_count = budget - derived_count
+    metric_list: List[Dict[str, Any]] = []
+    simple_names: List[str] = []
+
+    for index in range(simple_count):
+        measure = measure_list[index % len(measure_list)]
+        function, prefix, label = AGGREGATIONS[(index // len(measure_list)) % len(AGGREGATIONS)]
+        round_no = index // (len(measure_list) * len(AGGREGATIONS))
+        suffix = f"_{round_no}" if round_no else ""
+        name = f"{prefix}_{model}_{measure['name']}{suffix}"
+        argument = f"{model}__{measure['name']}"
+        metric_list.append(
+            {
+                "name": name,
+                "description": f"{measure['label']} {label}",
+                "type": "integer" if function == "COUNT" else "decimal",
+                "metric_type": "simple",
+                "label": f"{measure['label']} {label}",
+                "expr": f"COUNT(DISTINCT {argument})" if function == "COUNT" else f"{function}({argument})",
+            }
+        )
+        simple_names.append(name)
+
+    # 1단계는 simple metric 두 개, n단계는 (n-1)단계 derived metric과 simple metric 하나를 참조합니다.
+    chain: List[str] = []
+    for level in range(1, derived_count + 1):
+        left = chain[-1] if chain else simple_names[0]
+        right = simple_names[level % len(simple_names)]
+        name = f"derived_{model}_l{level}"
+        metric_list.append(
+            {
+                "name": name,
+                "description": f"{level}단계 derived metric ({left}, {right})",
+                "type": "decimal",
+                "metric_type": "derived",
+                "label": f"{level}단계 비율",
+                "expr": f"{left} / NULLIF({right}, 0)" if level % 2 else f"{left} + {right}",
+            }
+        )
+        chain.append(name)
+
+    project.metrics_by_model[model] = metric_list
+    project.simple_metrics[model] = simple_names
+    project.derived_chains[model] = chain
+
+
+def build_workload(project: SyntheticProject, seed: int = 0, per_kind: int = 3) -> List[Dict[str, Any]]:
+    """
+    프로젝트에 맞는 SMQ 목록 (compile_bench --workload 형식)
+    kind마다 per_kind개씩 model을 골라 만듭니다.
+    """
+    rng = random.Random(seed)
+    model_names = [model["name"] for model in project.models]
+    dimensions_of = {
+        model["name"]: [dimension["name"] for dimension in model["dimensions"]] for model in project.models
+    }
+    base_dt = {model: dimensions_of[model][0] for model in model_names}
+    picks = rng.sample(model_names, min(per_kind, len(model_names)))
+    workload: List[Dict[str, Any]] = []
+
+    for model in picks:
+        dimension = dimensions_of[model][1]
+        workload.append(
+            {
+                "name": f"single_model__{model}",
+                "smq": {
+                    "metrics": project.simple_metrics[model][:3] + [f"{model}__{dimension}"],
+                    "group_by": [f"{model}__{dimension}"],
+                },
+            }
+        )
+
+    for model in picks:
+        chain = project.derived_chains[model]
+        if not chain:
+            continue
+        dimension = dimensions_of[model][1]
+        workload.append(
+            {
+                "name": f"derived_chain__{model}",
+                "smq": {
+                    "metrics": [chain[-1], f"{model}__{dimension}"],
+                    "group_by": [f"{model}__{dimension}"],
+                    "order_by": [f"-{chain[-1]}"],
+                },
+            }
+        )
+
+    # 트리에서 가장 깊은 model들의 metric을 root까지의 경로에 있는 model들의 dimension으로 묶습니다. (여러 단계 조인)
+    deepest = sorted(model_names, key=lambda name: (-project.depth(name), name))[:per_kind]
+    for model in deepest:
+        path = [model]
+        while project.parents.get(path[-1]):
+            path.append(project.parents[path[-1]])
+        if len(path) < 2:
+            continue
+        dimensions = [f"{ancestor}__{dimensions_of[ancestor][1]}" for ancestor in path[1:]]
+        workload.append(
+            {
+                "name": f"join_chain__{model}",
+                "smq": {
+                    "metrics": [project.simple_metrics[model][0]] + dimensions,
+                    "group_by": dimensions,
+                    "filters": [f"{model}__{base_dt[model]} = '20240131'"],
+                },
+            }
+        )
+        workload.append(
+            {
+                "name": f"join_chain_inline__{model}",
+                "smq": workload[-1]["smq"],
+                "cte": False,
+            }
+        )
+        if len(path) > 2:
+            # 중간 model 없이 root만 요청하면 직접 조인할 수 없어 JoinError 분할 변환을 탑니다.
+            dimension = f"{path[-1]}__{dimensions_of[path[-1]][1]}"
+            workload.append(
+                {
+                    "name": f"join_missing_bridge__{model}",
+                    "smq": {
+                        "metrics": [project.simple_metrics[model][0], dimension],
+                        "group_by": [dimension],
+                    },
+                }
+            )
+
+    for model in picks:
+        dimension = f"{model}__{dimensions_of[model][1]}"
+        metric = project.simple_metrics[model][0]
+        workload.append(
+            {
+                "name": f"filter_heavy__{model}",
+                "smq": {
+                    "metrics": [metric, dimension, f"{model}__{base_dt[model]}"],
+                    "group_by": [dimension, f"{model}__{base_dt[model]}"],
+                    "filters": [
+                        f"{model}__{base_dt[model]} >= '20240101'",
+                        f"{model}__{base_dt[model]} <= '20241231'",
+                        f"{dimension} IN ('A', 'B', 'C')",
+                        f"{dimension} <> 'Z'",
+                        f"{metric} > 0",
+                    ],
+                    "order_by": [f"-{metric}"],
+                    "limit": 100,
+                },
+            }
+        )
+
+    for model in picks[:1]:
+        dimensions = [f"{model}__{dimension}" for dimension in dimensions_of[model]]
+        workload.append(
+            {
+                "name": f"wide_projection__{model}",
+                "smq": {
+                    "metrics": [metric["name"] for metric in project.metrics_by_model[model]][:20] + dimensions,
+                    "group_by": dimensions,
+                },
+            }
+        )
+
+    # 서로 다른 component의 model은 조인할 수 없으므로 JoinError 분할 변환을 탑니다.
+    if len(project.components) > 1:
+        left, right = project.components[0][0], project.components[1][0]
+        workload.append(
+            {
+                "name": f"join_error_distributed__{left}__{right}",
+                "smq": {
+                    "metrics": [
+                        project.simple_metrics[left][0],
+                        project.simple_metrics[right][0],
+                        f"{left}__{base_dt[left]}",
+                    ],
+                    "group_by": [f"{left}__{base_dt[left]}"],
+                },
+            }
+        )
+    return workload
+
+
+def _dump_yaml(data: Any, path: Path) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        yaml.dump(data, f, allow_unicode=True, default_flow_style=False, sort_keys=False)
+
+
+def write_project(
+    project: SyntheticProject,
+    out_dir: Path,
+    workload: Optional[List[Dict[str, Any]]] = None,
+    with_manifest: bool = True,
+) -> Dict[str, Any]:
+    """
+    프로젝트를 out_dir에 씁니다. semantic_models/는 비우고 새로 만듭니다.
+    with_manifest면 assemble_manifest로 semantic_manifest.json까지 만듭니다.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    sem_dir = out_dir / "semantic_models"
+    if sem_dir.exists():
+        shutil.rmtree(sem_dir)
+    sem_dir.mkdir()
+
+    _dump_yaml(
+        {
+            "sources": [
+                {
+                    "name": SOURCE_NAME,
+                    "database": "",
+                    "schema": SCHEMA_NAME,
+                    "tables": [
+                        {"name": table, "stats": {"row_count": project.row_counts[table]}}
+                        for table in project.tables
+                    ],
+                }
+            ]
+        },
+        out_dir / "sources.yml",
+    )
+
+    ddl = ["-- postgres", ""]
+    for table, columns in project.tables.items():
+        body = ",\n".join(f"    {column} {column_type}" for column, column_type in columns)
+        ddl.append(f"CREATE TABLE {SCHEMA_NAME}.{table} (\n{body}\n);\n")
+    (out_dir / "ddl.sql").write_text("\n".join(ddl), encoding="utf-8")
+
+    for model in project.models:
+        _dump_yaml(
+            {"semantic_models": [model], "metrics": project.metrics_by_model[model["name"]]},
+            sem_dir / f"{model['name']}.yml",
+        )
+
+    if workload is not None:
+        (out_dir / "workload.json").write_text(
+            json.dumps(workload, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+
+    if with_manifest:
+        from backend.semantic.model_manager.parser.semantic_parser import assemble_manifest, write_manifest
+
+        write_manifest(assemble_manifest(str(out_dir)), str(out_dir / "semantic_manifest.json"))
+
+    return {
+        "out": str(out_dir),
+        "models": len(project.models),
+        "metrics": project.metric_count,
+        "components": len(project.components),
+        "max_join_depth": max(project.depth(model["name"]) for model in project.models),
+        "workload": len(workload or []),
+    }
+
+
+def _time(fn, *args, **kwargs) -> Tuple[Any, float]:
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, (time.perf_counter() - t0) * 1000
+
+
+def measure_scale(project: SyntheticProject, workload: List[Dict[str, Any]], dialect: str) -> Dict[str, Any]:
+    """
+    임시 디렉터리에 프로젝트를 쓰고 assemble_manifest, lint_semantic_models, manifest 등록,
+    workload 전체 smq_to_sql(캐시 없이 케이스마다 두 번) 시간을 잽니다.
+    """
+    from backend.semantic.model_manager.linter.semantic_linter import lint_semantic_models
+    from backend.semantic.model_manager.parser.semantic_parser import assemble_manifest
+    from backend.semantic.services.manifest_registry import manifest_registry
+    from backend.semantic.services.smq2sql_service import prepare_smq_to_sql
+
+    with tempfile.TemporaryDirectory(prefix="synthetic_manifest_") as tmp:
+        out_dir = Path(tmp)
+        write_project(project, out_dir, workload, with_manifest=False)
+
+        manifest, assemble_ms = _time(assemble_manifest, str(out_dir))
+        lint, lint_ms = _time(lint_semantic_models, str(out_dir))
+        manifest_json = json.dumps(manifest, ensure_ascii=False)
+        registered, register_ms = _time(manifest_registry.register, manifest_json)
+
+        # 첫 변환에는 manifest별 index/조인 그래프 생성과 import 비용이 들어가므로 두 번째 변환 시간과 따로 기록합니다.
+        first_ms = []
+        compile_ms = []
+        failed = []
+        for case in workload:
+            for samples in (first_ms, compile_ms):
+                result, elapsed = _time(
+                    prepare_smq_to_sql,
+                    case["smq"],
+                    None,
+                    dialect,
+                    case.get("cte", True),
+                    use_cache=False,
+                    manifest_id=registered.manifest_id,
+                )
+                samples.append(elapsed)
+            if not result.get("success"):
+                failed.append(case["name"])
+        manifest_registry.remove(registered.manifest_id)
+
+    return {
+        "models": len(project.models),
+        "metrics": project.metric_count,
+        "manifest_kib": len(manifest_json.encode("utf-8")) / 1024,
+        "assemble_ms": assemble_ms,
+        "lint_ms": lint_ms,
+        "lint_errors": lint["error_count"],
+        "lint_warnings": lint["warning_count"],
+        "register_ms": register_ms,
+        "compile_first_ms": sum(first_ms),
+        "compile_total_ms": sum(compile_ms),
+        "compile_max_ms": max(compile_ms) if compile_ms else 0.0,
+        "compile_failed": failed,
+    }
+
+
+def _parse_scale(value: str) -> Tuple[int, int]:
+    try:
+        models, metrics = value.split(":")
+        return int(models), int(metrics)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"--scale은 models:metrics 형식이어야 합니다. (받은 값: {value})")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="합성 semantic model 프로젝트 생성기")
+    parser.add_argument("--out", type=Path, help="출력 디렉터리")
+    parser.add_argument("--models", type=int, default=30)
+    parser.add_argument("--metrics", type=int, default=300)
+    parser.add_argument("--derived-depth", type=int, default=3, help="model별 derived metric 사슬 깊이")
+    parser.add_argument("--dimensions", type=int, default=8, help=f"model별 dimension 수 (최대 {len(DIMENSIONS)})")
+    parser.add_argument("--measures", type=int, default=4, help=f"model별 measure 수 (최대 {len(MEASURES)})")
+    parser.add_argument("--components", type=int, default=1, help="서로 조인할 수 없는 model 그룹 수")
+    parser.add_argument("--identifiers", choices=("en", "ko"), default="en")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workload-per-kind", type=int, default=3)
+    parser.add_argument("--no-manifest", action="store_true", help="semantic_manifest.json을 만들지 않습니다.")
+    parser.add_argument(
+        "--scale",
+        type=_parse_scale,
+        action="append",
+        default=[],
+        help="models:metrics. 지정하면 파일을 남기지 않고 규모별 시간만 잽니다. (여러 번 지정 가능)",
+    )
+    parser.add_argument("--dialect", default="bigquery", help="--scale 측정 시 smq_to_sql dialect")
+    parser.add_argument("--output", type=Path, help="--scale 측정 결과 JSON 파일 경로")
+    parser.add_argument("--with-logging", action="store_true", help="INFO 로그를 끄지 않습니다.")
+    args = parser.parse_args(argv)
+
+    if not args.with_logging:
+        logging.disable(logging.INFO)
+
+    def build(models: int, metrics: int):
+        project = build_project(
+            models=models,
+            metrics=metrics,
+            derived_depth=args.derived_depth,
+            dimensions=args.dimensions,
+            measures=args.measures,
+            components=args.components,
+            identifiers=args.identifiers,
+            seed=args.seed,
+        )
+        return project, build_workload(project, seed=args.seed, per_kind=args.workload_per_kind)
+
+    if args.scale:
+        rows = [measure_scale(*build(models, metrics), args.dialect) for models, metrics in args.scale]
+        print(
+            f"  {'models':>6s}  {'metrics':>7s}  {'manifest KiB':>12s}  {'assemble ms':>11s}  "
+            f"{'lint ms':>9s}  {'register ms':>11s}  {'1st compile ms':>14s}  {'compile ms':>10s}  {'max ms':>8s}"
+        )
+        for row in rows:
+            print(
+                f"  {row['models']:6d}  {row['metrics']:7d}  {row['manifest_kib']:12.1f}  "
+                f"{row['assemble_ms']:11.1f}  {row['lint_ms']:9.1f}  {row['register_ms']:11.1f}  "
+                f"{row['compile_first_ms']:14.1f}  {row['compile_total_ms']:10.1f}  {row['compile_max_ms']:8.1f}"
+            )
+        if args.output:
+            args.output.write_text(json.dumps(rows, ensure_ascii=False, indent=2), encoding="utf-8")
+            print(f"\nwrote {args.output}")
+        failed = [(row["models"], row["compile_failed"]) for row in rows if row["compile_failed"]]
+        if failed:
+            print(f"FAIL: workload cases failed to compile: {failed}")
+        return 1 if failed else 0
+
+    if args.out is None:
+        parser.error("--out 또는 --scale이 필요합니다.")
+    project, workload = build(args.models, args.metrics)
+    summary = write_project(project, args.out, workload, with_manifest=not args.no_manifest)
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+OTLP/HTTP JSON trace collector stand-in
+
+OpenTelemetry Collector 없이 SMQ_TRACE_EXPORTER=otlp 설정을 확인할 때 씁니다.
+POST /v1/traces로 받은 resourceSpans를 span 하나당 JSON 한 줄(JsonLinesSpanExporter와 같은 형식)로 파일에 덧붙입니다.
+
+사용법 (repo 루트에서):
+    python -m backend.benchmarks.trace_collector --port 4318 --output /tmp/otlp_spans.jsonl
+    SMQ_TRACE_SAMPLE_RATE=1 SMQ_TRACE_EXPORTER=otlp uvicorn app:app --port 8000
+"""
+import argparse
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+
+
+def _attribute_value(value: Dict[str, Any]) -> Any:
+    if "arrayValue" in value:
+        return [_attribute_value(item) for item in value["arrayValue"].get("values", [])]
+    if "intValue" in value:
+        return int(value["intValue"])
+    for key in ("stringValue", "boolValue", "doubleValue"):
+        if key in value:
+            return value[key]
+    return None
+
+
+def _attributes(attributes: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {item["key"]: _attribute_value(item.get("value", {})) for item in attributes or []}
+
+
+def spans_from_otlp(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """OTLP/HTTP JSON 요청 본문을 span dict 목록으로 펼칩니다."""
+    records = []
+    for resource_spans in payload.get("resourceSpans", []):
+        resource = _attributes(resource_spans.get("resource", {}).get("attributes"))
+        for scope_spans in resource_spans.get("scopeSpans", []):
+            for span in scope_spans.get("spans", []):
+                start_ns = int(span.get("startTimeUnixNano", 0))
+                end_ns = int(span.get("endTimeUnixNano", 0))
+                status = span.get("status", {})
+                records.append({
+                    "trace_id": span.get("traceId"),
+                    "span_id": span.get("spanId"),
+                    "parent_span_id": span.get("parentSpanId") or None,
+                    "name": span.get("name"),
+                    "start_time_unix_nano": start_ns,
+                    "end_time_unix_nano": end_ns,
+                    "duration_ms": round((end_ns - start_ns) / 1e6, 3),
+                    "attributes": _attributes(span.get("attributes")),
+                    "status": "error" if status.get("code") == 2 else "ok",
+                    "error": status.get("message") or None,
+                    "service": resource.get("service.name"),
+                })
+    return records
+
+
+def make_handler(output_path: str, lock: threading.Lock):
+    class TraceHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if self.path.rstrip("/") != "/v1/traces":
+                self.send_error(404)
+                return
+            try:
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                records = spans_from_otlp(json.loads(body or b"{}"))
+            except (ValueError, TypeError) as e:
+                self.send_error(400, str(e))
+                return
+            with lock, open(output_path, "a", encoding="utf-8") as f:
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+        def log_message(self, format, *args):
+            pass
+
+    return TraceHandler
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="OTLP/HTTP JSON trace collector stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4318)
+    parser.add_argument("--output", default="otlp_spans.jsonl", help="받은 span을 덧붙일 JSON lines 파일")
+    args = parser.parse_args(argv)
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(args.output, threading.Lock()))
+    print(f"listening on http://{args.host}:{args.port}/v1/traces -> {args.output}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
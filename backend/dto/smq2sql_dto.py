@@ -2,7 +2,9 @@
 SMQ to SQL DTO 정의
 """
 from typing import List, Optional, Dict, Any, Union
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from backend.semantic.services.compile_pool import DEFAULT_MAX_WORKERS
 
 
 class SmqRequest(BaseModel):
@@ -26,14 +28,37 @@ class QueryResult(BaseModel):
     """쿼리 결과"""
     query: str
     metadata: List[ColumnMetadata]
+    params: Optional[List[Any]] = None  # parameterize=True일 때 placeholder 순서대로의 bind 값
 
 
 class SmqToSqlRequest(BaseModel):
-    """SMQ to SQL 변환 요청"""
+    """SMQ to SQL 변환 요청 (manifest_content 대신 등록된 manifest_id를 보낼 수 있습니다)"""
     smq_request: SmqRequest
-    manifest_content: Union[str, Dict[str, Any]]
+    manifest_content: Optional[Union[str, Dict[str, Any]]] = None
+    manifest_id: Optional[str] = None
+    dialect: str = "bigquery"
+    cte: bool = True
+    optimize: str = "none"  # "none" | "safe" | "aggressive"
+    parameterize: bool = False  # True면 filter 값을 bind placeholder(%s, :1, @p1, ?)로 빼고 params로 반환
+
+
+class SmqToSqlBatchRequest(BaseModel):
+    """여러 SMQ를 같은 manifest로 한 번에 변환하는 요청"""
+    smq_requests: List[SmqRequest]
+    manifest_content: Optional[Union[str, Dict[str, Any]]] = None
+    manifest_id: Optional[str] = None
     dialect: str = "bigquery"
     cte: bool = True
+    optimize: str = "none"  # "none" | "safe" | "aggressive"
+    # 이 배치를 나눌 최대 chunk 병렬도. pool 크기는 SMQ_COMPILE_WORKERS로 고정되어 있고 그보다 클 수 없습니다.
+    max_workers: Optional[int] = Field(None, ge=1, le=max(1, DEFAULT_MAX_WORKERS))
+
+
+class SmqToSqlBatchResponse(BaseModel):
+    """배치 변환 응답 (results는 입력 순서대로 항목별 성공/실패 결과)"""
+    success: bool
+    results: List[Dict[str, Any]] = []
+    error: Optional[str] = None
 
 
 class SmqToSqlResponse(BaseModel):
@@ -42,3 +67,69 @@ class SmqToSqlResponse(BaseModel):
     results: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
     queries: Optional[List[QueryResult]] = None
+
+
+class SmqToSqlMultiRequest(BaseModel):
+    """같은 SMQ를 여러 dialect의 SQL로 변환하는 요청 (source_dialect를 주면 compose는 한 번만 수행)"""
+    smq_request: SmqRequest
+    manifest_content: Optional[Union[str, Dict[str, Any]]] = None
+    manifest_id: Optional[str] = None
+    dialects: List[str]
+    source_dialect: Optional[str] = None  # manifest/SMQ 식을 읽을 dialect (없으면 dialect마다 그 dialect로 읽음)
+    cte: bool = True
+    optimize: str = "none"  # "none" | "safe" | "aggressive"
+
+
+class SmqToSqlMultiResponse(BaseModel):
+    """여러 dialect 변환 응답 (results는 dialect별 SmqToSqlResponse)"""
+    success: bool
+    results: Dict[str, SmqToSqlResponse] = {}
+    error: Optional[str] = None
+
+
+class ManifestRegisterRequest(BaseModel):
+    """manifest 등록 요청"""
+    manifest_content: Union[str, Dict[str, Any]]
+
+
+class ManifestRegisterResponse(BaseModel):
+    """manifest 등록 응답"""
+    success: bool
+    manifest_id: Optional[str] = None
+    size_bytes: Optional[int] = None
+    error: Optional[str] = None
+
+
+class SmqTemplateRegisterRequest(BaseModel):
+    """SMQ 템플릿 등록 요청 (filters에 ':start' 같은 이름 있는 placeholder 사용)"""
+    smq_request: SmqRequest
+    manifest_content: Optional[Union[str, Dict[str, Any]]] = None
+    manifest_id: Optional[str] = None
+    dialect: str = "bigquery"
+    cte: bool = True
+    optimize: str = "none"  # "none" | "safe" | "aggressive"
+    param_types: Optional[Dict[str, str]] = None  # 파라미터 이름 -> "any" | "string" | "number" | "boolean"
+
+
+class SmqTemplateRegisterResponse(BaseModel):
+    """SMQ 템플릿 등록 응답 (params는 파라미터 이름 -> 타입)"""
+    success: bool
+    template_id: Optional[str] = None
+    params: Optional[Dict[str, str]] = None
+    error: Optional[str] = None
+
+
+class SmqTemplateRenderRequest(BaseModel):
+    """등록된 SMQ 템플릿에 채울 파라미터 값 (list 값은 IN (...)에 쉼표로 이어 붙입니다)"""
+    params: Dict[str, Any] = {}
+
+
+class ProfilerConfigRequest(BaseModel):
+    """요청 프로파일러 설정 변경 (지정한 값만 바뀝니다)"""
+    sample_rate: Optional[float] = None  # 0.0 ~ 1.0, 헤더/쿼리 없이 프로파일링할 요청 비율
+    allow_opt_in: Optional[bool] = None  # 모든 클라이언트의 X-Profile 헤더 / ?profile=1 허용 여부 (기본 꺼짐)
+
+
+class TracingConfigRequest(BaseModel):
+    """tracing 설정 변경 (지정한 값만 바뀝니다)"""
+    sample_rate: Optional[float] = None  # 0.0 ~ 1.0, span을 남길 root(요청) 비율
@@ -33,6 +33,8 @@ from dotenv import load_dotenv
 
 # tools.py에서 도구 함수들 import
 from tools import read_file, convert_smq_to_sql
+from backend.semantic.utils.request_profiler import profiled
+from backend.semantic.utils.tracing import traced
 from backend.utils.logger import setup_logger
 
 load_dotenv()
@@ -162,19 +164,22 @@ class LangGraphAgent:
         """LangGraph 워크플로우 생성"""
         workflow = StateGraph(AgentState)
         
-        # 노드 추가
-        workflow.add_node("classifyJoy", self._classify_joy_node)
-        workflow.add_node("killjoy", self._killjoy_node)
-        workflow.add_node("splitQuestion", self._split_question_node)
-        workflow.add_node("modelSelector", self._model_selector_node)
-        workflow.add_node("extractMetrics", self._extract_metrics_node)
-        workflow.add_node("extractFilters", self._extract_filters_node)
-        workflow.add_node("extractOrderByAndLimit", self._extract_order_by_and_limit_node)
-        workflow.add_node("manipulation", self._manipulation_node)
-        workflow.add_node("smq2sql", self._smq2sql_node)
-        workflow.add_node("executeQuery", self._execute_query_node)
-        workflow.add_node("postprocess", self._postprocess_node)
-        workflow.add_node("respondent", self._respondent_node)
+        # 노드 추가 (프로파일링 중인 요청이면 노드 함수 호출마다 cProfile로 측정하고, tracing 중이면 노드마다 span을 남깁니다.)
+        def node(name, fn):
+            return profiled(f"node:{name}")(traced(f"agent.node.{name}", node=name)(fn))
+
+        workflow.add_node("classifyJoy", node("classifyJoy", self._classify_joy_node))
+        workflow.add_node("killjoy", node("killjoy", self._killjoy_node))
+        workflow.add_node("splitQuestion", node("splitQuestion", self._split_question_node))
+        workflow.add_node("modelSelector", node("modelSelector", self._model_selector_node))
+        workflow.add_node("extractMetrics", node("extractMetrics", self._extract_metrics_node))
+        workflow.add_node("extractFilters", node("extractFilters", self._extract_filters_node))
+        workflow.add_node("extractOrderByAndLimit", node("extractOrderByAndLimit", self._extract_order_by_and_limit_node))
+        workflow.add_node("manipulation", node("manipulation", self._manipulation_node))
+        workflow.add_node("smq2sql", node("smq2sql", self._smq2sql_node))
+        workflow.add_node("executeQuery", node("executeQuery", self._execute_query_node))
+        workflow.add_node("postprocess", node("postprocess", self._postprocess_node))
+        workflow.add_node("respondent", node("respondent", self._respondent_node))
         
         # 엣지 추가
         workflow.set_entry_point("classifyJoy")
@@ -1,10 +1,24 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import FileResponse
 import json
+from typing import Optional
 from backend.dto.smq2sql_dto import (
     SmqToSqlRequest,
     SmqToSqlResponse,
     ColumnMetadata,
     QueryResult,
+    ManifestRegisterRequest,
+    ManifestRegisterResponse,
+    SmqRequest,
+    SmqToSqlBatchRequest,
+    SmqToSqlBatchResponse,
+    SmqToSqlMultiRequest,
+    SmqToSqlMultiResponse,
+    SmqTemplateRegisterRequest,
+    SmqTemplateRegisterResponse,
+    SmqTemplateRenderRequest,
+    ProfilerConfigRequest,
+    TracingConfigRequest,
 )
 from backend.dto.semantic_model_dto import SemanticModelPathRequest, DraftResponse
 
@@ -13,7 +27,21 @@ from backend.semantic.services.semantic_model_service import (
     semantic_lint_service,
     draft_service,
 )
-from backend.semantic.services.smq2sql_service import prepare_smq_to_sql
+from backend.semantic.services.smq2sql_service import (
+    prepare_smq_to_sql,
+    prepare_smq_to_sql_multi,
+)
+from backend.semantic.services.request_executor import (
+    ExecutorSaturated,
+    ExecutorTimeout,
+    request_executor,
+)
+from backend.semantic.services.compile_cache import compile_cache
+from backend.semantic.services.manifest_registry import manifest_registry
+from backend.semantic.services.smq2sql_batch_service import compile_many
+from backend.semantic.services.smq_template import smq_template_registry
+from backend.semantic.utils.request_profiler import ARTIFACT_KINDS, request_profiler
+from backend.semantic.utils.tracing import tracer
 from backend.utils.logger import setup_logger
 
 
@@ -30,6 +58,8 @@ async def semantic_parse_api(request: SemanticModelPathRequest):
         result = await semantic_parse_service(request.path)
         logger.info("Successfully parsed semantic model using semantic_parser")
         return {"message": "semantic 파싱 성공", "success": result}
+    except (ExecutorSaturated, ExecutorTimeout):
+        raise
     except Exception as e:
         logger.error("Failed to parse semantic layer: %s", str(e))
         raise HTTPException(status_code=500, detail=str(e))
@@ -43,6 +73,8 @@ async def semantic_lint_api(request: SemanticModelPathRequest):
     try:
         result = await semantic_lint_service(request.path)
         return result
+    except (ExecutorSaturated, ExecutorTimeout):
+        raise
     except Exception as e:
         logger.error("Failed to lint semantic model: %s", str(e))
         raise HTTPException(status_code=500, detail=str(e))
@@ -80,11 +112,41 @@ async def draft_api(request: SemanticModelPathRequest):
                 for p in result.proposals
             ]
         }
+    except (ExecutorSaturated, ExecutorTimeout):
+        raise
     except Exception as e:
         logger.error("Failed to generate draft: %s", str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _smq_request_to_dict(smq_request: SmqRequest) -> dict:
+    return {
+        "metrics": smq_request.metrics,
+        "group_by": smq_request.group_by,
+        "filters": smq_request.filters,
+        "order_by": smq_request.order_by,
+        "limit": smq_request.limit,
+        "joins": smq_request.joins,
+    }
+
+
+def _to_smq_to_sql_response(result: dict) -> SmqToSqlResponse:
+    # 각 쿼리의 메타데이터를 ColumnMetadata 객체로 변환하고 QueryResult로 래핑
+    if result.get("results", {}).get("queries"):
+        result["results"]["queries"] = [
+            QueryResult(
+                query=query_result["query"],
+                metadata=[
+                    ColumnMetadata(**meta) for meta in query_result["metadata"]
+                ],
+                params=query_result.get("params"),
+            )
+            for query_result in result["results"]["queries"]
+        ]
+
+    return SmqToSqlResponse(**result)
+
+
 @router.post("/smq2sql")
 async def smq_to_sql_api(request: SmqToSqlRequest) -> SmqToSqlResponse:
     """
@@ -93,24 +155,25 @@ async def smq_to_sql_api(request: SmqToSqlRequest) -> SmqToSqlResponse:
 
     try:
         # DTO 객체를 딕셔너리로 변환
-        smq_dict = {
-            "metrics": request.smq_request.metrics,
-            "group_by": request.smq_request.group_by,
-            "filters": request.smq_request.filters,
-            "order_by": request.smq_request.order_by,
-            "limit": request.smq_request.limit,
-            "joins": request.smq_request.joins,
-        }
+        smq_dict = _smq_request_to_dict(request.smq_request)
 
         logger.info(
-            "Request parameters - dialect: %s, cte: %s", request.dialect, request.cte
+            "Request parameters - dialect: %s, cte: %s, optimize: %s",
+            request.dialect,
+            request.cte,
+            request.optimize,
         )
         logger.info("manifest_content: %s", str(request.manifest_content)[:10])
-        result = prepare_smq_to_sql(
+        # CPU 바운드 작업이므로 request_executor에서 실행 (포화 시 429, 제한 시간 초과 시 504)
+        result = await request_executor.run(
+            prepare_smq_to_sql,
             smq=smq_dict,
             manifest_content=request.manifest_content,
             dialect=request.dialect,
             cte=request.cte,
+            manifest_id=request.manifest_id,
+            optimize=request.optimize,
+            parameterize=request.parameterize,
         )
 
         # SQL 생성 결과 로깅
@@ -128,19 +191,272 @@ async def smq_to_sql_api(request: SmqToSqlRequest) -> SmqToSqlResponse:
         else:
             logger.info("no SQL generated")
 
-        # 각 쿼리의 메타데이터를 ColumnMetadata 객체로 변환하고 QueryResult로 래핑
-        if result.get("results", {}).get("queries"):
-            result["results"]["queries"] = [
-                QueryResult(
-                    query=query_result["query"],
-                    metadata=[
-                        ColumnMetadata(**meta) for meta in query_result["metadata"]
-                    ],
-                )
-                for query_result in result["results"]["queries"]
-            ]
-
-        return SmqToSqlResponse(**result)
+        return _to_smq_to_sql_response(result)
+    except (ExecutorSaturated, ExecutorTimeout):
+        raise
     except Exception as e:
         logger.error("Failed to convert smq to sql: %s", str(e))
         return SmqToSqlResponse(success=False, error=str(e))
+
+
+@router.post("/smq2sql/multi")
+async def smq_to_sql_multi_api(request: SmqToSqlMultiRequest) -> SmqToSqlMultiResponse:
+    """
+    같은 SMQ를 여러 dialect의 SQL로 변환하는 엔드포인트입니다. (마이그레이션 검증, 미러링된 warehouse 등)
+    source_dialect가 없으면 dialect마다 단일 dialect 변환과 같은 SQL을 만들고,
+    있으면 compose는 source_dialect 기준으로 한 번만 하고 dialect마다 SQL 조립/생성만 다시 합니다.
+    """
+    try:
+        result = await request_executor.run(
+            prepare_smq_to_sql_multi,
+            smq=_smq_request_to_dict(request.smq_request),
+            manifest_content=request.manifest_content,
+            dialects=request.dialects,
+            cte=request.cte,
+            manifest_id=request.manifest_id,
+            optimize=request.optimize,
+            source_dialect=request.source_dialect,
+        )
+        if not result.get("success"):
+            return SmqToSqlMultiResponse(success=False, error=result.get("error"))
+        return SmqToSqlMultiResponse(
+            success=True,
+            results={
+                dialect: _to_smq_to_sql_response(dialect_result)
+                for dialect, dialect_result in result["results"].items()
+            },
+        )
+    except (ExecutorSaturated, ExecutorTimeout):
+        raise
+    except Exception as e:
+        logger.error("Failed to convert smq to multi-dialect sql: %s", str(e))
+        return SmqToSqlMultiResponse(success=False, error=str(e))
+
+
+@router.post("/smq2sql/batch")
+async def smq_to_sql_batch_api(request: SmqToSqlBatchRequest) -> SmqToSqlBatchResponse:
+    """
+    같은 manifest에 대한 여러 SMQ를 한 번에 SQL로 변환하는 엔드포인트입니다.
+    결과는 입력 순서대로 항목별 성공/실패를 담아 반환합니다.
+    """
+    try:
+        smqs = [_smq_request_to_dict(smq_request) for smq_request in request.smq_requests]
+
+        # CPU 바운드 작업이므로 request_executor에서 실행 (내부에서 다시 process pool로 분산, 포화 시 429, 제한 시간 초과 시 504)
+        results = await request_executor.run(
+            compile_many,
+            smqs,
+            manifest_content=request.manifest_content,
+            dialect=request.dialect,
+            cte=request.cte,
+            manifest_id=request.manifest_id,
+            max_workers=request.max_workers,
+            optimize=request.optimize,
+        )
+        return SmqToSqlBatchResponse(success=True, results=results)
+    except (ExecutorSaturated, ExecutorTimeout):
+        raise
+    except Exception as e:
+        logger.error("Failed to convert smq batch to sql: %s", str(e))
+        return SmqToSqlBatchResponse(success=False, error=str(e))
+
+
+@router.post("/smq2sql/templates")
+async def register_smq_template_api(request: SmqTemplateRegisterRequest) -> SmqTemplateRegisterResponse:
+    """
+    filters에 이름 있는 placeholder(:start 등)가 있는 SMQ를 한 번 compile해서 템플릿으로 등록하는 엔드포인트입니다.
+    이후 /smq2sql/templates/{template_id}/render로 값만 보내면 다시 compile하지 않고 SQL을 만듭니다.
+    """
+    try:
+        template = await request_executor.run(
+            smq_template_registry.register,
+            smq=_smq_request_to_dict(request.smq_request),
+            manifest_content=request.manifest_content,
+            manifest_id=request.manifest_id,
+            dialect=request.dialect,
+            cte=request.cte,
+            optimize=request.optimize,
+            param_types=request.param_types,
+        )
+        return SmqTemplateRegisterResponse(
+            success=True, template_id=template.template_id, params=template.params
+        )
+    except (ExecutorSaturated, ExecutorTimeout):
+        raise
+    except Exception as e:
+        logger.error("Failed to register smq template: %s", str(e))
+        return SmqTemplateRegisterResponse(success=False, error=str(e))
+
+
+@router.post("/smq2sql/templates/{template_id}/render")
+async def render_smq_template_api(template_id: str, request: SmqTemplateRenderRequest) -> SmqToSqlResponse:
+    """
+    등록된 SMQ 템플릿에 파라미터 값을 literal로 채워 SQL을 반환하는 엔드포인트입니다. (/smq2sql과 같은 응답 형식)
+    """
+    try:
+        result = smq_template_registry.render(template_id, request.params)
+        return _to_smq_to_sql_response(result)
+    except Exception as e:
+        logger.error("Failed to render smq template: %s", str(e))
+        return SmqToSqlResponse(success=False, error=str(e))
+
+
+@router.get("/smq2sql/templates/stats")
+async def smq_template_registry_stats_api():
+    """
+    등록된 SMQ 템플릿 개수와 eviction 횟수를 반환하는 엔드포인트입니다.
+    """
+    return smq_template_registry.stats()
+
+
+@router.delete("/smq2sql/templates/{template_id}")
+async def remove_smq_template_api(template_id: str):
+    """
+    등록된 SMQ 템플릿을 레지스트리에서 제거하는 엔드포인트입니다.
+    """
+    if not smq_template_registry.remove(template_id):
+        raise HTTPException(status_code=404, detail=f"template_id '{template_id}' not found")
+    return {"success": True}
+
+
+@router.get("/smq2sql/cache/stats")
+async def smq_to_sql_cache_stats_api():
+    """
+    SMQ → SQL 변환 캐시의 통계(크기, hit/miss, eviction 등)를 반환하는 엔드포인트입니다.
+    """
+    return compile_cache.stats()
+
+
+@router.get("/smq2sql/executor/stats")
+async def request_executor_stats_api():
+    """
+    CPU 바운드 요청 작업을 실행하는 request_executor의 worker 수, 대기열 크기, 현재 처리 중인 작업 수를 반환하는 엔드포인트입니다.
+    """
+    return request_executor.stats()
+
+
+@router.delete("/smq2sql/cache")
+async def smq_to_sql_cache_clear_api():
+    """
+    SMQ → SQL 변환 캐시를 비우는 엔드포인트입니다.
+    """
+    compile_cache.clear()
+    return {"success": True}
+
+
+@router.post("/manifests")
+async def register_manifest_api(request: ManifestRegisterRequest) -> ManifestRegisterResponse:
+    """
+    manifest를 등록하고 내용 기반 manifest_id를 반환하는 엔드포인트입니다.
+    이후 /smq2sql 요청에서는 manifest_content 대신 manifest_id만 보내면 됩니다.
+    """
+    try:
+        # manifest 해시/파싱/metrics 로드는 CPU 바운드이므로 event loop가 아니라 request_executor에서 실행합니다.
+        registered = await request_executor.run(manifest_registry.register, request.manifest_content)
+        return ManifestRegisterResponse(
+            success=True,
+            manifest_id=registered.manifest_id,
+            size_bytes=registered.size_bytes,
+        )
+    except ValueError as e:
+        logger.error("Failed to register manifest: %s", str(e))
+        return ManifestRegisterResponse(success=False, error=str(e))
+
+
+@router.get("/manifests/stats")
+async def manifest_registry_stats_api():
+    """
+    등록된 manifest 개수와 메모리 사용량을 반환하는 엔드포인트입니다.
+    """
+    return manifest_registry.stats()
+
+
+@router.delete("/manifests/{manifest_id}")
+async def remove_manifest_api(manifest_id: str):
+    """
+    등록된 manifest를 레지스트리에서 제거하는 엔드포인트입니다.
+    """
+    if not manifest_registry.remove(manifest_id):
+        raise HTTPException(status_code=404, detail=f"manifest_id '{manifest_id}' not found")
+    return {"success": True}
+
+
+@router.get("/tracing/config")
+async def get_tracing_config_api():
+    """
+    tracing 설정(sample_rate, exporter)과 export 통계를 반환하는 엔드포인트입니다.
+    """
+    return tracer.stats()
+
+
+@router.put("/tracing/config")
+async def configure_tracing_api(request: TracingConfigRequest):
+    """
+    tracing sample_rate를 재시작 없이 바꾸는 엔드포인트입니다. (exporter는 SMQ_TRACE_EXPORTER로 정합니다)
+    """
+    try:
+        return tracer.configure(sample_rate=request.sample_rate)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/profiles")
+async def list_profiles_api():
+    """
+    저장된 요청 프로파일 목록(최근 순)과 프로파일러 설정을 반환하는 엔드포인트입니다.
+    """
+    return {"profiler": request_profiler.stats(), "profiles": request_profiler.artifacts()}
+
+
+@router.put("/profiles/config")
+async def configure_profiler_api(
+    request: ProfilerConfigRequest, x_profile_token: Optional[str] = Header(None)
+):
+    """
+    프로파일링 sample_rate / opt-in 허용 여부를 재시작 없이 바꾸는 엔드포인트입니다.
+    SMQ_PROFILE_OPT_IN_TOKEN이 설정되어 있으면 X-Profile-Token 헤더가 맞는 요청만 받습니다.
+    """
+    if request_profiler.opt_in_token and not request_profiler.is_trusted(x_profile_token):
+        raise HTTPException(status_code=403, detail="X-Profile-Token이 맞지 않습니다.")
+    try:
+        return request_profiler.configure(
+            sample_rate=request.sample_rate, allow_opt_in=request.allow_opt_in
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/profiles/{request_id}")
+async def get_profile_api(request_id: str):
+    """
+    요청 프로파일 요약(호출별 시간, 누적 시간 상위 함수)을 반환하는 엔드포인트입니다.
+    """
+    profile = request_profiler.get(request_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"profile '{request_id}' not found")
+    return profile
+
+
+@router.get("/profiles/{request_id}/{kind}")
+async def download_profile_api(request_id: str, kind: str):
+    """
+    요청 프로파일 파일을 내려받는 엔드포인트입니다.
+    kind: "pstats" (python -m pstats, snakeviz 등) | "collapsed" (flamegraph.pl, speedscope)
+    """
+    path = request_profiler.artifact_path(request_id, kind)
+    if path is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"profile '{request_id}' ({kind}) not found. kind: {sorted(ARTIFACT_KINDS)}",
+        )
+    return FileResponse(path, media_type=ARTIFACT_KINDS[kind], filename=f"{request_id}.{kind}")
+
+
+@router.delete("/profiles/{request_id}")
+async def remove_profile_api(request_id: str):
+    """
+    저장된 요청 프로파일을 지우는 엔드포인트입니다.
+    """
+    if not request_profiler.remove(request_id):
+        raise HTTPException(status_code=404, detail=f"profile '{request_id}' not found")
+    return {"success": True}
@@ -19,6 +19,11 @@ from backend.semantic.services.semantic_model_service import (
     draft_service,
 )
 from backend.semantic.services.smq2sql_service import prepare_smq_to_sql
+from backend.semantic.services.request_executor import (
+    ExecutorSaturated,
+    ExecutorTimeout,
+    request_executor,
+)
 from backend.utils.logger import setup_logger
 
 
@@ -36,6 +41,8 @@ async def semantic_parse_api(request: SemanticModelPathRequest):
         result = await semantic_parse_service(request.path)
         logger.info("Successfully parsed semantic model using semantic_parser")
         return {"message": "semantic 파싱 성공", "success": result}
+    except (ExecutorSaturated, ExecutorTimeout):
+        raise
     except Exception as e:
         logger.error("Failed to parse semantic layer: %s", str(e))
         raise HTTPException(status_code=500, detail=str(e))
@@ -49,6 +56,8 @@ async def semantic_lint_api(request: SemanticModelPathRequest):
     try:
         result = await semantic_lint_service(request.path)
         return result
+    except (ExecutorSaturated, ExecutorTimeout):
+        raise
     except Exception as e:
         logger.error("Failed to lint semantic model: %s", str(e))
         raise HTTPException(status_code=500, detail=str(e))
@@ -86,6 +95,8 @@ async def draft_api(request: SemanticModelPathRequest):
                 for p in result.proposals
             ]
         }
+    except (ExecutorSaturated, ExecutorTimeout):
+        raise
     except Exception as e:
         logger.error("Failed to generate draft: %s", str(e))
         raise HTTPException(status_code=500, detail=str(e))
@@ -109,14 +120,22 @@ async def smq_to_sql_api(request: SmqToSqlRequest) -> SmqToSqlResponse:
         }
 
         logger.info(
-            "Request parameters - dialect: %s, cte: %s", request.dialect, request.cte
+            "Request parameters - dialect: %s, cte: %s, optimize: %s",
+            request.dialect,
+            request.cte,
+            request.optimize,
         )
         logger.info("manifest_content: %s", str(request.manifest_content)[:10])
-        result = prepare_smq_to_sql(
+        # CPU 바운드 작업이므로 request_executor에서 실행 (포화 시 429, 제한 시간 초과 시 504)
+        result = await request_executor.run(
+            prepare_smq_to_sql,
             smq=smq_dict,
             manifest_content=request.manifest_content,
             dialect=request.dialect,
             cte=request.cte,
+            manifest_id=request.manifest_id,
+            optimize=request.optimize,
+            parameterize=request.parameterize,
         )
 
         # SQL 생성 결과 로깅
@@ -142,11 +161,14 @@ async def smq_to_sql_api(request: SmqToSqlRequest) -> SmqToSqlResponse:
                     metadata=[
                         ColumnMetadata(**meta) for meta in query_result["metadata"]
                     ],
+                    params=query_result.get("params"),
                 )
                 for query_result in result["results"]["queries"]
             ]
 
         return SmqToSqlResponse(**result)
+    except (ExecutorSaturated, ExecutorTimeout):
+        raise
     except Exception as e:
         logger.error("Failed to convert smq to sql: %s", str(e))
         return SmqToSqlResponse(success=False, error=str(e))
@@ -4,6 +4,11 @@ from typing import Dict, List
 from sqlglot import exp
 
 from backend.utils.logger import setup_logger
+from backend.semantic.utils import ensure_manifest_index
+from backend.semantic.utils.compile_metrics import compile_metrics
+from backend.semantic.utils.tracing import tracer
+from backend.semantic.types.layer_plan import LayerPlan
+from backend.semantic.types.parsed_smq import ParsedSMQ
 
 from backend.semantic.composer.pipeline import (
     move_groups_to_metrics,
@@ -20,6 +25,8 @@ from backend.semantic.composer.pipeline import (
     push_down_agg_from_deriv_layer,
     transform_anonymous_node_into_legit_one,
     move_dimension_expr_to_deriv_layer_if_deriv_exists,
+    push_down_predicates,
+    prune_unreferenced_columns_of_proj_layers,
 )
 
 
@@ -29,73 +36,136 @@ logger = setup_logger("SQLComposer")
 class SQLComposer:
     """Parser를 통해 파싱된 smq를 sql로 변환하는 객체"""
 
-    def __init__(self, semantic_manifest, dialect=None):
+    def __init__(self, manifest_index, dialect=None):
         self.dialect = dialect
-        self.semantic_manifest = semantic_manifest
+        self.manifest_index = ensure_manifest_index(manifest_index)
 
     def compose(self, parsed_smq, original_smq) -> exp.Select:
+        # original_smq 항목은 ParsedSMQ에서 한 번만 파싱하고 pipeline 단계들이 함께 씁니다.
+        if not isinstance(original_smq, ParsedSMQ):
+            original_smq = ParsedSMQ(original_smq)
+
+        parsed_smq = self.compose_plan(parsed_smq, original_smq)
+        return self.render(parsed_smq, original_smq)
+
+    def compose_plan(self, parsed_smq, original_smq) -> LayerPlan:
+        """
+        pipeline 중 출력 dialect와 무관한 단계(0~9)만 실행한 LayerPlan을 반환합니다.
+        manifest/SMQ 식은 self.dialect로 읽습니다. 여러 dialect로 출력할 때는 이 결과를 복사해서 dialect마다 render 합니다.
+        """
+        if not isinstance(original_smq, ParsedSMQ):
+            original_smq = ParsedSMQ(original_smq)
+
+        # 0) [DERIV] deriv layer의 filter 중 집계 전에 평가해도 되는 조건을 proj/agg layer로 내립니다.
+        parsed_smq = self._run_stage(
+            push_down_predicates,
+            parsed_smq,
+            original_smq,
+            self.manifest_index,
+            self.dialect,
+        )
 
         # [임시] Dimension 식의 경우, 기본으로는 agg에 들어가지만 만약 deriv layer가 있는 경우 deriv로 옮겨 줍니다.
-        parsed_smq = move_dimension_expr_to_deriv_layer_if_deriv_exists(
-            parsed_smq, original_smq
+        parsed_smq = self._run_stage(
+            move_dimension_expr_to_deriv_layer_if_deriv_exists, parsed_smq, original_smq
         )
 
         # 5) [Deriv] Deriv Layer에 agg function이 있으면 agg layer로 push down 시킵니다.
-        parsed_smq = push_down_agg_from_deriv_layer(
-            parsed_smq, original_smq, self.semantic_manifest
+        parsed_smq = self._run_stage(
+            push_down_agg_from_deriv_layer, parsed_smq, original_smq, self.manifest_index
         )
 
         # [임시] Groupby에 있는 항목을 모두 Metrics에도 넣어 줍니다.
-        parsed_smq = move_groups_to_metrics(parsed_smq)
+        parsed_smq = self._run_stage(move_groups_to_metrics, parsed_smq)
 
         # 1) [전체] SMQ 상의 모든 항목이 들어가 있는지 확인합니다.
-        parsed_smq = check_if_original_smq_included_and_complete_if_not(
-            parsed_smq, original_smq
+        parsed_smq = self._run_stage(
+            check_if_original_smq_included_and_complete_if_not, parsed_smq, original_smq
         )
 
         # 2) anonymous node가 있는 경우 legit한 node로 바꿔 줍니다.
-        parsed_smq = transform_anonymous_node_into_legit_one(
-            parsed_smq,
-        )
+        parsed_smq = self._run_stage(transform_anonymous_node_into_legit_one, parsed_smq)
 
-        # 3) [전체] subquery 안의 from이 deriv/agg가 아니면 real table로 바꿔줍니다.
-        parsed_smq = replace_from_with_real_table_in_subqueries(
-            parsed_smq, self.semantic_manifest, self.dialect
+        # 3) [전체] subquery 안의 from이 deriv/agg가 아니면 real table로 바꿔줍니다. (quote는 render의 10단계에서)
+        parsed_smq = self._run_stage(
+            replace_from_with_real_table_in_subqueries, parsed_smq, self.manifest_index
         )
 
         # 4) [DERIV] Deriv Layer에 필요한 하위 항목들이 다 들어 있는지 확인합니다.
-        parsed_smq = check_prerequisite_of_deriv_layer_and_complete(
-            parsed_smq, original_smq, self.semantic_manifest, self.dialect
+        parsed_smq = self._run_stage(
+            check_prerequisite_of_deriv_layer_and_complete,
+            parsed_smq,
+            original_smq,
+            self.manifest_index,
+            self.dialect,
         )
 
         # 6) [AGG] Agg layer에서 group과 select가 일치하는지 확인합니다. (aggregation function이 아닌 select는 다 group에 들어 있어야 합니다.)
-        parsed_smq = check_group_select_parity_and_complete(parsed_smq)
+        parsed_smq = self._run_stage(check_group_select_parity_and_complete, parsed_smq)
 
         # 7) [AGG] Agg Layer에 필요한 하위 항목들이 다 들어 있는지 확인합니다.
-        parsed_smq = check_prerequisite_of_agg_layer_and_complete(
-            parsed_smq, original_smq, self.semantic_manifest, self.dialect
+        parsed_smq = self._run_stage(
+            check_prerequisite_of_agg_layer_and_complete,
+            parsed_smq,
+            original_smq,
+            self.manifest_index,
+            self.dialect,
         )
 
+        # 7-1) [PROJ] proj layer(base CTE)의 칼럼 중 agg layer에서 참조하지 않는 칼럼을 지웁니다.
+        parsed_smq = self._run_stage(prune_unreferenced_columns_of_proj_layers, parsed_smq)
+
         # 8) [AGG] 만약 proj layer가 2개 이상인데 agg layer에 join이 없으면 default join을 추가합니다.
         # -> key가 proj layer에 있는지도 확인! (4번을 지났기 때문에...)
 
-        parsed_smq = add_default_join(
-            parsed_smq, original_smq, self.semantic_manifest, self.dialect
+        parsed_smq = self._run_stage(
+            add_default_join, parsed_smq, original_smq, self.manifest_index, self.dialect
         )
 
         # 9) [전체] 만약 uppermost layer의 metrics에 식이 있는데 그 식이 alias가 없으면, 그 식을 str으로 바꿔서 alias로 추가해 줍니다 (아니면 column 이름이 f0 이런 식으로 나옴)
-        parsed_smq = add_alias_is_uppermost_select_is_statements_without_alias(
-            parsed_smq
+        parsed_smq = self._run_stage(
+            add_alias_is_uppermost_select_is_statements_without_alias, parsed_smq
         )
 
+        return parsed_smq
+
+    def render(self, parsed_smq, original_smq, dialect=None) -> exp.Select:
+        """
+        compose_plan 결과를 dialect(없으면 self.dialect)의 SQL AST로 조립합니다. (10~12단계)
+        parsed_smq를 직접 바꾸므로, 같은 plan을 여러 dialect로 render 하려면 LayerPlan.copy()를 넘기세요.
+        """
+        dialect = dialect or self.dialect
+        if not isinstance(original_smq, ParsedSMQ):
+            original_smq = ParsedSMQ(original_smq)
+
         # 10) [전체] bigquery의 경우 모든 identifier에 backtick을 추가합니다.
-        if self.dialect.lower() == "bigquery":
-            parsed_smq = add_backtick_if_bigquery(parsed_smq, self.dialect)
+        if (dialect or "").lower() == "bigquery":
+            parsed_smq = self._run_stage(
+                add_backtick_if_bigquery, parsed_smq, dialect, dialect=dialect
+            )
 
             # 11) [전체] bigquery의 경우 모든 identifier에 special char를 _로 치환합니다.
-            parsed_smq = replace_special_char_for_bigquery(parsed_smq, self.dialect)
+            parsed_smq = self._run_stage(
+                replace_special_char_for_bigquery, parsed_smq, dialect, dialect=dialect
+            )
 
         # 12) SQL을 조립합니다. (from절을 제대로 고치는 것도 포함 + from절 quote도 여기서!)
-        sql = write_sql(parsed_smq, self.semantic_manifest, self.dialect, original_smq)
+        sql = self._run_stage(
+            write_sql, parsed_smq, self.manifest_index, dialect, original_smq, dialect=dialect
+        )
 
         return sql
+
+    def _run_stage(self, stage, *args, dialect=None):
+        """
+        pipeline 단계 하나를 실행하고 소요 시간을 compile_metrics와 trace span에 기록합니다. (dialect가 없으면 self.dialect로 기록)
+        단계가 node를 직접 바꿨을 수 있으므로 LayerPlan의 name/alias/구조 해시 index는 단계마다 무효화합니다.
+        """
+        dialect = dialect or self.dialect
+        with compile_metrics.time_stage("compose", stage.__name__, dialect), tracer.span(
+            "smq.compose", stage=stage.__name__, dialect=dialect
+        ):
+            result = stage(*args)
+        if isinstance(result, LayerPlan):
+            result.invalidate_indexes()
+        return result
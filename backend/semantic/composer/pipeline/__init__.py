@@ -27,6 +27,10 @@ from .tansform_anonymous_node_into_legit_one import (
 from .move_dimension_expr_to_deriv_layer_if_deriv_exists import (
     move_dimension_expr_to_deriv_layer_if_deriv_exists,
 )
+from .push_down_predicates import push_down_predicates
+from .prune_unreferenced_columns_of_proj_layers import (
+    prune_unreferenced_columns_of_proj_layers,
+)
 
 __all__ = [
     move_groups_to_metrics,
@@ -43,4 +47,6 @@ __all__ = [
     push_down_agg_from_deriv_layer,
     transform_anonymous_node_into_legit_one,
     move_dimension_expr_to_deriv_layer_if_deriv_exists,
+    push_down_predicates,
+    prune_unreferenced_columns_of_proj_layers,
 ]
@@ -1,12 +1,13 @@
 from __future__ import annotations
 import vendor_setup
-from typing import Dict, List, Optional, Set, Tuple
-from backend.semantic.utils import append_node
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
+from backend.semantic.utils import ManifestIndex, JoinGraph
 import sqlglot
 from sqlglot import expressions as exp
 
 
-def add_default_join(parsed_smq, original_smq, semantic_manifest, dialect):
+def add_default_join(parsed_smq, original_smq, manifest_index, dialect):
 
     if original_smq.get("joins"):
         return parsed_smq
@@ -17,25 +18,24 @@ def add_default_join(parsed_smq, original_smq, semantic_manifest, dialect):
     if len(base_models) == 1:
         return parsed_smq
 
-    join_sql = generate_join_sql(semantic_manifest, base_models)
+    filter_counts = {
+        model: len(parsed_smq[model].get("filters", []) or []) for model in base_models
+    }
+    join_sql = generate_join_sql(manifest_index, base_models, filter_counts)
     join_node = sqlglot.parse_one(join_sql, dialect=dialect)
     join_columns = join_node.find_all(exp.Column)
     # 만약에 join column이 proj layer에 없으면 추가해 줍니다.
     for col in join_columns:
         table_name = col.table
         column_name = col.this.this
-        proj_layer_metrics_in_str = [
-            node.name for node in parsed_smq[table_name].get("metrics", []) if node.name
-        ]
-        if column_name not in proj_layer_metrics_in_str:
-            parsed_smq = append_node(
-                parsed_smq,
+        if not parsed_smq.clause(table_name, "metrics").has_name(column_name):
+            parsed_smq.append(
                 table_name,
                 "metrics",
                 exp.Column(this=exp.Identifier(this=column_name, quoted=col.this.quoted)),
             )
 
-    parsed_smq = append_node(parsed_smq, "agg", "joins", join_node)
+    parsed_smq.append("agg", "joins", join_node)
 
     return parsed_smq
 
@@ -130,31 +130,29 @@ def find_join_path(
 
 
 def _build_join_graph_and_paths_by_name(
-    sms: List,
-) -> Tuple[Dict[frozenset, Tuple[str, str, List[Tuple[str, str]]]], Dict[str, Set[str]]]:
-    """name 기반 그래프 생성 - 복합 키 조인 지원"""
-    name_of = {sm["name"]: sm for sm in sms}
-    names = list(name_of.keys())
-
+    join_graph: JoinGraph, names: List[str]
+) -> Tuple[Dict[frozenset, Tuple[str, str, List[Tuple[str, str]]]], Dict[str, List[str]]]:
+    """
+    manifest 단위로 미리 만들어 둔 JoinGraph에서 요청된 model들 사이의 간선만 꺼냅니다. - 복합 키 조인 지원
+    간선 방향(lhm/rhm)은 find_join_path와 같이 요청 순서상 앞선 model의 foreign을 먼저 봅니다.
+    """
     edges: Dict[frozenset, Tuple[str, str, List[Tuple[str, str]]]] = {}
-    adj: Dict[str, Set[str]] = {n: set() for n in names}
+    adj: Dict[str, List[str]] = {n: [] for n in names}
 
     n = len(names)
     for i in range(n):
         for j in range(i + 1, n):
             ni, nj = names[i], names[j]
-            sm_i, sm_j = name_of[ni], name_of[nj]
-            path = find_join_path(sm_i, sm_j)
-            if path is not None:
-                key = frozenset({ni, nj})
-                edges[key] = path
-                adj[ni].add(nj)
-                adj[nj].add(ni)
+            if not join_graph.has_edge(ni, nj):
+                continue
+            edges[frozenset({ni, nj})] = join_graph.join_path(ni, nj)
+            adj[ni].append(nj)
+            adj[nj].append(ni)
     return edges, adj
 
 
 def _connected_components_names(
-    nodes: List[str], adj: Dict[str, Set[str]]
+    nodes: List[str], adj: Dict[str, List[str]]
 ) -> List[List[str]]:
     seen: Set[str] = set()
     comps: List[List[str]] = []
@@ -167,7 +165,7 @@ def _connected_components_names(
         comp = [start]
         while stack:
             u = stack.pop()
-            for v in adj.get(u, set()):
+            for v in adj.get(u, []):
                 if v not in seen:
                     seen.add(v)
                     stack.append(v)
@@ -179,25 +177,27 @@ def _connected_components_names(
 def _build_join_sequence_for_connected_component(
     comp: List[str],
     edges: Dict[frozenset, Tuple[str, str, List[Tuple[str, str]]]],
-    adj: Dict[str, Set[str]],
+    adj: Dict[str, List[str]],
+    root: Optional[str] = None,
 ) -> List[Tuple[str, str, List[Tuple[str, str]]]]:
-    """BFS를 사용하여 조인 순서를 결정 - 복합 키 조인 지원"""
+    """BFS를 사용하여 조인 순서를 결정 - 복합 키 조인 지원 (root가 없으면 comp[0]에서 시작)"""
     if len(comp) < 2:
         return []
 
-    if len(comp) == 2:
+    if len(comp) == 2 and root is None:
         key = frozenset(comp)
         path = edges.get(key)
         return [path] if path else []
 
+    start = root or comp[0]
     join_sequence: List[Tuple[str, str, List[Tuple[str, str]]]] = []
-    joined: Set[str] = {comp[0]}
-    queue: List[str] = [comp[0]]
+    joined: Set[str] = {start}
+    queue: Deque[str] = deque([start])
 
     while queue and len(joined) < len(comp):
-        current = queue.pop(0)
+        current = queue.popleft()
 
-        for neighbor in adj.get(current, set()):
+        for neighbor in adj.get(current, []):
             if neighbor not in joined and neighbor in comp:
                 key = frozenset({current, neighbor})
                 path = edges.get(key)
@@ -228,16 +228,224 @@ def _build_join_sequence_for_connected_component(
     return join_sequence
 
 
+# --- Statistics-aware planning -----------------------------------------------
+
+# stats가 있는 model에 필터가 걸려 있을 때 필터 하나당 가정하는 선택도
+DEFAULT_FILTER_SELECTIVITY = 0.1
+
+
+def _find_inner_join_root(
+    join_graph: JoinGraph,
+    comp: List[str],
+    edges: Dict[frozenset, Tuple[str, str, List[Tuple[str, str]]]],
+    adj: Dict[str, List[str]],
+) -> Optional[str]:
+    """
+    INNER JOIN으로 바꿔도 결과가 같은 시작 model을 찾습니다. 없으면 None
+    - 시작 model에서 BFS로 조인할 때 모든 조인이 foreign -> primary(N:1) 방향이고,
+      그 foreign entity가 모두 required이면 LEFT JOIN과 INNER JOIN의 결과가 같습니다.
+    """
+    for root in comp:
+        join_sequence = _build_join_sequence_for_connected_component(
+            comp, edges, adj, root=root
+        )
+        if all(
+            edges[frozenset({lhm, rhm})][0] == lhm and join_graph.is_required(lhm, rhm)
+            for lhm, rhm, _ in join_sequence
+        ):
+            return root
+    return None
+
+
+def _estimate_model_rows(
+    join_graph: JoinGraph, comp: List[str], filter_counts: Dict[str, int]
+) -> Optional[Dict[str, float]]:
+    """필터를 반영한 model별 예상 행 수. stats(row_count)가 없는 model이 하나라도 있으면 None"""
+    if any(model not in join_graph.row_counts for model in comp):
+        return None
+    return {
+        model: max(
+            1.0,
+            join_graph.row_counts[model]
+            * DEFAULT_FILTER_SELECTIVITY ** filter_counts.get(model, 0),
+        )
+        for model in comp
+    }
+
+
+def _estimate_join_rows(
+    join_graph: JoinGraph,
+    left_rows: float,
+    step: Tuple[str, str, List[Tuple[str, str]]],
+    pk_model: str,
+    model_rows: Dict[str, float],
+) -> float:
+    """
+    left_rows 행에 step의 rhm을 조인했을 때의 예상 행 수
+    |L ⋈ R| = |L| * |R| / max(ndv(L.key), ndv(R.key))
+    distinct count가 없으면 primary 쪽은 그 model의 행 수, foreign 쪽은 primary 쪽 행 수로 가정합니다.
+    """
+    lhm, rhm, join_pairs = step
+    lhe, rhe = join_pairs[0]
+    pk_rows = join_graph.row_counts[pk_model]
+
+    def _ndv(model, column):
+        distinct_count = join_graph.distinct_count(model, column)
+        if distinct_count is not None:
+            return max(1, distinct_count)
+        if model == pk_model:
+            return max(1, pk_rows)
+        return max(1, min(join_graph.row_counts[model], pk_rows))
+
+    return left_rows * model_rows[rhm] / max(_ndv(lhm, lhe), _ndv(rhm, rhe))
+
+
+def _order_join_tree_from(
+    join_graph: JoinGraph,
+    driving_model: str,
+    join_sequence: List[Tuple[str, str, List[Tuple[str, str]]]],
+    edges: Dict[frozenset, Tuple[str, str, List[Tuple[str, str]]]],
+    model_rows: Dict[str, float],
+    inner: bool,
+) -> Tuple[List[Tuple[str, str, List[Tuple[str, str]]]], float]:
+    """driving_model에서 시작해 매번 중간 결과 행 수가 가장 작은 조인을 고릅니다. (순서, 중간 결과 행 수 합)"""
+    remaining = list(join_sequence)
+    joined: Set[str] = {driving_model}
+    current_rows = model_rows[driving_model]
+    total_rows = current_rows
+    ordered: List[Tuple[str, str, List[Tuple[str, str]]]] = []
+
+    while remaining:
+        best = None
+        for index, (lhm, rhm, join_pairs) in enumerate(remaining):
+            if lhm in joined and rhm not in joined:
+                step = (lhm, rhm, join_pairs)
+            elif rhm in joined and lhm not in joined:
+                step = (rhm, lhm, [(rhe, lhe) for lhe, rhe in join_pairs])
+            else:
+                continue
+            pk_model = edges[frozenset({lhm, rhm})][1]
+            rows = _estimate_join_rows(join_graph, current_rows, step, pk_model, model_rows)
+            if not inner:
+                # LEFT JOIN은 왼쪽 행을 줄이지 않습니다.
+                rows = max(rows, current_rows)
+            if best is None or rows < best[0]:
+                best = (rows, index, step)
+
+        rows, index, step = best
+        remaining.pop(index)
+        joined.add(step[1])
+        current_rows = rows
+        total_rows += rows
+        ordered.append(step)
+
+    return ordered, total_rows
+
+
+def _reorder_join_sequence(
+    join_graph: JoinGraph,
+    join_sequence: List[Tuple[str, str, List[Tuple[str, str]]]],
+    edges: Dict[frozenset, Tuple[str, str, List[Tuple[str, str]]]],
+    model_rows: Dict[str, float],
+    inner: bool,
+) -> List[Tuple[str, str, List[Tuple[str, str]]]]:
+    """
+    이미 정해진 조인 트리(join_sequence의 간선들)는 그대로 두고, 중간 결과 행 수가 작아지도록 순서만 다시 정합니다.
+    - INNER JOIN: 모든 model을 시작 후보로 보고 중간 결과 행 수 합이 가장 작은 순서를 고릅니다.
+    - LEFT JOIN: 시작 model이 결과 행을 결정하므로 시작 model은 바꾸지 않습니다.
+    """
+    if not inner:
+        ordered, _ = _order_join_tree_from(
+            join_graph, join_sequence[0][0], join_sequence, edges, model_rows, inner
+        )
+        return ordered
+
+    best = None
+    for driving_model in model_rows:
+        ordered, total_rows = _order_join_tree_from(
+            join_graph, driving_model, join_sequence, edges, model_rows, inner
+        )
+        if best is None or total_rows < best[1]:
+            best = (ordered, total_rows)
+    return best[0]
+
+
+def _plan_join_sequence(
+    join_graph: JoinGraph,
+    comp: List[str],
+    edges: Dict[frozenset, Tuple[str, str, List[Tuple[str, str]]]],
+    adj: Dict[str, List[str]],
+    filter_counts: Dict[str, int],
+) -> Tuple[List[Tuple[str, str, List[Tuple[str, str]]]], str]:
+    """
+    조인 순서와 조인 종류("LEFT" | "INNER")를 정합니다.
+    - required foreign entity로 INNER JOIN이 안전하면 INNER JOIN을 사용합니다.
+    - 모든 model에 stats(row_count)가 있으면 중간 결과 행 수가 작아지도록 시작 model/순서를 정합니다.
+    - 둘 다 해당하지 않으면 기존과 같이 comp[0]에서 BFS 순서로 LEFT JOIN 합니다.
+    """
+    inner_root = _find_inner_join_root(join_graph, comp, edges, adj)
+    if inner_root is None:
+        join_sequence = _build_join_sequence_for_connected_component(comp, edges, adj)
+        join_kind = "LEFT"
+    else:
+        join_sequence = _build_join_sequence_for_connected_component(
+            comp, edges, adj, root=inner_root
+        )
+        join_kind = "INNER"
+
+    model_rows = _estimate_model_rows(join_graph, comp, filter_counts)
+    if join_sequence and model_rows:
+        join_sequence = _reorder_join_sequence(
+            join_graph, join_sequence, edges, model_rows, inner=join_kind == "INNER"
+        )
+    return join_sequence, join_kind
+
+
 # --- Public API (assemble) ----------------------------------------------------
 
 
-def generate_join_sql(semantic_manifest: list, models: list[str]) -> str:
+def default_join_filterable_models(manifest_index: ManifestIndex, models: list[str]) -> Set[str]:
+    """
+    default join(generate_join_sql)에서 proj layer에 filter를 걸어도 join 이후 WHERE와 결과가 같은 model들
+    - LEFT JOIN이면 FROM(시작) model만 해당합니다. 오른쪽 model은 NULL로 채워지는 쪽이라 proj layer에서 걸러도 행이 남습니다.
+    - INNER JOIN이면 모든 model이 해당합니다.
+    조인할 수 없는 조합이면(JoinError로 나눠 다시 변환됨) 빈 set
+    """
+    if len(models) == 1:
+        return set(models)
+    if any(not manifest_index.find_model(model_name) for model_name in models):
+        return set()
+
+    join_graph = manifest_index.join_graph
+    edges, adj = _build_join_graph_and_paths_by_name(join_graph, models)
+    comps = _connected_components_names(models, adj)
+    if len(comps) != 1:
+        return set()
+    try:
+        # LEFT JOIN의 시작 model은 filter 수(stats 기반 순서)와 무관하게 정해집니다.
+        join_sequence, join_kind = _plan_join_sequence(join_graph, comps[0], edges, adj, {})
+    except JoinError:
+        return set()
+    if not join_sequence:
+        return set()
+    if join_kind == "INNER":
+        return set(comps[0])
+    return {join_sequence[0][0]}
+
+
+
+def generate_join_sql(
+    manifest_index: ManifestIndex,
+    models: list[str],
+    filter_counts: Optional[Dict[str, int]] = None,
+) -> str:
     """
     모델 이름 리스트로부터 SQL JOIN 절 생성 (복합 키 조인 지원)
 
     Args:
-        semantic_models: 전체 semantic model 리스트
+        manifest_index: semantic manifest의 ManifestIndex
         models: 조인할 모델 이름들 (예: ["acct_installment_saving_src", "acct_installment_saving_daily"])
+        filter_counts: model별 proj layer 필터 수 (stats 기반 조인 순서 결정 시 선택도 추정에 사용)
 
     Returns:
         SQL JOIN 절 문자열 (예: "FROM A LEFT JOIN B ON A.계좌번호 = B.계좌번호 AND A.기준일자 = B.기준일자")
@@ -246,34 +454,30 @@ def generate_join_sql(semantic_manifest: list, models: list[str]) -> str:
         JoinError: 모델들을 조인할 수 없는 경우
     """
 
-    semantic_models = semantic_manifest["semantic_models"]
-
     if not models:
         return ""
 
     if len(models) == 1:
         return f"FROM {models[0]}"
 
-    # 모델 이름으로 semantic model 조회
-    name_to_sm = {sm["name"]: sm for sm in semantic_models}
-    sms = []
     for model_name in models:
-        sm = name_to_sm.get(model_name)
-        if not sm:
+        if not manifest_index.find_model(model_name):
             raise ValueError(f"Model '{model_name}' not found in semantic models")
-        sms.append(sm)
 
-    # 조인 그래프 구성
-    edges, adj = _build_join_graph_and_paths_by_name(sms)
+    # 조인 그래프 구성: manifest 단위로 캐싱된 join_graph에서 요청된 model 사이의 간선만 조회
+    join_graph = manifest_index.join_graph
+    edges, adj = _build_join_graph_and_paths_by_name(join_graph, models)
     comps = _connected_components_names(models, adj)
 
     # 연결되지 않은 컴포넌트가 있으면 에러
     if len(comps) >= 2:
         model_sets = [tuple(comp) for comp in comps]
-        raise JoinError(
-            "Multiple disjoint model sets detected. Cannot generate JOIN clause.",
-            model_sets=model_sets,
-        )
+        message = "Multiple disjoint model sets detected. Cannot generate JOIN clause."
+        # 다른 model을 거치면 연결되는 경우, 참고용으로 bridge 경로를 함께 남깁니다.
+        if join_graph.same_component(models):
+            bridge_path = join_graph.shortest_path(comps[0][0], comps[1][0])
+            message += f" Bridge path: {' -> '.join(bridge_path)}"
+        raise JoinError(message, model_sets=model_sets)
 
     comp = comps[0]
 
@@ -286,8 +490,10 @@ def generate_join_sql(semantic_manifest: list, models: list[str]) -> str:
             )
         return f"FROM {comp[0]}"
 
-    # 조인 순서 결정
-    join_sequence = _build_join_sequence_for_connected_component(comp, edges, adj)
+    # 조인 순서/종류 결정
+    join_sequence, join_kind = _plan_join_sequence(
+        join_graph, comp, edges, adj, filter_counts or {}
+    )
 
     if not join_sequence:
         raise JoinError(
@@ -300,12 +506,12 @@ def generate_join_sql(semantic_manifest: list, models: list[str]) -> str:
     first_model = join_sequence[0][0]  # lhm of first join
     sql_parts = [f"FROM {first_model}"]
 
-    # 각 조인 추가 (모두 LEFT JOIN 사용, 복합 키 지원)
+    # 각 조인 추가 (기본은 LEFT JOIN, INNER JOIN이 안전하면 INNER JOIN, 복합 키 지원)
     for lhm, rhm, join_pairs in join_sequence:
         # 모든 조인 조건을 AND로 연결
         on_conditions = [f"{lhm}.{lhe} = {rhm}.{rhe}" for lhe, rhe in join_pairs]
         on_clause = " AND ".join(on_conditions)
-        join_clause = f"LEFT JOIN {rhm} ON {on_clause}"
+        join_clause = f"{join_kind} JOIN {rhm} ON {on_clause}"
         sql_parts.append(join_clause)
 
     return " ".join(sql_parts)
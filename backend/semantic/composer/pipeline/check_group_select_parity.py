@@ -1,6 +1,6 @@
 import vendor_setup
 from sqlglot import expressions as exp
-from backend.semantic.utils import append_node, AGGREGATION_EXPRESSIONS
+from backend.semantic.utils import AGGREGATION_EXPRESSIONS
 
 
 def check_group_select_parity_and_complete(parsed_smq):
@@ -22,8 +22,8 @@ def check_group_select_parity_and_complete(parsed_smq):
         ]
         if metric.name not in agg_layer_groups_in_str:
             if isinstance(metric, exp.Alias):
-                parsed_smq = append_node(parsed_smq, "agg", "groups", metric.this)
+                parsed_smq.append("agg", "groups", metric.this)
             else:
-                parsed_smq = append_node(parsed_smq, "agg", "groups", metric)
+                parsed_smq.append("agg", "groups", metric)
 
     return parsed_smq
@@ -1,7 +1,5 @@
 import vendor_setup
-import sqlglot
 from sqlglot import expressions as exp
-from backend.semantic.utils import append_node
 
 
 def check_if_original_smq_included_and_complete_if_not(parsed_smq, original_smq):
@@ -20,14 +18,14 @@ def check_if_original_smq_included_and_complete_if_not(parsed_smq, original_smq)
         metric.alias for metric in uppermost_metrics if isinstance(metric, exp.Alias)
     ]
 
-    original_metrics = original_smq.get("metrics", [])
-    for metric in original_metrics:
-        if metric not in stringfied_uppermost_metrics:
-            not_included_metrics.append(metric)
+    for item in original_smq.entries("metrics"):
+        if item.raw not in stringfied_uppermost_metrics:
+            not_included_metrics.append(item)
 
     # 2) not_included_metric을 uppermost_layer에 추가합니다.metric이면 그대로, measure나 dimension이면 table_name을 떼고 추가합니다.
-    for metric in not_included_metrics:
-        parsed_metric = sqlglot.parse_one(metric)
+    for item in not_included_metrics:
+        metric = item.raw
+        parsed_metric = item.parse()
 
         # 2-1) metric이 식인 경우
         if not isinstance(parsed_metric, (exp.Column, exp.Identifier)):
@@ -36,8 +34,8 @@ def check_if_original_smq_included_and_complete_if_not(parsed_smq, original_smq)
                 if "__" in ident.name:
                     _, column_name = ident.name.split("__", 1)
                     ident.replace(exp.Identifier(this=column_name))
-            parsed_smq = append_node(
-                parsed_smq, uppermost_layer, "metrics", node_to_append
+            parsed_smq.append(
+                uppermost_layer, "metrics", node_to_append
             )
             continue
 
@@ -45,13 +43,13 @@ def check_if_original_smq_included_and_complete_if_not(parsed_smq, original_smq)
         if "__" in metric:
             _, column_name = metric.split("__", 1)
             node_to_append = exp.Column(this=exp.Identifier(this=column_name))
-            parsed_smq = append_node(
-                parsed_smq, uppermost_layer, "metrics", node_to_append
+            parsed_smq.append(
+                uppermost_layer, "metrics", node_to_append
             )
         else:
-            node_to_append = sqlglot.parse_one(metric)
-            parsed_smq = append_node(
-                parsed_smq, uppermost_layer, "metrics", node_to_append
+            node_to_append = item.parse()
+            parsed_smq.append(
+                uppermost_layer, "metrics", node_to_append
             )
 
     return parsed_smq
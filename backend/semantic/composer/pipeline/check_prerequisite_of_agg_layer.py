@@ -1,9 +1,8 @@
 import vendor_setup
-import sqlglot
 from sqlglot import expressions as exp
 from backend.semantic.utils import (
+    parse_expr,
     find_metric_by_name,
-    append_node,
     find_table_of_column_from_original_smq,
     find_dimension_by_name,
     find_measure_by_name,
@@ -11,7 +10,7 @@ from backend.semantic.utils import (
 
 
 def check_prerequisite_of_agg_layer_and_complete(
-    parsed_smq, original_smq, semantic_manifest, dialect
+    parsed_smq, original_smq, manifest_index, dialect
 ):
     """Agg Layer에 필요한 하위 항목들이 다 들어 있는지 확인합니다."""
     if "agg" not in parsed_smq:
@@ -24,44 +23,48 @@ def check_prerequisite_of_agg_layer_and_complete(
     for key in agg_layer:
         agg_nodes_list += agg_layer[key]
     nodes_to_check_prerequisite = []
+    names_to_check_prerequisite = set()
     for node in agg_nodes_list:
         columns = node.find_all(exp.Column)
         if not columns:
             continue
         for column in columns:
-            if column.name not in [node.name for node in nodes_to_check_prerequisite]:
+            if column.name not in names_to_check_prerequisite:
                 nodes_to_check_prerequisite.append(column)
+                names_to_check_prerequisite.add(column.name)
 
     # 2) 각 칼럼들이 metric인지 dimension인지 판단합니다.
     for node in nodes_to_check_prerequisite:
-        metric = find_metric_by_name(node.name, semantic_manifest)
+        metric = find_metric_by_name(node.name, manifest_index)
 
         # 2-1) metric이면 해당 모델에 expr 안에 있는 칼럼들이 proj_layer에 다 있는지 확인합니다. (alias가 있으면 alias를, name이면 name을 확인합니다.)
         if metric:
             expr = metric.get("expr", None)
-            parsed_expr = sqlglot.parse_one(expr, read=dialect)
+            parsed_expr = parse_expr(expr, dialect)
             
             # 먼저 Identifier들을 찾아서 metric인지 확인합니다.
             identifiers = parsed_expr.find_all(exp.Identifier)
             for ident in identifiers:
                 # Identifier가 metric인지 확인
-                ident_metric = find_metric_by_name(ident.name, semantic_manifest)
+                ident_metric = find_metric_by_name(ident.name, manifest_index)
                 if ident_metric:
                     # metric이면 재귀적으로 처리하기 위해 해당 metric을 nodes_to_check_prerequisite에 추가
                     # (이미 처리 중인 metric은 건너뛰기 위해 나중에 처리)
                     ident_column = exp.Column(this=exp.Identifier(this=ident.name))
-                    if ident_column.name not in [node.name for node in nodes_to_check_prerequisite]:
+                    if ident_column.name not in names_to_check_prerequisite:
                         nodes_to_check_prerequisite.append(ident_column)
+                        names_to_check_prerequisite.add(ident_column.name)
                     continue
             
             # Column들을 찾아서 처리합니다 (metric이 아닌 경우)
             for column in parsed_expr.find_all(exp.Column):
                 # Column의 name이 metric인지 먼저 확인
-                column_metric = find_metric_by_name(column.name, semantic_manifest)
+                column_metric = find_metric_by_name(column.name, manifest_index)
                 if column_metric:
                     # metric이면 재귀적으로 처리하기 위해 해당 metric을 nodes_to_check_prerequisite에 추가
-                    if column.name not in [node.name for node in nodes_to_check_prerequisite]:
+                    if column.name not in names_to_check_prerequisite:
                         nodes_to_check_prerequisite.append(column)
+                        names_to_check_prerequisite.add(column.name)
                     continue
                 
                 # metric이 아니면 table__column 형식으로 처리
@@ -72,35 +75,25 @@ def check_prerequisite_of_agg_layer_and_complete(
                 node_to_append = exp.Column(this=exp.Identifier(this=column_name))
 
                 # 2-1-a) 이미 column이 project layer에 있으면 다음 column으로 continue하고
-                if table_name in parsed_smq:
-                    proj_layer_columns_in_str = [
-                        node.name
-                        for node in parsed_smq[table_name].get("metrics", [])
-                        if node.name
-                    ] + [
-                        node.alias
-                        for node in parsed_smq[table_name].get("metrics", [])
-                        if isinstance(node, exp.Alias)
-                    ]
-                    if column_name in proj_layer_columns_in_str:
-                        continue
+                if parsed_smq.clause(table_name, "metrics").has_output_name(column_name):
+                    continue
 
                 # 2-1-b) column이 proj layer에 없으면 추가합니다.
                 # measure나 dimension을 찾아서 expr이 있으면 Alias로 추가
-                column_def = find_measure_by_name(table_name, column_name, semantic_manifest)
+                column_def = find_measure_by_name(table_name, column_name, manifest_index)
                 if not column_def:
-                    column_def = find_dimension_by_name(table_name, column_name, semantic_manifest)
+                    column_def = find_dimension_by_name(table_name, column_name, manifest_index)
                 
                 if column_def and column_def.get("expr", None):
                     expr = column_def["expr"]
-                    parsed_column_expr = sqlglot.parse_one(expr, read=dialect)
+                    parsed_column_expr = parse_expr(expr, dialect)
                     if parsed_column_expr.sql() != column_name:
                         node_to_append = exp.Alias(
                             this=parsed_column_expr, alias=exp.Identifier(this=column_name)
                         )
                 
-                parsed_smq = append_node(
-                    parsed_smq, table_name, "metrics", node_to_append
+                parsed_smq.append(
+                    table_name, "metrics", node_to_append
                 )
         # 2-2) measure/dimension이면 모델을 찾아서 있는지 확인하고 없으면 더합니다.
         else:
@@ -115,23 +108,13 @@ def check_prerequisite_of_agg_layer_and_complete(
 
             node_to_append = exp.Column(this=exp.Identifier(this=column_name))
             # 2-2-a) 이미 column이 project layer에 있으면 continue하고
-            if table_name in parsed_smq:
-                proj_layer_columns_in_str = [
-                    node.name
-                    for node in parsed_smq[table_name].get("metrics", [])
-                    if node.name
-                ] + [
-                    node.alias
-                    for node in parsed_smq[table_name].get("metrics", [])
-                    if isinstance(node, exp.Alias)
-                ]
-                if column_name in proj_layer_columns_in_str:
-                    continue
+            if parsed_smq.clause(table_name, "metrics").has_output_name(column_name):
+                continue
             # 2-2-b) column이 proj layer에 없으면 추가합니다.
-            column = find_dimension_by_name(table_name, column_name, semantic_manifest)
+            column = find_dimension_by_name(table_name, column_name, manifest_index)
             if not column:
                 column = find_measure_by_name(
-                    table_name, column_name, semantic_manifest
+                    table_name, column_name, manifest_index
                 )
             if not column:
                 raise ValueError(
@@ -139,13 +122,13 @@ def check_prerequisite_of_agg_layer_and_complete(
                 )
             if column.get("expr", None):
                 expr = column["expr"]
-                parsed_expr = sqlglot.parse_one(expr, read=dialect)
+                parsed_expr = parse_expr(expr, dialect)
                 if parsed_expr.sql() == column_name:
                     node_to_append = exp.Column(this=exp.Identifier(this=column_name))
                 else:
                     node_to_append = exp.Alias(
                         this=parsed_expr, alias=exp.Identifier(this=column_name)
                     )
-            parsed_smq = append_node(parsed_smq, table_name, "metrics", node_to_append)
+            parsed_smq.append(table_name, "metrics", node_to_append)
 
     return parsed_smq
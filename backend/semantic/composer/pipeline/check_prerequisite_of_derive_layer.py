@@ -1,8 +1,7 @@
 import vendor_setup
-import sqlglot
 from sqlglot import expressions as exp
 from backend.semantic.utils import (
-    append_node,
+    parse_expr,
     find_metric_by_name,
     find_dimension_by_name,
     find_measure_by_name,
@@ -10,7 +9,7 @@ from backend.semantic.utils import (
 
 
 def check_prerequisite_of_deriv_layer_and_complete(
-    parsed_smq, original_smq, semantic_manifest, dialect
+    parsed_smq, original_smq, manifest_index, dialect
 ):
     """Deriv Layer에 필요한 하위 항목들이 다 들어 있는지 확인합니다."""
     if "deriv" not in parsed_smq:
@@ -25,34 +24,32 @@ def check_prerequisite_of_deriv_layer_and_complete(
             deriv_nodes_list += deriv_nodes_dict[key]
 
     nodes_to_check_prerequisite = []
+    names_to_check_prerequisite = set()
+    deriv_aliases = {node.alias for node in deriv_nodes_list if node.alias}
 
     for node in deriv_nodes_list:
         columns = node.find_all(exp.Column)
         if not columns:
             continue
         for column in columns:
-            if column.name not in [node.name for node in nodes_to_check_prerequisite]:
+            if column.name not in names_to_check_prerequisite:
                 nodes_to_check_prerequisite.append(column)
+                names_to_check_prerequisite.add(column.name)
 
     # 2) 각 칼럼들이 metric인지 dimension인지 판단합니다.
     for node in nodes_to_check_prerequisite:
-        metric = find_metric_by_name(node.name, semantic_manifest)
+        metric = find_metric_by_name(node.name, manifest_index)
 
         # 2-1) metric이면 agg에 expr AS alias가 있는지 확인하고, 없으면 추가합니다. (expr column들이 proj에 있는지는 check_prerequisited_of_agg_...에서 확인)
         if metric:
-            agg_layer_aliases_in_str = [
-                node.alias
-                for node in parsed_smq["agg"].get("metrics", [])
-                if node.alias
-            ]
-            if metric["name"] in agg_layer_aliases_in_str:
+            if parsed_smq.clause("agg", "metrics").has_alias(metric["name"]):
                 continue
 
             else:
-                parsed_metric_expr = sqlglot.parse_one(metric["expr"], read=dialect)
+                parsed_metric_expr = parse_expr(metric["expr"], dialect)
                 for ident in parsed_metric_expr.find_all(exp.Identifier):
                     # 먼저 metric인지 확인
-                    ident_metric = find_metric_by_name(ident.name, semantic_manifest)
+                    ident_metric = find_metric_by_name(ident.name, manifest_index)
                     if ident_metric:
                         # metric인 경우는 이미 다른 곳에서 처리되므로 건너뜁니다.
                         # identifier 이름은 그대로 유지합니다.
@@ -70,18 +67,17 @@ def check_prerequisite_of_deriv_layer_and_complete(
                     ident.replace(exp.Identifier(this=column_name))
                     # 주의) 여기서 해당 measure를 proj layer에 추가합니다!
                     column = find_measure_by_name(
-                        table_name, column_name, semantic_manifest
+                        table_name, column_name, manifest_index
                     )
                     if not column:
                         column = find_dimension_by_name(
-                            table_name, column_name, semantic_manifest
+                            table_name, column_name, manifest_index
                         )
                     if column:
                         expr = column.get("expr")
                         if expr:
-                            parsed_column_expr = sqlglot.parse_one(expr, read=dialect)
-                            parsed_smq = append_node(
-                                parsed_smq,
+                            parsed_column_expr = parse_expr(expr, dialect)
+                            parsed_smq.append(
                                 table_name,
                                 "metrics",
                                 exp.Alias(
@@ -91,15 +87,13 @@ def check_prerequisite_of_deriv_layer_and_complete(
                             )
 
                     else:
-                        parsed_smq = append_node(
-                            parsed_smq,
+                        parsed_smq.append(
                             table_name,
                             "metrics",
                             exp.Column(this=exp.Identifier(this=column_name)),
                         )
 
-                parsed_smq = append_node(
-                    parsed_smq,
+                parsed_smq.append(
                     "agg",
                     "metrics",
                     exp.Alias(
@@ -109,22 +103,14 @@ def check_prerequisite_of_deriv_layer_and_complete(
                 )
 
         # 2-2) node.name이 alias인 경우는 건너뜁니다.
-        elif node.name in [node.alias for node in deriv_nodes_list if node.alias]:
+        elif node.name in deriv_aliases:
             continue
 
         # 2-3) dimension이면 agg에 dimension이 있는지 확인하고, 없으면 추가합니다.
         else:
-            agg_layer_columns_in_str = [
-                node.name for node in parsed_smq["agg"].get("metrics", []) if node.name
-            ] + [
-                node.alias
-                for node in parsed_smq["agg"].get("metrics", [])
-                if node.alias
-            ]
-
             node_name = node.name if node.name else node.this.name
 
-            if node_name in agg_layer_columns_in_str:
+            if parsed_smq.clause("agg", "metrics").has_output_name(node_name):
                 continue
             else:
                 # node에 table 정보가 있으면 함께 추가 (ambiguous column 방지)
@@ -135,8 +121,7 @@ def check_prerequisite_of_deriv_layer_and_complete(
                     )
                 else:
                     column_to_append = exp.Column(this=exp.Identifier(this=node_name))
-                parsed_smq = append_node(
-                    parsed_smq,
+                parsed_smq.append(
                     "agg",
                     "metrics",
                     column_to_append,
@@ -1,6 +1,5 @@
-from backend.semantic.utils import AGGREGATION_EXPRESSIONS, append_node
+from backend.semantic.utils import AGGREGATION_EXPRESSIONS
 from sqlglot import exp
-import sqlglot
 
 
 def move_dimension_expr_to_deriv_layer_if_deriv_exists(parsed_smq, original_smq):
@@ -23,8 +22,8 @@ def move_dimension_expr_to_deriv_layer_if_deriv_exists(parsed_smq, original_smq)
             node_to_move.append(node)
             continue
         if isinstance(node, exp.Alias):
-            for metric in original_smq["metrics"]:
-                parsed_metric = sqlglot.parse_one(metric)
+            for item in original_smq.entries("metrics"):
+                parsed_metric = item.node()
                 if not isinstance(parsed_metric, exp.Alias):
                     continue
                 if (
@@ -38,6 +37,6 @@ def move_dimension_expr_to_deriv_layer_if_deriv_exists(parsed_smq, original_smq)
 
     for node in node_to_move:
         agg_layer_metrics.remove(node)
-        parsed_smq = append_node(parsed_smq, "deriv", "metrics", node)
+        parsed_smq.append("deriv", "metrics", node)
 
     return parsed_smq
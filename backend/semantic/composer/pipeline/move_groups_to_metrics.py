@@ -1,6 +1,3 @@
-from backend.semantic.utils import append_node
-
-
 def move_groups_to_metrics(parsed_smq):
     uppermost_layer = "deriv" if "deriv" in parsed_smq else "agg"
     groups = parsed_smq.get("agg", {}).get("groups", [])
@@ -13,8 +10,7 @@ def move_groups_to_metrics(parsed_smq):
     for group in groups:
 
         if group not in uppermost_metrics_in_str:
-            parsed_smq = append_node(
-                parsed_smq,
+            parsed_smq.append(
                 uppermost_layer,
                 "metrics",
                 group,
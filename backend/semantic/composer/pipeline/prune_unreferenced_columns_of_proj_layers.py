@@ -0,0 +1,75 @@
+import vendor_setup
+from sqlglot import expressions as exp
+
+
+def prune_unreferenced_columns_of_proj_layers(parsed_smq):
+    """
+    proj layer(base CTE)의 metrics 중 agg layer에서 참조하지 않는 칼럼을 지웁니다.
+
+    - deriv layer는 agg layer만 읽으므로, base CTE의 칼럼을 읽는 곳은 agg layer뿐입니다.
+    - agg layer의 모든 항목(metrics, groups, filters, orders, joins)에서 칼럼 참조를 모읍니다.
+      (model 접두사 없는 참조, subquery 안의 참조는 모든 model의 칼럼을 참조하는 것으로 봅니다.)
+    - proj 칼럼은 출력 이름(alias)이나, 그 칼럼을 계산하는 원본 칼럼 중 하나라도 참조되면 남깁니다.
+      예) SUBSTRING(base_dt, 1, 6) AS ym은 agg에서 ym 또는 deposit__base_dt를 참조하면 남깁니다.
+      (agg layer가 같은 식을 원본 칼럼으로 다시 쓰는 경우가 있기 때문입니다.)
+    - 이름으로 참조할 수 없는 식, agg layer에 * 가 있는 경우는 그대로 둡니다.
+    - join key는 이후 add_default_join 단계에서 다시 추가됩니다.
+    """
+    if "agg" not in parsed_smq:
+        return parsed_smq
+
+    base_layers = [key for key in parsed_smq if key not in ("agg", "deriv")]
+    if not base_layers:
+        return parsed_smq
+
+    # 1) agg layer에서 참조하는 칼럼 이름을 model별로 모읍니다. (None: 모든 model에 해당)
+    referenced = {}
+    for key, nodes in parsed_smq["agg"].items():
+        if key == "limit" or not nodes:
+            continue
+        for node in nodes:
+            for star in node.find_all(exp.Star):
+                if not isinstance(star.parent, exp.Count):
+                    return parsed_smq
+            for column in node.find_all(exp.Column):
+                table_name, column_name = column.table or None, column.name
+                if not table_name and "__" in column_name:
+                    table_name, column_name = column_name.split("__", 1)
+                if column.find_ancestor(exp.Subquery):
+                    table_name = None
+                referenced.setdefault(table_name, set()).add(column_name)
+
+    unqualified = referenced.get(None, set())
+
+    # 2) proj layer마다 참조되지 않는 칼럼을 지웁니다.
+    for base_name in base_layers:
+        proj_layer = parsed_smq[base_name]
+        proj_metrics = proj_layer.get("metrics", None)
+        if not proj_metrics:
+            continue
+
+        names_in_use = unqualified | referenced.get(base_name, set())
+        # 같은 layer의 group/order에서 select alias를 참조하는 경우도 남겨 둡니다.
+        for key in ("groups", "orders"):
+            for node in proj_layer.get(key, None) or []:
+                names_in_use |= {column.name for column in node.find_all(exp.Column)}
+
+        pruned_metrics = [node for node in proj_metrics if _is_referenced(node, names_in_use)]
+        # 주의) 칼럼이 하나도 남지 않으면 SELECT가 비므로 그대로 둡니다.
+        if pruned_metrics and len(pruned_metrics) < len(proj_metrics):
+            proj_layer["metrics"] = pruned_metrics
+
+    return parsed_smq
+
+
+def _is_referenced(node, names_in_use):
+    if isinstance(node, exp.Alias):
+        output_name = node.alias
+    elif isinstance(node, exp.Column):
+        output_name = node.name
+    else:
+        return True
+    if not output_name or output_name in names_in_use:
+        return True
+    # alias 칼럼은 계산에 쓰인 원본 칼럼이 참조되는 경우에도 남깁니다.
+    return any(column.name in names_in_use for column in node.find_all(exp.Column))
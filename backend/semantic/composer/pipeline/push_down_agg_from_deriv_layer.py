@@ -1,5 +1,5 @@
 from backend.semantic.utils import (
-    append_node,
+    parse_expr,
     find_metric_by_name,
     find_table_of_column_from_original_smq,
     find_dimension_by_name,
@@ -7,7 +7,6 @@ from backend.semantic.utils import (
 )
 from sqlglot import expressions as exp
 from copy import deepcopy
-import sqlglot
 
 name_for_agg_function_map = {
     "sum": "합계",
@@ -18,7 +17,7 @@ name_for_agg_function_map = {
 }
 
 
-def push_down_agg_from_deriv_layer(parsed_smq, original_smq, semantic_manifest):
+def push_down_agg_from_deriv_layer(parsed_smq, original_smq, manifest_index):
     # deriv layer가 없으면 그냥 return
     if "deriv" not in parsed_smq:
         return parsed_smq
@@ -49,7 +48,7 @@ def push_down_agg_from_deriv_layer(parsed_smq, original_smq, semantic_manifest):
                 is_inner_node_metric = False
                 for inner_node in deepcopied_node.find_all(exp.Column):
                     metric_of_inner_node = find_metric_by_name(
-                        inner_node.name, semantic_manifest
+                        inner_node.name, manifest_index
                     )
 
                     if metric_of_inner_node:
@@ -60,12 +59,12 @@ def push_down_agg_from_deriv_layer(parsed_smq, original_smq, semantic_manifest):
                             inner_node.name, original_smq
                         )
                         metric_of_inner_node = find_measure_by_name(
-                            table_name, inner_node.name, semantic_manifest
+                            table_name, inner_node.name, manifest_index
                         )
 
                     if not metric_of_inner_node:
                         metric_of_inner_node = find_dimension_by_name(
-                            table_name, inner_node.name, semantic_manifest
+                            table_name, inner_node.name, manifest_index
                         )
 
                     if metric_of_inner_node is None:
@@ -78,15 +77,14 @@ def push_down_agg_from_deriv_layer(parsed_smq, original_smq, semantic_manifest):
 
                     if not is_inner_node_metric:
                         parsed_smq["deriv"]["metrics"].remove(node)
-                        parsed_smq = append_node(
-                            parsed_smq,
+                        parsed_smq.append(
                             "deriv",
                             "metrics",
                             exp.Column(this=exp.Identifier(this=deriv_metric_name)),
                         )
 
                     if is_inner_node_metric and expr_of_inner_node_metric:
-                        parsed_expr = sqlglot.parse_one(expr_of_inner_node_metric)
+                        parsed_expr = parse_expr(expr_of_inner_node_metric)
                         for ident in parsed_expr.find_all(exp.Identifier):
                             ident_name = ident.name
                             if "__" in ident_name:
@@ -96,8 +94,7 @@ def push_down_agg_from_deriv_layer(parsed_smq, original_smq, semantic_manifest):
                                 )
                         inner_node.replace(parsed_expr)
 
-                parsed_smq = append_node(
-                    parsed_smq,
+                parsed_smq.append(
                     "agg",
                     "metrics",
                     exp.Alias(
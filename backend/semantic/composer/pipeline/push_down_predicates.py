@@ -0,0 +1,231 @@
+import vendor_setup
+from sqlglot import expressions as exp
+
+from backend.semantic.utils import (
+    parse_expr,
+    find_dimension_by_name,
+    find_measure_by_name,
+)
+from backend.semantic.composer.pipeline.add_default_join import default_join_filterable_models
+
+
+def push_down_predicates(parsed_smq, original_smq, manifest_index, dialect):
+    """
+    filter가 join 전후 어느 layer에서 평가되어야 하는지 정리합니다.
+    1) deriv layer(집계 이후)의 filter 중 집계 전에 평가해도 되는 조건을 아래 layer로 내립니다.
+    2) LEFT JOIN의 오른쪽(NULL로 채워지는 쪽) model의 proj layer에 붙은 filter(parse_filters의 model 필터)를
+       agg layer의 WHERE로 올립니다. proj layer에서 거르면 join 후에 NULL 행으로 남기 때문입니다.
+    같은 조건을 filter 두 개로 나눠 주든 AND 하나로 주든 결과가 같아집니다.
+    """
+    parsed_smq = _push_down_deriv_filters(parsed_smq, original_smq, manifest_index, dialect)
+    return _lift_filters_of_null_supplied_models(parsed_smq, original_smq, manifest_index, dialect)
+
+
+def _push_down_deriv_filters(parsed_smq, original_smq, manifest_index, dialect):
+    """
+    deriv layer(집계 이후)에 붙은 filter 중, 집계 전에 평가해도 되는 조건을 아래 layer로 내립니다.
+
+    filter를 AND 단위(conjunct)로 나눈 뒤
+    - model 하나의 dimension/measure만 참조하는 조건 -> 해당 model의 proj layer (model 필터 하나를 준 것과 동일)
+      단, 그 model이 join의 FROM model이거나 INNER JOIN된 경우만 해당합니다.
+      LEFT JOIN의 오른쪽(NULL로 채워지는 쪽) model이면 proj layer에서 걸러도 행이 NULL로 남으므로 agg layer로 보냅니다.
+    - 여러 model의 dimension/measure만 참조하는 조건 -> agg layer의 WHERE (join 이후, 집계 이전)
+    - metric/alias, 집계/윈도우 함수, subquery가 있거나 칼럼 없이 상수만 있는 조건 -> deriv layer에 그대로 둡니다.
+    deriv layer에 남는 항목이 없으면 deriv layer를 없앱니다.
+    """
+    if "deriv" not in parsed_smq:
+        return parsed_smq
+
+    deriv_filters = parsed_smq["deriv"].get("filters") or []
+    if not deriv_filters:
+        return parsed_smq
+
+    filterable_models = None
+    remaining_filters = []
+    for node in deriv_filters:
+        conjuncts = _split_conjuncts(node)
+        pushable = [
+            (conjunct, _collect_column_refs(conjunct, manifest_index))
+            for conjunct in conjuncts
+        ]
+        # 1) 내릴 수 있는 조건이 하나도 없으면 원래 filter를 그대로 둡니다.
+        if all(refs is None for _, refs in pushable):
+            remaining_filters.append(node)
+            continue
+
+        for conjunct, refs in pushable:
+            if refs is None:
+                remaining_filters.append(conjunct)
+                continue
+
+            tables = {table_name for _, table_name, _, _ in refs}
+            if len(tables) == 1 and filterable_models is None:
+                filterable_models = _filterable_models(parsed_smq, original_smq, manifest_index)
+            # 2) model 하나만 참조하고 그 model의 행이 join 후에도 NULL로 남지 않으면 해당 proj layer로 내립니다.
+            if len(tables) == 1 and next(iter(tables)) in filterable_models:
+                conjunct = _to_proj_predicate(conjunct, refs, manifest_index, dialect)
+                parsed_smq.append(tables.pop(), "filters", conjunct)
+            # 3) 그 밖에는 agg layer로 내리고, 참조하는 칼럼을 proj layer에 추가합니다.
+            else:
+                conjunct = _to_agg_predicate(conjunct, refs)
+                parsed_smq.append("agg", "filters", conjunct)
+                for _, table_name, column_name, _ in refs:
+                    parsed_smq = _add_column_to_proj_layer(
+                        parsed_smq, table_name, column_name, manifest_index, dialect
+                    )
+
+    parsed_smq["deriv"]["filters"] = remaining_filters
+    if not remaining_filters:
+        del parsed_smq["deriv"]["filters"]
+
+    # 4) deriv layer가 비었으면 agg layer가 최상위가 되도록 지웁니다.
+    if not any(parsed_smq["deriv"].values()):
+        del parsed_smq["deriv"]
+
+    return parsed_smq
+
+
+def _lift_filters_of_null_supplied_models(parsed_smq, original_smq, manifest_index, dialect):
+    """
+    proj layer에 filter를 걸면 안 되는 model(LEFT JOIN의 오른쪽 등)의 filter를 agg layer의 WHERE로 옮깁니다.
+    조건의 칼럼은 model.column으로 바꾸고, 그 칼럼을 proj layer의 metrics에 추가합니다.
+    """
+    base_models = [model for model in parsed_smq.keys() if model not in {"agg", "deriv"}]
+    if len(base_models) < 2 or not any(parsed_smq[model].get("filters") for model in base_models):
+        return parsed_smq
+
+    filterable_models = _filterable_models(parsed_smq, original_smq, manifest_index)
+    for model in base_models:
+        filters = parsed_smq[model].get("filters") or []
+        if model in filterable_models or not filters:
+            continue
+
+        remaining_filters = []
+        for node in filters:
+            refs = _collect_tagged_refs(node)
+            if not refs:
+                remaining_filters.append(node)
+                continue
+            parsed_smq.append("agg", "filters", _to_agg_predicate(node, refs))
+            for _, table_name, column_name, _ in refs:
+                parsed_smq = _add_column_to_proj_layer(
+                    parsed_smq, table_name, column_name, manifest_index, dialect
+                )
+
+        if remaining_filters:
+            parsed_smq[model]["filters"] = remaining_filters
+        else:
+            del parsed_smq[model]["filters"]
+
+    return parsed_smq
+
+
+def _filterable_models(parsed_smq, original_smq, manifest_index):
+    """proj layer에 filter를 걸어도 join 이후 WHERE와 결과가 같은 model들"""
+    base_models = [model for model in parsed_smq.keys() if model not in {"agg", "deriv"}]
+    if not original_smq.get("joins"):
+        return default_join_filterable_models(manifest_index, base_models)
+
+    # joins로 직접 준 경우: RIGHT/FULL JOIN이 있으면 어느 쪽이든 NULL로 채워질 수 있습니다.
+    filterable = set()
+    join_nodes = parsed_smq["agg"].get("joins") if "agg" in parsed_smq else None
+    for join_node in join_nodes or []:
+        joins = join_node.args.get("joins") or []
+        if any(join.side in ("RIGHT", "FULL") for join in joins):
+            return set()
+        from_ = join_node.args.get("from")
+        if from_ is not None and isinstance(from_.this, exp.Table):
+            filterable.add(from_.this.name)
+        filterable.update(join.this.name for join in joins if not join.side)
+    return filterable
+
+
+def _split_conjuncts(node):
+    node = node.unnest()
+    if isinstance(node, exp.And):
+        return [conjunct.unnest() for conjunct in node.flatten()]
+    return [node]
+
+
+def _collect_column_refs(conjunct, manifest_index):
+    """
+    conjunct가 참조하는 model 칼럼들을 [(치환 대상 node, model, column, 이미 expr로 치환됐는지), ...]으로 반환합니다.
+    집계 전에 평가할 수 없는 조건이면 None
+    """
+    if conjunct.find(exp.AggFunc, exp.Window, exp.Subquery, exp.Select):
+        return None
+
+    refs = _collect_tagged_refs(conjunct)
+    tagged_nodes = set()
+    for target, _, _, _ in refs:
+        tagged_nodes.update(id(child) for child in target.walk())
+
+    # metric이 섞인 filter에서 온 조건은 "model__column" 형태 그대로 남아 있습니다. (dimension만 내립니다.)
+    for column in conjunct.find_all(exp.Column):
+        if id(column) in tagged_nodes:
+            continue
+        resolved = manifest_index.resolve_identifier(column.name)
+        if not resolved or not find_dimension_by_name(*resolved, manifest_index):
+            return None
+        refs.append((column, resolved[0], resolved[1], False))
+
+    return refs or None
+
+
+def _collect_tagged_refs(conjunct):
+    """parse_filters에서 이미 expr로 치환된 칼럼들 (meta에 원래 model/column이 남아 있음). subquery 안은 치환하지 않으므로 포함되지 않습니다."""
+    refs = []
+    for node in conjunct.walk():
+        smq_column = node.meta.get("smq_column")
+        if not smq_column:
+            continue
+        target = node.parent if isinstance(node.parent, exp.Column) else node
+        refs.append((target, smq_column[0], smq_column[1], True))
+    return refs
+
+
+def _replace_node(conjunct, target, new_node):
+    if target is conjunct:
+        return new_node
+    target.replace(new_node)
+    return conjunct
+
+
+def _to_proj_predicate(conjunct, refs, manifest_index, dialect):
+    for target, table_name, column_name, is_replaced in refs:
+        if is_replaced:
+            continue
+        dimension = find_dimension_by_name(table_name, column_name, manifest_index)
+        if dimension.get("expr", None):
+            new_node = parse_expr(dimension["expr"], dialect)
+        else:
+            new_node = exp.Column(this=exp.Identifier(this=dimension["name"]))
+        conjunct = _replace_node(conjunct, target, new_node)
+    return conjunct
+
+
+def _to_agg_predicate(conjunct, refs):
+    # agg layer에서는 proj layer(CTE)의 칼럼 이름으로 참조해야 하므로 model.column으로 바꿉니다.
+    for target, table_name, column_name, _ in refs:
+        new_node = exp.Column(
+            this=exp.Identifier(this=column_name), table=exp.Identifier(this=table_name)
+        )
+        conjunct = _replace_node(conjunct, target, new_node)
+    return conjunct
+
+
+def _add_column_to_proj_layer(parsed_smq, table_name, column_name, manifest_index, dialect):
+    if parsed_smq.clause(table_name, "metrics").has_output_name(column_name):
+        return parsed_smq
+
+    node_to_append = exp.Column(this=exp.Identifier(this=column_name))
+    column = find_dimension_by_name(table_name, column_name, manifest_index)
+    if not column:
+        column = find_measure_by_name(table_name, column_name, manifest_index)
+    if column and column.get("expr", None):
+        parsed_expr = parse_expr(column["expr"], dialect)
+        if parsed_expr.sql() != column_name:
+            node_to_append = exp.Alias(
+                this=parsed_expr, alias=exp.Identifier(this=column_name)
+            )
+    return parsed_smq.append(table_name, "metrics", node_to_append)
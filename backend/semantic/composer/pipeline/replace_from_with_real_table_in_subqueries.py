@@ -3,8 +3,9 @@ from backend.semantic.utils import replace_from_with_real_table
 from sqlglot import expressions as exp
 
 
-def replace_from_with_real_table_in_subqueries(parsed_smq, semantic_manifest, dialect):
+def replace_from_with_real_table_in_subqueries(parsed_smq, manifest_index):
     # 현재는 filter에만 적용합니다
+    # 출력 dialect와 무관한 compose_plan 단계이므로 table 이름은 quote 하지 않습니다. (bigquery의 backtick은 render에서 붙입니다)
     for layer in parsed_smq:
         for key in parsed_smq[layer]:
             if key == "limit":
@@ -33,7 +34,7 @@ def replace_from_with_real_table_in_subqueries(parsed_smq, semantic_manifest, di
 
                     # 2) from을 실제 테이블 네임으로 교체해 줍니다
                     new_select = replace_from_with_real_table(
-                        select, semantic_manifest, dialect
+                        select, manifest_index, None
                     )
                     subquery.set("this", new_select)
     return parsed_smq
@@ -11,7 +11,7 @@ from backend.semantic.utils import (
 
 def write_sql(
     parsed_smq: Dict[str, Any],
-    semantic_manifest,
+    manifest_index,
     dialect: str,
     original_smq: Optional[Dict[str, Any]] = None,
 ) -> exp.Select:
@@ -51,7 +51,7 @@ def write_sql(
             from_name=base_name,  # 실제 구현에선 물리 테이블 이름으로 매핑
         )
         base_select = replace_from_with_real_table(
-            base_select, semantic_manifest, dialect
+            base_select, manifest_index, dialect
         )
 
         ctes.append(
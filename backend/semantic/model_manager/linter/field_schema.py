@@ -16,12 +16,13 @@ SEMANTIC_MODEL_OPTIONAL_FIELDS: Set[str] = {
     "config",
     "node_relation",
     "primary_entity",
+    "stats",
 }
 SEMANTIC_MODEL_ALL_FIELDS: Set[str] = SEMANTIC_MODEL_REQUIRED_FIELDS | SEMANTIC_MODEL_OPTIONAL_FIELDS
 
 # Entity 필드 정의
 ENTITY_REQUIRED_FIELDS: Set[str] = {"name", "type"}
-ENTITY_OPTIONAL_FIELDS: Set[str] = {"expr", "description", "role", "label"}
+ENTITY_OPTIONAL_FIELDS: Set[str] = {"expr", "description", "role", "label", "required"}
 ENTITY_ALL_FIELDS: Set[str] = ENTITY_REQUIRED_FIELDS | ENTITY_OPTIONAL_FIELDS
 
 # Dimension 필드 정의
@@ -47,10 +47,12 @@ from backend.semantic.model_manager.linter.name_linter import (
     lint_filename_model_name_consistency,
     lint_foreign_entity_primary_match,
 )
+from backend.semantic.utils.request_profiler import profiled
 from backend.utils.logger import setup_logger
 
 
 logger = setup_logger("semantic_linter")
+@profiled()
 def lint_semantic_models(base_dir: str) -> SemanticLintResult:
     """
     semantic_models/*.yml, metrics, sources.yml, ddl.sql을 종합적으로 검사하여
@@ -31,7 +31,7 @@ def load_yaml(path: str) -> Any:
     with open(path, 'r', encoding='utf-8') as f:
         return yaml.safe_load(f)
 
-def scan_sources(sources_yml: str) -> Dict[Tuple[str, str], Dict[str, str]]:
+def scan_sources(sources_yml: str) -> Dict[Tuple[str, str], Dict[str, Any]]:
     data = load_yaml(sources_yml)
     if not data or 'sources' not in data:
         raise ParseError("Invalid sources.yml")
@@ -44,9 +44,69 @@ def scan_sources(sources_yml: str) -> Dict[Tuple[str, str], Dict[str, str]]:
                 "database": db,
                 "schema": sch,
                 "table": tname,
+                "stats": normalize_table_stats(tbl.get('stats'), f"{sname}.{tname}"),
             }
     return mapping
 
+def normalize_table_stats(stats: Any, where: str) -> Dict[str, Any] | None:
+    """
+    테이블 통계(선택)를 {"row_count": int | None, "distinct_counts": {컬럼: int}} 형태로 정리합니다.
+    sources.yml의 table, stats.yml, semantic model의 `stats` 모두 같은 형식을 사용합니다.
+
+        stats:
+          row_count: 40000000
+          distinct_counts:
+            ACNO: 40000000
+    """
+    if not stats:
+        return None
+    if not isinstance(stats, dict):
+        raise ParseError(f"Invalid stats for {where}: mapping expected")
+    try:
+        row_count = stats.get('row_count')
+        distinct_counts = {
+            str(col): int(cnt) for col, cnt in (stats.get('distinct_counts') or {}).items()
+        }
+        return {
+            "row_count": int(row_count) if row_count is not None else None,
+            "distinct_counts": distinct_counts,
+        }
+    except (TypeError, ValueError, AttributeError) as e:
+        raise ParseError(f"Invalid stats for {where}: {e}")
+
+def merge_table_stats(*stats_list: Dict[str, Any] | None) -> Dict[str, Any] | None:
+    """뒤에 오는 stats가 앞의 값을 덮어씁니다. 모두 비어 있으면 None"""
+    merged = None
+    for stats in stats_list:
+        if not stats:
+            continue
+        if merged is None:
+            merged = {"row_count": None, "distinct_counts": {}}
+        if stats.get("row_count") is not None:
+            merged["row_count"] = stats["row_count"]
+        merged["distinct_counts"].update(stats.get("distinct_counts") or {})
+    return merged
+
+def scan_stats(stats_yml: str) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """
+    warehouse에서 뽑아 둔 통계 파일(stats.yml, 선택)을 읽습니다. 파일이 없으면 빈 dict
+
+        tables:
+          - source: kjbank_daquv
+            name: waidp_d1010_l
+            row_count: 40000000
+            distinct_counts:
+              ACNO: 40000000
+    """
+    if not os.path.exists(stats_yml):
+        return {}
+    data = load_yaml(stats_yml) or {}
+    mapping = {}
+    for tbl in data.get('tables') or []:
+        key = (tbl.get('source'), tbl.get('name'))
+        mapping[key] = normalize_table_stats(tbl, f"{key[0]}.{key[1]}")
+    return mapping
+
 def parse_table_reference(table_field: Any) -> Tuple[str, str] | None:
     """Parse table reference like 'rerp_mssql_daquv('MIS_PRJ_ACCT')' into (source_name, table_name)"""
     if isinstance(table_field, str):
@@ -99,6 +159,10 @@ def transform_semantic_model(sm: Dict[str, Any], source_relations: Dict[Tuple[st
         "database": rel["database"]
         # "relation_name": f'"{rel["database"]}"."{rel["schema"]}"."{rel["table"]}"',
     }
+    stats = merge_table_stats(
+        rel.get("stats"),
+        normalize_table_stats(sm.get('stats'), str(sm.get('name'))),
+    )
     sm_out = {
         "name": sm.get('name'),
         "description": sm.get('description'),
@@ -110,6 +174,9 @@ def transform_semantic_model(sm: Dict[str, Any], source_relations: Dict[Tuple[st
         "label": sm.get('label'),
         "config": {"meta": {}},
     }
+    # 조인 순서 결정에 쓰이는 통계는 있을 때만 넣습니다.
+    if stats:
+        sm_out["stats"] = stats
     for ent in sm_out["entities"]:
         ent.setdefault("description", None)
         ent.setdefault("role", None)
@@ -328,9 +395,16 @@ def assemble_manifest(base_dir: str) -> Dict[str, Any]:
     date_yml = os.path.join(base_dir, 'date.yml')
     time_spine_sql = os.path.join(base_dir, 'time_spine_daily.sql')
     sources_yml = os.path.join(base_dir, 'sources.yml')
+    stats_yml = os.path.join(base_dir, 'stats.yml')
     sem_dir = os.path.join(base_dir, 'semantic_models')
 
     source_relations = scan_sources(sources_yml)
+    # stats.yml이 있으면 sources.yml의 stats보다 우선합니다.
+    for key, stats in scan_stats(stats_yml).items():
+        if key in source_relations:
+            source_relations[key]["stats"] = merge_table_stats(
+                source_relations[key].get("stats"), stats
+            )
     sems, metrics = parse_semantic_models(sem_dir)
 
     # semantic model 내부 dimension / measure 이름 중복 검사
@@ -1,8 +1,25 @@
 import yaml
 import os
+import re
 from typing import Dict, Any, Optional, Tuple
 from backend.semantic.model_manager.utils.ddl_types import TableInfo
 
+# DDL 주석에 적어 둔 통계 태그 (예: COMMENT '수신계좌 [rows=40000000]', COMMENT '계좌번호 [ndv=40000000]')
+STATS_TAG_RE = re.compile(r"\[\s*(rows|ndv)\s*=\s*(\d+)\s*\]", re.IGNORECASE)
+
+def _extract_stats_tag(comment: Optional[str]) -> Tuple[Optional[str], Dict[str, int]]:
+    """
+    주석에서 [rows=N] / [ndv=N] 태그를 떼어 내고 (태그를 뺀 주석, {"rows": N, "ndv": N})을 반환합니다.
+    태그만 있던 주석은 None이 됩니다.
+    """
+    if not comment:
+        return comment, {}
+    tags = {key.lower(): int(value) for key, value in STATS_TAG_RE.findall(comment)}
+    if not tags:
+        return comment, {}
+    cleaned = STATS_TAG_RE.sub("", comment).strip()
+    return cleaned or None, tags
+
 def _parse_comment(comment: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
     """
     주석을 ':' 기준으로 분리하여 label과 description을 반환합니다.
@@ -106,14 +123,27 @@ def generate_semantic_model_from_ddl(
         # sources.yml에서 찾지 못한 경우 기본값 사용
         table_ref = f"test_daquv('{table_name_in_db}')"
         
+    # 테이블/컬럼 주석의 통계 태그는 stats로 옮기고, label/description에서는 뺍니다.
+    table_comment, table_tags = _extract_stats_tag(table_info.comment)
+    column_comments: Dict[str, Optional[str]] = {}
+    distinct_counts: Dict[str, int] = {}
+    for col in table_info.columns:
+        column_comments[col.name], column_tags = _extract_stats_tag(col.comment)
+        if "ndv" in column_tags:
+            distinct_counts[col.name] = column_tags["ndv"]
+
     semantic_model = {
         "name": model_name,
         "table": table_ref,
-        "description": table_info.comment or f"Semantic model for {table_name_in_db}",
+        "description": table_comment or f"Semantic model for {table_name_in_db}",
         "entities": [],
         "dimensions": [],
         "measures": []
     }
+    if "rows" in table_tags or distinct_counts:
+        semantic_model["stats"] = {"row_count": table_tags.get("rows")}
+        if distinct_counts:
+            semantic_model["stats"]["distinct_counts"] = distinct_counts
     
     # 2. PK 처리 (entities)
     # PK가 없으면 첫 번째 컬럼을 entity로 사용하거나 생략? 
@@ -133,7 +163,7 @@ def generate_semantic_model_from_ddl(
         col_type = _map_db_type_to_semantic_type(col.type)
         
         # 주석 파싱 (':' 기준으로 label과 description 분리)
-        label, description = _parse_comment(col.comment)
+        label, description = _parse_comment(column_comments.get(col.name))
         if not label:
             label = col.name
         if not description:
@@ -175,7 +205,7 @@ def generate_semantic_model_from_ddl(
         
         # PK 컬럼 정보 찾기
         pk_col = next((col for col in table_info.columns if col.name == first_pk), None)
-        pk_comment = pk_col.comment if pk_col else None
+        pk_comment = column_comments.get(pk_col.name) if pk_col else None
         
         # PK 주석 파싱 (':' 기준으로 label과 description 분리)
         pk_label, pk_description = _parse_comment(pk_comment)
@@ -1,8 +1,7 @@
-import sqlglot
 from sqlglot import expressions as exp
 
 from backend.semantic.utils import (
-    append_node,
+    parse_expr,
     is_metric_in_expr,
     find_measure_by_name,
     find_dimension_by_name,
@@ -10,33 +9,31 @@ from backend.semantic.utils import (
 )
 
 
-def parse_filters(parsed_smq, values, semantic_manifest, dialect):
-    for value in values:
-        parsed_smq = _parse_single_value(parsed_smq, value, semantic_manifest, dialect)
+def parse_filters(parsed_smq, values, manifest_index, dialect):
+    for item in values:
+        parsed_smq = _parse_single_value(parsed_smq, item, manifest_index, dialect)
     return parsed_smq
 
 
-def _parse_single_value(parsed_smq, value, semantic_manifest, dialect):
-    parsed_value = sqlglot.parse_one(value, read=dialect)
+def _parse_single_value(parsed_smq, item, manifest_index, dialect):
+    parsed_value = item.parse(dialect)
 
     # 1) metric이 있으면 deriv layer에 추가합니다.
-    if is_metric_in_expr(parsed_value, semantic_manifest):
+    if is_metric_in_expr(parsed_value, manifest_index):
         # 1-a) metric이면 deriv layer에 추가합니다.
         # 주의) 만약 Column이 없으면 literal을 찾아서 그 literal 중 this가 str인 걸 column으로 바꿔줍니다.
         if not list(parsed_value.find_all(exp.Column)):
             for literal in parsed_value.this.find_all(exp.Literal):
                 if isinstance(literal.this, str):
                     literal.replace(exp.Column(this=exp.Identifier(this=literal.this)))
-        parsed_smq = append_node(
-            parsed_smq,
+        parsed_smq.append(
             "deriv",
             "filters",
             parsed_value,
         )
     # 2) metric이 아닌데 앞에 model 접두사가 붙어 있지 않고, metric의 alias인 경우 그냥 deriv에 붙여 줍니다.
     elif "__" not in parsed_value.this.sql():
-        parsed_smq = append_node(
-            parsed_smq,
+        parsed_smq.append(
             "deriv",
             "filters",
             parsed_value,
@@ -66,12 +63,12 @@ def _parse_single_value(parsed_smq, value, semantic_manifest, dialect):
                     f"필터 식의 식별자 '{ident_name}'이 잘못되었습니다. '테이블명__컬럼명' 형식이어야 합니다."
                 )
             dimension = find_dimension_by_name(
-                table_name, column_name, semantic_manifest
+                table_name, column_name, manifest_index
             )
-            measure = find_measure_by_name(table_name, column_name, semantic_manifest)
+            measure = find_measure_by_name(table_name, column_name, manifest_index)
             if not dimension and not measure:
                 # metric인지 확인
-                metric = find_metric_by_name(column_name, semantic_manifest)
+                metric = find_metric_by_name(column_name, manifest_index)
                 if metric:
                     raise ValueError(
                         f"필터 식의 식별자 '{ident_name}'이 semantic manifest에 존재하지 않습니다. "
@@ -82,24 +79,25 @@ def _parse_single_value(parsed_smq, value, semantic_manifest, dialect):
                     raise ValueError(
                         f"필터 식의 식별자 '{ident_name}'이 semantic manifest에 존재하지 않습니다. "
                         f"table_name='{table_name}', column_name='{column_name}' "
-                        f"(filters 파싱 중, 필터 값: '{value}' 처리 중)"
+                        f"(filters 파싱 중, 필터 값: '{item.raw}' 처리 중)"
                     )
             if dimension:
                 if dimension.get("expr", None):
-                    this_to_replace = sqlglot.parse_one(dimension["expr"], read=dialect)
+                    this_to_replace = parse_expr(dimension["expr"], dialect)
                 else:
                     this_to_replace = exp.Identifier(this=dimension["name"])
             if measure:
                 if measure.get("expr", None):
-                    this_to_replace = sqlglot.parse_one(measure["expr"], read=dialect)
+                    this_to_replace = parse_expr(measure["expr"], dialect)
                 else:
                     this_to_replace = exp.Identifier(this=measure["name"])
+            # composer의 push_down_predicates 단계에서 원래 model/column을 알 수 있도록 남겨 둡니다.
+            this_to_replace.meta["smq_column"] = (table_name, column_name)
             ident.replace(this_to_replace)
 
         # 3-2) 만약 table_name이 2개 이상이면 deriv에 붙입니다.
         if len(table_names_set) > 1:
-            parsed_smq = append_node(
-                parsed_smq,
+            parsed_smq.append(
                 "deriv",
                 "filters",
                 parsed_value,
@@ -108,8 +106,7 @@ def _parse_single_value(parsed_smq, value, semantic_manifest, dialect):
         else:
             # table_names_set이 비어있는 경우 (상수 필터 등) deriv에 추가합니다.
             target_table = list(table_names_set)[0] if table_names_set else "deriv"
-            parsed_smq = append_node(
-                parsed_smq,
+            parsed_smq.append(
                 target_table,
                 "filters",
                 parsed_value,
@@ -1,14 +1,12 @@
 from sqlglot import expressions as exp
-from backend.semantic.utils import append_node
 
 
-def parse_limit(parsed_smq, value, semantic_manifest, dialect):
+def parse_limit(parsed_smq, value, manifest_index, dialect):
     if not value:
         return parsed_smq
     if not isinstance(value, int):
         raise ValueError("limit 값은 정수여야 합니다.")
-    parsed_smq = append_node(
-        parsed_smq,
+    parsed_smq.append(
         "deriv",
         "limit",
         value,
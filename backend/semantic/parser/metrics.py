@@ -1,103 +1,64 @@
 import vendor_setup
-import sqlglot
 from sqlglot import expressions as exp
 
 from backend.semantic.utils import (
+    parse_expr,
     find_metric_by_name,
     find_dimension_by_name,
     find_measure_by_name,
     is_metric_in_expr,
-    append_node,
     derived_metric_in_expr,
     AGGREGATION_EXPRESSIONS,
 )
 
 
-def parse_metrics(parsed_smq, values, semantic_manifest, dialect):
-    for value in values:
-        parsed_smq = _parse_single_value(parsed_smq, value, semantic_manifest, dialect)
+def parse_metrics(parsed_smq, values, manifest_index, dialect):
+    for item in values:
+        parsed_smq = _parse_single_value(parsed_smq, item, manifest_index, dialect)
     return parsed_smq
 
 
-def _parse_single_value(parsed_smq, value, semantic_manifest, dialect):
+def _parse_single_value(parsed_smq, item, manifest_index, dialect):
 
     # 0) 우선 sqlglot으로 파싱하고, alias가 있으면 alias만 따로 떼어 낸다.
-    parsed_value = sqlglot.parse_one(value, read=dialect)
+    parsed_value = item.parse(dialect)
     alias = None
 
     if isinstance(parsed_value, exp.Alias):
         alias = parsed_value.alias
         parsed_value = parsed_value.this
 
-    # 0-1) derived metric인 경우 (무한 루프 방지: 최대 10회)
-    max_iterations = 10
-    iteration_count = 0
-    processed_metrics = []  # 순환 참조 감지를 위한 리스트 (순서 보존)
-    
-    while derived_metric_in_expr(parsed_value, semantic_manifest):
-        iteration_count += 1
-        
-        if iteration_count > max_iterations:
-            raise RecursionError(
-                f"Metric expansion exceeded maximum depth ({max_iterations}). "
-                f"이것은 보통 순환 참조(circular reference)를 의미합니다. "
-                f"참여한 metrics: {' → '.join(processed_metrics)}. "
-                f"시멘틱 모델의 metric 정의를 확인해 주세요."
-            )
-        
-        changed = False
-        for col in parsed_value.find_all(exp.Column):
-            col_name = col.name
-            
-            # 순환 참조 감지
-            if col_name in processed_metrics:
-                cycle_path = ' → '.join(processed_metrics) + ' → ' + col_name
-                raise RecursionError(
-                    f"Metric 간 순환 참조가 감지되었습니다: {cycle_path}. "
-                    f"시멘틱 모델의 metric 정의에서 순환 의존성을 제거해 주세요."
-                )
-            
-            metric = find_metric_by_name(col_name, semantic_manifest)
-            if not metric:
+    # 0-1) derived metric인 경우, manifest 로드 시 미리 펼쳐 둔 식(simple metric 단위)으로 치환합니다.
+    # 순환 참조는 metric_graph 생성 시점에 이미 걸러집니다.
+    if derived_metric_in_expr(parsed_value, manifest_index):
+        metric_graph = manifest_index.metric_graph
+        if not alias:
+            alias = parsed_value.sql()
+        for col in list(parsed_value.find_all(exp.Column)):
+            if not metric_graph.is_derived(col.name):
                 continue
-            
-            processed_metrics.append(col_name)
-            expr = metric.get("expr", None)
-            if not expr:
-                raise AttributeError(
-                    f"Metric {col_name}에 expr이 없습니다. 시멘틱 모델을 확인해 주세요."
-                )
-            parsed_expr = sqlglot.parse_one(expr)
-            if is_metric_in_expr(parsed_expr, semantic_manifest):
-                if not alias:
-                    alias = parsed_value.sql()
-                if col is parsed_value:
-                    parsed_value = parsed_expr
-                    changed = True
-                else:
-                    col.replace(parsed_expr)
-                    changed = True
-        
-        # 변경사항이 없으면 루프 종료
-        if not changed:
-            break
+            expanded_expr = metric_graph.expand(col.name)
+            if col is parsed_value:
+                parsed_value = expanded_expr
+            else:
+                col.replace(expanded_expr)
 
     # 1) 식인지 아닌지 구분한다
     # exp.Columnm, exp.Literal -> 식이 아님
     # -> 식이면 1-a로, 아니면 2
     if not isinstance(parsed_value, (exp.Column, exp.Literal)):
         # 1-a) metric의 식
-        if is_metric_in_expr(parsed_value, semantic_manifest):
+        if is_metric_in_expr(parsed_value, manifest_index):
             metrics_in_expression = []
             for ident in parsed_value.find_all(exp.Identifier):
-                ident_metric = find_metric_by_name(ident.name, semantic_manifest)
+                ident_metric = find_metric_by_name(ident.name, manifest_index)
                 if not ident_metric:
                     table_name, column_name = ident.name.split("__", 1)
                     # measure를 먼저 찾고, 없으면 dimension에서 찾습니다.
-                    column = find_measure_by_name(table_name, column_name, semantic_manifest)
+                    column = find_measure_by_name(table_name, column_name, manifest_index)
                     if not column:
                         column = find_dimension_by_name(
-                            table_name, column_name, semantic_manifest
+                            table_name, column_name, manifest_index
                         )
                     if column is None:
                         raise ValueError(
@@ -106,21 +67,19 @@ def _parse_single_value(parsed_smq, value, semantic_manifest, dialect):
                             f"(metrics 파싱 중, 식 내부의 identifier '{ident.name}' 처리 중)"
                         )
                     expr = column.get("expr", None)
-                    expr = sqlglot.parse_one(expr) if expr else None
+                    expr = parse_expr(expr) if expr else None
                     if expr and expr.sql() != column_name:
                         expr_with_alias = exp.Alias(
                             this=expr,
                             alias=exp.Identifier(this=column_name),
                         )
-                        parsed_smq = append_node(
-                            parsed_smq,
+                        parsed_smq.append(
                             table_name,
                             "metrics",
                             expr_with_alias,
                         )
                     else:
-                        parsed_smq = append_node(
-                            parsed_smq,
+                        parsed_smq.append(
                             table_name,
                             "metrics",
                             exp.Column(this=exp.Identifier(this=column_name)),
@@ -137,11 +96,10 @@ def _parse_single_value(parsed_smq, value, semantic_manifest, dialect):
 
             for metric in metrics_in_expression:
                 parsed_smq = _parse_individual_metric_in_metrics_clause(
-                    parsed_smq, metric, semantic_manifest, dialect
+                    parsed_smq, metric, manifest_index, dialect
                 )
 
-            parsed_smq = append_node(
-                parsed_smq,
+            parsed_smq.append(
                 "deriv",
                 "metrics",
                 exp.Alias(
@@ -169,15 +127,13 @@ def _parse_single_value(parsed_smq, value, semantic_manifest, dialect):
                     else exp.Alias(this=parsed_value, alias=exp.Identifier(this=alias))
                 )
                 if parsed_value.find(AGGREGATION_EXPRESSIONS):
-                    parsed_smq = append_node(
-                        parsed_smq,
+                    parsed_smq.append(
                         "agg",
                         "metrics",
                         node_to_append,
                     )
                 else:
-                    parsed_smq = append_node(
-                        parsed_smq,
+                    parsed_smq.append(
                         table_name,
                         "metrics",
                         node_to_append,
@@ -188,8 +144,7 @@ def _parse_single_value(parsed_smq, value, semantic_manifest, dialect):
             else:
                 for ident in idents:
                     table_name, dimension_name = ident.name.split("__", 1)
-                    parsed_smq = append_node(
-                        parsed_smq,
+                    parsed_smq.append(
                         table_name,
                         "metrics",
                         exp.Column(this=exp.Identifier(this=dimension_name)),
@@ -200,9 +155,8 @@ def _parse_single_value(parsed_smq, value, semantic_manifest, dialect):
                     this=parsed_value,
                     alias=exp.Identifier(this=alias) if alias else parsed_value,
                 )
-                parsed_smq = append_node(parsed_smq, "agg", "metrics", node_with_alias)
-                parsed_smq = append_node(
-                    parsed_smq,
+                parsed_smq.append("agg", "metrics", node_with_alias)
+                parsed_smq.append(
                     "deriv",
                     "metrics",
                     node_with_alias,
@@ -218,10 +172,10 @@ def _parse_single_value(parsed_smq, value, semantic_manifest, dialect):
     if "__" in name:
         table_name, column_name = name.split("__", 1)
         # measure를 먼저 찾고, 없으면 dimension에서 찾습니다.
-        column = find_measure_by_name(table_name, column_name, semantic_manifest)
+        column = find_measure_by_name(table_name, column_name, manifest_index)
         if not column:
             column = find_dimension_by_name(
-                table_name, column_name, semantic_manifest
+                table_name, column_name, manifest_index
             )
         if column is None:
             raise ValueError(
@@ -232,20 +186,18 @@ def _parse_single_value(parsed_smq, value, semantic_manifest, dialect):
         # 3-1) column의 expr이 있고 expr.sql()이 column_name과 같지 않은 경우 Alias(this=(Column(this=Identifier(this=...))), alias(this=Identifier(this=...)))
         expr = column.get("expr", None)
         if expr and expr != column_name:
-            parsed_expr = sqlglot.parse_one(expr, read=dialect)
+            parsed_expr = parse_expr(expr, dialect)
             expr_with_alias = exp.Alias(
                 this=parsed_expr, alias=exp.Identifier(this=column_name)
             )
-            parsed_smq = append_node(
-                parsed_smq,
+            parsed_smq.append(
                 table_name,
                 "metrics",
                 expr_with_alias,
             )
         # 3-2) column의 expr이 없거나 expr.sql()이 column_name과 같은 경우 그냥 Column(this=Identifier(this=...))
         else:
-            parsed_smq = append_node(
-                parsed_smq,
+            parsed_smq.append(
                 table_name,
                 "metrics",
                 exp.Column(this=exp.Identifier(this=column_name)),
@@ -254,13 +206,13 @@ def _parse_single_value(parsed_smq, value, semantic_manifest, dialect):
 
     # 4) metric의 경우 complex dsl에 추가하고, 필요한 base column이 model dsl에 없으면 추가한다.
     else:
-        metric = find_metric_by_name(name, semantic_manifest)
+        metric = find_metric_by_name(name, manifest_index)
         if not metric:
             raise ValueError(
                 f"{parsed_value} 안의 {name if name else parsed_value.this.sql()}에 해당하는 metric이 semantic manifest에 없습니다."
             )
         parsed_smq = _parse_individual_metric_in_metrics_clause(
-            parsed_smq, metric, semantic_manifest, dialect
+            parsed_smq, metric, manifest_index, dialect
         )
 
     # 5) 이름에 __도 없고, metric도 None이다 -> 둘 다 아니다 -> ValueError.
@@ -275,21 +227,21 @@ def _parse_single_value(parsed_smq, value, semantic_manifest, dialect):
 
 
 def _parse_individual_metric_in_metrics_clause(
-    parsed_smq, metric, semantic_manifest, dialect
+    parsed_smq, metric, manifest_index, dialect
 ):
     # 0) expr을 parse합니다.
     expr = metric.get("expr", None)
     name = metric.get("name", None)
     if not expr:
         raise ValueError("Metric에는 반드시 expr이 있어야 합니다.")
-    parsed_expr = sqlglot.parse_one(expr, read=dialect)
+    parsed_expr = parse_expr(expr, dialect)
 
     # 1) expr에 있는 measures를 찾아서 각 table의 dsl에 추가합니다.
     idents = parsed_expr.find_all(exp.Identifier)
     metrics_in_expression = []
     for ident in idents:
         # 먼저 metric인지 확인
-        ident_metric = find_metric_by_name(ident.name, semantic_manifest)
+        ident_metric = find_metric_by_name(ident.name, manifest_index)
         if ident_metric:
             # metric인 경우는 재귀적으로 처리하기 위해 수집
             metrics_in_expression.append(ident_metric)
@@ -304,10 +256,10 @@ def _parse_individual_metric_in_metrics_clause(
             )
         
         table_name, column_name = ident.name.split("__", 1)
-        column = find_measure_by_name(table_name, column_name, semantic_manifest)
+        column = find_measure_by_name(table_name, column_name, manifest_index)
         # 주의 measure에 없으면 dimension에서 찾아봅니다.
         if not column:
-            column = find_dimension_by_name(table_name, column_name, semantic_manifest)
+            column = find_dimension_by_name(table_name, column_name, manifest_index)
         if not column:
             raise ValueError(
                 f"Metric expr에 사용된 column {column_name}을(를) semantic manifest에서 찾을 수 없습니다."
@@ -325,12 +277,11 @@ def _parse_individual_metric_in_metrics_clause(
         # 1-1) measure의 expr이 있는 경우 Alias(this=(Column(this=Identifier(this=...))), alias(this=Identifier(this=...)))
         measure_expr = column.get("expr", None)
         if measure_expr and measure_expr != column_name:
-            parsed_measure_expr = sqlglot.parse_one(measure_expr, read=dialect)
+            parsed_measure_expr = parse_expr(measure_expr, dialect)
             expr_with_alias = exp.Alias(
                 this=parsed_measure_expr, alias=exp.Identifier(this=column_name)
             )
-            parsed_smq = append_node(
-                parsed_smq,
+            parsed_smq.append(
                 table_name,
                 "metrics",
                 expr_with_alias,
@@ -338,8 +289,7 @@ def _parse_individual_metric_in_metrics_clause(
 
         # 1-2) measure의 epxr이 없는 경우 그냥 Column(this=Identifier(this=...))
         else:
-            parsed_smq = append_node(
-                parsed_smq,
+            parsed_smq.append(
                 table_name,
                 "metrics",
                 exp.Column(this=exp.Identifier(this=column_name)),
@@ -348,11 +298,11 @@ def _parse_individual_metric_in_metrics_clause(
     # 1-3) expr 내부에 metric이 있는 경우 재귀적으로 처리합니다.
     for metric_in_expr in metrics_in_expression:
         parsed_smq = _parse_individual_metric_in_metrics_clause(
-            parsed_smq, metric_in_expr, semantic_manifest, dialect
+            parsed_smq, metric_in_expr, manifest_index, dialect
         )
 
     # 2) agg layer에 expr을 추가합니다.
     agg_node = exp.Alias(this=parsed_expr, alias=exp.Identifier(this=name))
-    parsed_smq = append_node(parsed_smq, "agg", "metrics", agg_node)
+    parsed_smq.append("agg", "metrics", agg_node)
 
     return parsed_smq
@@ -1,7 +1,6 @@
-import sqlglot
 from sqlglot import expressions as exp
 from backend.semantic.utils import (
-    append_node,
+    parse_expr,
     is_metric_in_expr,
     derived_metric_in_expr,
     find_metric_by_name,
@@ -10,9 +9,9 @@ from backend.semantic.utils import (
 )
 
 
-def parse_orders(parsed_smq, values, semantic_manifest, dialect):
-    for value in values:
-        parsed_value = sqlglot.parse_one(value, read=dialect)
+def parse_orders(parsed_smq, values, manifest_index, dialect):
+    for item in values:
+        parsed_value = item.parse(dialect)
         desc = False
         # parsed_value가 Neg인 경우, 앞에 "-"가 붙은 경우이므로 desc=True로 설정
         if isinstance(parsed_value, exp.Neg):
@@ -26,8 +25,7 @@ def parse_orders(parsed_smq, values, semantic_manifest, dialect):
                 this=exp.Column(this=exp.Identifier(this=column_name)),
                 desc=desc,
             )
-            parsed_smq = append_node(
-                parsed_smq,
+            parsed_smq.append(
                 "deriv",
                 "orders",
                 value_to_append,
@@ -37,11 +35,11 @@ def parse_orders(parsed_smq, values, semantic_manifest, dialect):
         else:
             derived_metric = False
             # 2-1) derive metric인 경우 먼저 unpack해 줍니다
-            while derived_metric_in_expr(parsed_value, semantic_manifest):
+            while derived_metric_in_expr(parsed_value, manifest_index):
                 derived_metric = True
                 for col in parsed_value.find_all(exp.Column):
                     col_name = col.name
-                    metric = find_metric_by_name(col_name, semantic_manifest)
+                    metric = find_metric_by_name(col_name, manifest_index)
                     if not metric:
                         continue
                     expr = metric.get("expr", None)
@@ -49,19 +47,19 @@ def parse_orders(parsed_smq, values, semantic_manifest, dialect):
                         raise AttributeError(
                             f"Metric {col_name}에 expr이 없습니다. 시멘틱 모델을 확인해 주세요."
                         )
-                    parsed_expr = sqlglot.parse_one(expr)
+                    parsed_expr = parse_expr(expr)
                     # 주의) 안에 dimension이 있으면 table_name을 떼 주고, 해당 table의 proj layer에 column을 추가해 줘야 합니다.
                     for ident in parsed_expr.find_all(exp.Identifier):
                         ident_metric = find_metric_by_name(
-                            ident.name, semantic_manifest
+                            ident.name, manifest_index
                         )
                         if not ident_metric:
                             table_name, column_name = ident.name.split("__", 1)
                             # measure를 먼저 찾고, 없으면 dimension에서 찾습니다.
-                            column = find_measure_by_name(table_name, column_name, semantic_manifest)
+                            column = find_measure_by_name(table_name, column_name, manifest_index)
                             if not column:
                                 column = find_dimension_by_name(
-                                    table_name, column_name, semantic_manifest
+                                    table_name, column_name, manifest_index
                                 )
                             if column is None:
                                 raise ValueError(
@@ -70,20 +68,18 @@ def parse_orders(parsed_smq, values, semantic_manifest, dialect):
                                     f"(orders 파싱 중, derived metric의 identifier '{ident.name}' 처리 중)"
                                 )
                             expr = column.get("expr", None)
-                            expr = sqlglot.parse_one(expr) if expr else None
+                            expr = parse_expr(expr) if expr else None
                             if expr and expr != column_name:
                                 expr_with_alias = exp.Alias(
                                     this=expr, alias=exp.Identifier(this=column_name)
                                 )
-                                parsed_smq = append_node(
-                                    parsed_smq,
+                                parsed_smq.append(
                                     table_name,
                                     "metrics",
                                     expr_with_alias,
                                 )
                             else:
-                                parsed_smq = append_node(
-                                    parsed_smq,
+                                parsed_smq.append(
                                     table_name,
                                     "metrics",
                                     exp.Column(
@@ -91,7 +87,7 @@ def parse_orders(parsed_smq, values, semantic_manifest, dialect):
                                     ),
                                 )
                             ident.replace(exp.Identifier(this=column_name))
-                    if is_metric_in_expr(parsed_expr, semantic_manifest):
+                    if is_metric_in_expr(parsed_expr, manifest_index):
                         if col is parsed_value:
                             parsed_value = parsed_expr
                         else:
@@ -108,8 +104,7 @@ def parse_orders(parsed_smq, values, semantic_manifest, dialect):
                     this=exp.Column(this=exp.Identifier(this=column_name)),
                     desc=desc,
                 )
-            parsed_smq = append_node(
-                parsed_smq,
+            parsed_smq.append(
                 "deriv",
                 "orders",
                 value_to_append,
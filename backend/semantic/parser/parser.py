@@ -1,5 +1,6 @@
 from backend.semantic.types.smq_types import SMQ
-from collections import defaultdict
+from backend.semantic.types.layer_plan import LayerPlan
+from backend.semantic.types.parsed_smq import ParsedSMQ
 from backend.utils.logger import setup_logger
 from backend.semantic.parser.metrics import parse_metrics
 from backend.semantic.parser.limit import parse_limit
@@ -7,6 +8,9 @@ from backend.semantic.parser.groups import parse_groups
 from backend.semantic.parser.filters import parse_filters
 from backend.semantic.parser.orders import parse_orders
 from backend.semantic.parser.joins import parse_joins
+from backend.semantic.utils import ensure_manifest_index
+from backend.semantic.utils.compile_metrics import compile_metrics
+from backend.semantic.utils.tracing import tracer
 
 logger = setup_logger("smq_parser")
 
@@ -16,10 +20,10 @@ class SMQParser:
 
     def __init__(
         self,
-        semantic_manifest,
+        manifest_index,
         dialect=None,
     ):
-        self.semantic_manifest = semantic_manifest
+        self.manifest_index = ensure_manifest_index(manifest_index)
         self.dialect = dialect
 
     def parse(self, smq: SMQ):
@@ -27,8 +31,10 @@ class SMQParser:
         설계 원칙
         1. 각 parser는 해당 SMQ 키에 맞는 값만 추가하며, filter에 있는 값이 select에 없어서 생기는 문제 등은 composer에서 처리합니다.
         """
-        logger.info("🔵 SMQParser.parse 시작")
-        parsed_smq = defaultdict(lambda: defaultdict())
+        # 각 항목은 ParsedSMQ 안에서 한 번만 파싱되고, 파서는 그 복사본을 받아 씁니다.
+        if not isinstance(smq, ParsedSMQ):
+            smq = ParsedSMQ(smq)
+        parsed_smq = LayerPlan()
 
         # SMQ 키별 파서 함수 매핑
         parsers = {
@@ -40,17 +46,21 @@ class SMQParser:
             "joins": parse_joins,
         }
 
-        logger.info("🔵 SMQ 키 순회 시작: %s", list(smq.keys()))
         for k, v in smq.items():
             if not v or (isinstance(v, list) and len(v) == 1 and v[0] == ""):
-                logger.info("🔵 SMQ 키 '%s' 건너뜀 (비어있음)", k)
                 continue
             parser = parsers.get(k)
             if parser:
-                logger.info("🔵 파서 '%s' 실행 시작 (값: %s)", k, str(v)[:100])
                 try:
-                    parsed_smq = parser(parsed_smq, v, self.semantic_manifest, self.dialect)
-                    logger.info("🔵 파서 '%s' 실행 완료", k)
+                    with compile_metrics.time_stage("parse", k, self.dialect), tracer.span(
+                        "smq.parse", key=k
+                    ) as span:
+                        if span.recording:
+                            span.set_attribute("items", len(v) if isinstance(v, list) else 1)
+                        values = smq.entries(k) if isinstance(v, list) else v
+                        parsed_smq = parser(parsed_smq, values, self.manifest_index, self.dialect)
+                    # 파서가 이미 들어간 node를 직접 바꿨을 수 있으므로 다음 키에서 index를 다시 만듭니다.
+                    parsed_smq.invalidate_indexes()
                 except Exception as e:
                     import traceback
                     logger.error("🔵 파서 '%s' 실행 중 오류: %s", k, str(e))
@@ -59,5 +69,4 @@ class SMQParser:
             else:
                 raise ValueError(f"{k}는 SMQ에서 사용할 수 없는 키값입니다.")
 
-        logger.info("🔵 SMQParser.parse 완료")
         return parsed_smq
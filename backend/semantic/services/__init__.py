@@ -1,14 +1,24 @@
-"""Semantic services module"""
+"""Semantic services module
+
+SMQ 변환과 무관한 서비스(파싱/린팅/draft 생성)와 배치 변환은 처음 접근할 때 import 합니다.
+(SMQ 변환만 하는 worker/배치 작업이 linter, draft 생성 등의 import 비용을 내지 않도록)
+"""
+
+import importlib
 
-from backend.semantic.services.semantic_model_service import (
-    semantic_parse_service,
-    semantic_lint_service,
-    draft_service,
-)
 from backend.semantic.services.smq2sql_service import (
     prepare_smq_to_sql,
     smq_to_sql,
 )
+from backend.semantic.services.compile_cache import compile_cache
+from backend.semantic.services.manifest_registry import manifest_registry
+
+_LAZY_EXPORTS = {
+    "semantic_parse_service": "backend.semantic.services.semantic_model_service",
+    "semantic_lint_service": "backend.semantic.services.semantic_model_service",
+    "draft_service": "backend.semantic.services.semantic_model_service",
+    "compile_many": "backend.semantic.services.smq2sql_batch_service",
+}
 
 __all__ = [
     "semantic_parse_service",
@@ -16,4 +26,20 @@ __all__ = [
     "draft_service",
     "prepare_smq_to_sql",
     "smq_to_sql",
+    "compile_cache",
+    "manifest_registry",
+    "compile_many",
 ]
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
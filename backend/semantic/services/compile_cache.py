@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# 따옴표(', ", `)로 감싼 리터럴은 공백을 그대로 두고, 나머지 구간의 연속 공백만 하나로 줄입니다.
+_QUOTED_OR_WHITESPACE = re.compile(r"('(?:[^']|'')*'|\"[^\"]*\"|`[^`]*`)|\s+")
+
+
+def normalize_whitespace(text: str) -> str:
+    return _QUOTED_OR_WHITESPACE.sub(
+        lambda m: m.group(1) if m.group(1) is not None else " ", text
+    ).strip()
+
+
+def canonicalize_smq(smq: Dict[str, Any]) -> str:
+    """
+    캐시 키로 쓰기 위해 SMQ를 정규화된 JSON 문자열로 바꿉니다.
+
+    - 모든 항목의 공백을 정규화합니다.
+    - filters는 AND로 묶이므로 순서와 무관하여 정렬합니다.
+    - metrics/groups/orders는 SELECT 칼럼 순서와 정렬 순서를 결정하므로 순서를 유지합니다.
+    """
+
+    def _normalize_items(items) -> List[str]:
+        return [
+            normalize_whitespace(item) if isinstance(item, str) else json.dumps(item, sort_keys=True)
+            for item in items or []
+        ]
+
+    canonical = {
+        "metrics": _normalize_items(smq.get("metrics")),
+        "filters": sorted(_normalize_items(smq.get("filters"))),
+        "groups": _normalize_items(smq.get("groupBy") or smq.get("group_by")),
+        "orders": _normalize_items(smq.get("orderBy") or smq.get("order_by")),
+        "joins": _normalize_items(smq.get("joins")),
+        "limit": smq.get("limit"),
+    }
+    return json.dumps(canonical, ensure_ascii=False, sort_keys=True)
+
+
+def manifest_fingerprint(manifest_content: Union[str, Dict[str, Any]]) -> str:
+    """manifest 내용 기반 해시. 문자열이면 json.loads 없이 바로 해시합니다."""
+    if not isinstance(manifest_content, str):
+        manifest_content = json.dumps(
+            manifest_content, ensure_ascii=False, sort_keys=True, default=str
+        )
+    return hashlib.sha256(manifest_content.encode("utf-8")).hexdigest()
+
+
+class CompileCache:
+    """
+    SMQ → SQL 변환 결과(쿼리 문자열 + 메타데이터)를 보관하는 LRU 캐시
+
+    키는 (정규화된 SMQ, manifest fingerprint, dialect, cte, optimize level, parameterize) 입니다.
+    maxsize를 넘으면 가장 오래 쓰이지 않은 항목부터 버리고, ttl(초)이 설정되어 있으면 만료된 항목은 조회 시 버립니다.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl or None
+        self._entries: "OrderedDict[Tuple, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def make_key(
+        smq: Dict[str, Any],
+        fingerprint: str,
+        dialect: str,
+        cte: bool,
+        optimize: Optional[str] = "none",
+        parameterize: bool = False,
+    ) -> Tuple[str, str, str, bool, str, bool]:
+        return (
+            canonicalize_smq(smq),
+            fingerprint,
+            (dialect or "").lower(),
+            bool(cte),
+            (optimize or "none").lower(),
+            bool(parameterize),
+        )
+
+    def get(self, key) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, queries = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return _copy_queries(queries)
+
+    def put(self, key, queries: List[Dict[str, Any]]) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), _copy_queries(queries))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+def _copy_queries(queries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # 주의) router가 응답을 만들면서 결과 dict를 수정하므로, 캐시 원본은 항상 복사해서 주고받습니다.
+    return [
+        {
+            "query": q["query"],
+            "metadata": [dict(meta) for meta in q["metadata"]],
+            # parameterize=True로 만든 결과는 placeholder 순서의 bind 값도 같이 보관해야 합니다.
+            **({"params": list(q["params"])} if "params" in q else {}),
+        }
+        for q in queries
+    ]
+
+
+compile_cache = CompileCache(
+    maxsize=int(os.getenv("SMQ_COMPILE_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("SMQ_COMPILE_CACHE_TTL", "0")),
+)
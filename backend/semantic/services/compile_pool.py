@@ -0,0 +1,46 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+
+# 0 또는 1이면 process pool 없이 현재 프로세스에서 순차 변환합니다.
+DEFAULT_MAX_WORKERS = int(os.getenv("SMQ_COMPILE_WORKERS", str(os.cpu_count() or 1)))
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+# pool worker 프로세스 안에서만 True. worker 안에서 다시 pool에 작업을 넣지 않기 위해 씁니다.
+_in_compile_worker = False
+
+
+def _mark_compile_worker() -> None:
+    global _in_compile_worker
+    _in_compile_worker = True
+
+
+def in_compile_worker() -> bool:
+    return _in_compile_worker
+
+
+def get_compile_pool() -> ProcessPoolExecutor:
+    """
+    배치 변환과 JoinError 분할 변환이 함께 재사용하는 process pool
+    크기는 항상 DEFAULT_MAX_WORKERS입니다. 요청별 병렬도는 호출하는 쪽에서 넣는 작업 수로 조절합니다.
+    (요청마다 크기를 바꾸면 다른 요청이 쓰는 중인 pool을 내리고 다시 띄우게 됩니다.)
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=max(1, DEFAULT_MAX_WORKERS), initializer=_mark_compile_worker
+            )
+        return _executor
+
+
+def shutdown_compile_pool() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+        _executor = None
@@ -0,0 +1,145 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Union
+
+from backend.semantic.types.metric_type import Metric, load_metrics
+from backend.semantic.utils.manifest_index import ManifestIndex
+from backend.semantic.services.compile_cache import manifest_fingerprint
+
+
+@dataclass
+class RegisteredManifest:
+    """한 번 파싱해 둔 manifest와 그로부터 만든 Metric 객체/조회 index 묶음"""
+
+    manifest_id: str
+    semantic_manifest: Dict[str, Any]
+    metrics: List[Metric]
+    manifest_index: ManifestIndex
+    size_bytes: int
+
+    @cached_property
+    def serialized(self) -> str:
+        """process pool worker로 manifest를 보낼 때 쓰는 직렬화 문자열 (처음 필요할 때 한 번만 만듭니다.)"""
+        return json.dumps(self.semantic_manifest, ensure_ascii=False, sort_keys=True, default=str)
+
+
+class ManifestRegistry:
+    """
+    manifest를 내용 해시(manifest_id) 기준으로 메모리에 보관하는 레지스트리
+
+    - 같은 내용은 같은 manifest_id가 되므로, 이미 등록된 manifest는 json.loads/load_metrics를 다시 하지 않습니다.
+    - 보관 중인 manifest의 직렬화 크기 합이 budget_bytes를 넘으면 가장 오래 쓰이지 않은 것부터 버립니다.
+    """
+
+    def __init__(self, budget_bytes: int = 256 * 1024 * 1024):
+        self.budget_bytes = budget_bytes
+        self._entries: "OrderedDict[str, RegisteredManifest]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def register(self, manifest_content: Union[str, Dict[str, Any]]) -> RegisteredManifest:
+        """manifest를 등록하고 RegisteredManifest를 반환합니다. 잘못된 manifest면 ValueError"""
+        if isinstance(manifest_content, str):
+            serialized = manifest_content
+        else:
+            serialized = json.dumps(
+                manifest_content, ensure_ascii=False, sort_keys=True, default=str
+            )
+        manifest_id = manifest_fingerprint(serialized)
+
+        registered = self.get(manifest_id)
+        if registered is not None:
+            return registered
+
+        if isinstance(manifest_content, dict):
+            semantic_manifest = manifest_content
+        else:
+            try:
+                semantic_manifest = json.loads(manifest_content)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid manifest JSON: {str(e)}")
+
+        # Manifest 구조 검증
+        if "semantic_models" not in semantic_manifest:
+            raise ValueError("Manifest missing 'semantic_models' key")
+        if "metrics" not in semantic_manifest:
+            raise ValueError("Manifest missing 'metrics' key")
+
+        try:
+            metrics = load_metrics(semantic_manifest["metrics"])
+        except Exception as e:
+            raise ValueError(f"Failed to load metrics: {str(e)}")
+
+        registered = RegisteredManifest(
+            manifest_id=manifest_id,
+            semantic_manifest=semantic_manifest,
+            metrics=metrics,
+            manifest_index=ManifestIndex(semantic_manifest),
+            size_bytes=len(serialized.encode("utf-8")),
+        )
+        self._store(registered)
+        return registered
+
+    def get(self, manifest_id: str) -> Optional[RegisteredManifest]:
+        with self._lock:
+            registered = self._entries.get(manifest_id)
+            if registered is not None:
+                self._entries.move_to_end(manifest_id)
+            return registered
+
+    def resolve(
+        self,
+        manifest_content: Union[str, Dict[str, Any], None] = None,
+        manifest_id: Optional[str] = None,
+    ) -> RegisteredManifest:
+        """manifest_id가 있으면 등록된 manifest를, 없으면 manifest_content를 등록해서 반환합니다."""
+        if manifest_id:
+            registered = self.get(manifest_id)
+            if registered is None:
+                raise ValueError(
+                    f"Unknown manifest_id '{manifest_id}'. manifest를 다시 등록해 주세요."
+                )
+            return registered
+        if manifest_content is None:
+            raise ValueError("manifest_content 또는 manifest_id 중 하나는 반드시 있어야 합니다.")
+        return self.register(manifest_content)
+
+    def remove(self, manifest_id: str) -> bool:
+        with self._lock:
+            registered = self._entries.pop(manifest_id, None)
+            if registered is None:
+                return False
+            self._total_bytes -= registered.size_bytes
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "count": len(self._entries),
+                "total_bytes": self._total_bytes,
+                "budget_bytes": self.budget_bytes,
+                "evictions": self.evictions,
+                "manifest_ids": list(self._entries.keys()),
+            }
+
+    def _store(self, registered: RegisteredManifest) -> None:
+        with self._lock:
+            if registered.manifest_id in self._entries:
+                return
+            self._entries[registered.manifest_id] = registered
+            self._total_bytes += registered.size_bytes
+            # 주의) 방금 등록한 manifest 하나가 budget보다 커도 그것만은 남겨 둡니다.
+            while self._total_bytes > self.budget_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._total_bytes -= evicted.size_bytes
+                self.evictions += 1
+
+
+manifest_registry = ManifestRegistry(
+    budget_bytes=int(os.getenv("SMQ_MANIFEST_REGISTRY_BUDGET_MB", "256")) * 1024 * 1024
+)
@@ -0,0 +1,142 @@
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from backend.semantic.utils.compile_metrics import compile_metrics
+from backend.utils.logger import setup_logger
+
+
+logger = setup_logger("request_executor")
+
+
+class ExecutorSaturated(Exception):
+    """실행 중 + 대기 중인 작업이 한도를 넘어서 새 작업을 받지 않은 경우 (HTTP 429로 응답)"""
+
+    def __init__(self, retry_after_s: int):
+        super().__init__(
+            f"요청이 많아 처리할 수 없습니다. {retry_after_s}초 후 다시 시도해 주세요."
+        )
+        self.retry_after_s = retry_after_s
+
+
+class ExecutorTimeout(TimeoutError):
+    """작업이 요청별 제한 시간 안에 끝나지 않은 경우 (HTTP 504로 응답)"""
+
+    def __init__(self, timeout_s: float):
+        super().__init__(f"요청 처리 시간이 {timeout_s:g}초를 넘었습니다.")
+        self.timeout_s = timeout_s
+
+
+class RequestExecutor:
+    """
+    SMQ 변환, semantic model 파싱/린팅 같은 CPU 바운드 요청 작업을 event loop 밖에서 실행하는 thread pool
+
+    - async 엔드포인트가 작업을 직접 실행하면 그동안 websocket 스트림 등 다른 요청이 모두 멈추므로,
+      엔드포인트는 await request_executor.run(fn, ...)으로 작업을 넘깁니다.
+    - 실행 중 + 대기 중인 작업 수는 max_workers + max_queue까지만 받고, 넘치면 ExecutorSaturated를 올립니다.
+    - 작업마다 제한 시간(timeout_s)을 두고, 넘으면 ExecutorTimeout을 올립니다.
+      이미 실행 중인 thread는 중단할 수 없으므로, 끝날 때까지 자리를 차지한 것으로 셉니다.
+
+    thread를 쓰는 이유) manifest_registry/compile_cache를 요청 프로세스와 공유해야 하기 때문입니다.
+    sqlglot은 순수 Python이라 GIL을 놓지 않지만, event loop thread도 switch interval마다 GIL을 받으므로
+    스트림이 작업 전체 시간 동안 멈추지는 않습니다. JoinError 분할 변환은 compile_pool(process)에서 병렬로 처리됩니다.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_queue: int,
+        timeout_s: float,
+        retry_after_s: int,
+    ):
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.timeout_s = timeout_s
+        self.retry_after_s = retry_after_s
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="request-worker"
+                )
+            return self._executor
+
+    def _release(self, _future: Future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    async def run(
+        self,
+        fn: Callable[..., Any],
+        *args,
+        timeout_s: Optional[float] = None,
+        **kwargs,
+    ) -> Any:
+        """fn(*args, **kwargs)를 pool에서 실행하고 결과를 기다립니다."""
+        name = getattr(fn, "__name__", "task")
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                compile_metrics.record_dispatch(name, "rejected")
+                raise ExecutorSaturated(self.retry_after_s)
+            self._in_flight += 1
+
+        try:
+            # asyncio.to_thread처럼 호출한 쪽의 contextvars(요청 프로파일링 여부 등)를 worker thread로 넘깁니다.
+            context = contextvars.copy_context()
+            future = self._get_executor().submit(context.run, functools.partial(fn, *args, **kwargs))
+        except Exception:
+            with self._lock:
+                self._in_flight -= 1
+            raise
+        # 대기 중에 취소된 작업도 done callback은 불리므로 자리는 항상 반환됩니다.
+        future.add_done_callback(self._release)
+
+        timeout_s = self.timeout_s if timeout_s is None else timeout_s
+        try:
+            result = await asyncio.wait_for(
+                asyncio.wrap_future(future), timeout=timeout_s if timeout_s > 0 else None
+            )
+        except asyncio.TimeoutError:
+            compile_metrics.record_dispatch(name, "timeout")
+            logger.warning("⏱️ %s timed out after %.1fs", name, timeout_s)
+            raise ExecutorTimeout(timeout_s)
+        except Exception:
+            compile_metrics.record_dispatch(name, "failed")
+            raise
+        compile_metrics.record_dispatch(name, "completed")
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "timeout_s": self.timeout_s,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+request_executor = RequestExecutor(
+    max_workers=int(os.getenv("SMQ_REQUEST_WORKERS", "4")),
+    max_queue=int(os.getenv("SMQ_REQUEST_QUEUE_SIZE", "32")),
+    timeout_s=float(os.getenv("SMQ_REQUEST_TIMEOUT_S", "30")),
+    retry_after_s=int(os.getenv("SMQ_REQUEST_RETRY_AFTER_S", "1")),
+)
@@ -7,6 +7,7 @@ from backend.semantic.model_manager.linter.semantic_linter import lint_semantic_
 from backend.semantic.model_manager.utils.ddl_parser import parse_ddl
 from backend.semantic.model_manager.draft.draft_generator import generate_draft
 from backend.dto.semantic_model_dto import DraftResponse
+from backend.semantic.services.request_executor import request_executor
 from backend.utils.logger import setup_logger
 
 
@@ -25,13 +26,13 @@ async def semantic_parse_service(path: str) -> bool:
 
         logger.info("semantic_parser를 사용하여 파싱 시작: %s", base_dir)
 
-        # semantic_parser의 assemble_manifest 함수 사용
-        loop = asyncio.get_running_loop()
-        manifest = await loop.run_in_executor(None, lambda: assemble_manifest(base_dir))
+        # semantic_parser의 assemble_manifest 함수 사용 (CPU 바운드이므로 request_executor에서 실행)
+        manifest = await request_executor.run(assemble_manifest, base_dir)
 
         # semantic_manifest.json 파일 생성
         out_path = str(semantic_path / "semantic_manifest.json")
 
+        loop = asyncio.get_running_loop()
         await loop.run_in_executor(None, lambda: write_manifest(manifest, out_path))
 
         logger.info("semantic_parser 파싱 성공: %s", out_path)
@@ -52,9 +53,8 @@ async def semantic_lint_service(path: str) -> Dict[str, Any]:
     """
     logger.info("semantic lint 요청: %s", path)
 
-    # CPU 바운드 작업이므로 parse와 마찬가지로 executor에서 실행
-    loop = asyncio.get_running_loop()
-    result = await loop.run_in_executor(None, lambda: lint_semantic_models(path))
+    # CPU 바운드 작업이므로 parse와 마찬가지로 request_executor에서 실행
+    result = await request_executor.run(lint_semantic_models, path)
     return result
 
 
@@ -71,16 +71,13 @@ async def draft_service(path: str) -> DraftResponse:
     if not ddl_path.exists():
         raise FileNotFoundError(f"ddl.sql not found at: {ddl_path}")
     
-    # CPU 바운드 작업이므로 executor에서 실행
-    loop = asyncio.get_running_loop()
-    
+    # CPU 바운드 작업이므로 request_executor에서 실행
     # DDL 파싱
-    parsed_tables = await loop.run_in_executor(None, lambda: parse_ddl(str(ddl_path)))
+    parsed_tables = await request_executor.run(parse_ddl, str(ddl_path))
     
     # Draft 생성
-    draft_response = await loop.run_in_executor(
-        None,
-        lambda: generate_draft(parsed_tables, source_name="default", ddl_path=str(ddl_path))
+    draft_response = await request_executor.run(
+        generate_draft, parsed_tables, source_name="default", ddl_path=str(ddl_path)
     )
     
     logger.info("draft 생성 완료: %d개 파일 제안", len(draft_response.proposals))
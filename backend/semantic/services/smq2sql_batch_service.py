@@ -0,0 +1,103 @@
+import json
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Union
+
+from backend.semantic.services.compile_pool import (
+    DEFAULT_MAX_WORKERS,
+    get_compile_pool,
+    shutdown_compile_pool,
+)
+from backend.semantic.services.manifest_registry import manifest_registry
+from backend.semantic.services.smq2sql_service import prepare_smq_to_sql
+from backend.utils.logger import setup_logger
+
+
+logger = setup_logger("smq2sql_batch_service")
+
+
+def _compile_chunk(
+    manifest_content: str,
+    smqs: List[Dict[str, Any]],
+    dialect: str,
+    cte: bool,
+    optimize: Optional[str] = "none",
+) -> List[Dict[str, Any]]:
+    # worker 프로세스 안에서 실행됩니다. manifest는 worker의 manifest_registry에 한 번만 등록되어
+    # 같은 worker가 처리하는 이후 chunk/배치에서는 json.loads/load_metrics 없이 재사용됩니다.
+    return [
+        prepare_smq_to_sql(smq, manifest_content, dialect, cte, optimize=optimize)
+        for smq in smqs
+    ]
+
+
+def compile_many(
+    smqs: List[Dict[str, Any]],
+    manifest_content: Union[str, Dict[str, Any], None] = None,
+    dialect: str = "bigquery",
+    cte: bool = True,
+    manifest_id: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    optimize: Optional[str] = "none",
+) -> List[Dict[str, Any]]:
+    """
+    같은 manifest에 대한 여러 SMQ를 한 번에 SQL로 변환합니다.
+
+    - manifest는 배치 전체에서 한 번만 파싱/검증합니다.
+    - 병렬도(max_workers, 없으면 SMQ_COMPILE_WORKERS)가 2 이상이면 SMQ들을 chunk로 나눠 공유 process pool에서 병렬로 변환합니다.
+      max_workers는 chunk 수만 제한하고 pool 크기는 바꾸지 않습니다.
+    - 결과는 입력 순서대로, 항목별 prepare_smq_to_sql 결과(success/results 또는 error)를 담은 리스트입니다.
+    """
+    if not smqs:
+        return []
+
+    try:
+        registered = manifest_registry.resolve(manifest_content, manifest_id)
+    except ValueError as e:
+        return [{"success": False, "error": str(e)} for _ in smqs]
+
+    workers = DEFAULT_MAX_WORKERS if max_workers is None else min(max_workers, DEFAULT_MAX_WORKERS)
+    workers = min(workers, len(smqs))
+    if workers <= 1:
+        return [
+            prepare_smq_to_sql(
+                smq, None, dialect, cte, manifest_id=registered.manifest_id, optimize=optimize
+            )
+            for smq in smqs
+        ]
+
+    # worker로는 manifest를 직렬화된 문자열로 chunk당 한 번만 보냅니다.
+    # dict로 등록된 manifest는 registry와 같은 방식으로 직렬화하므로 worker에서도 같은 manifest_id가 됩니다.
+    if isinstance(manifest_content, str):
+        serialized_manifest = manifest_content
+    else:
+        serialized_manifest = json.dumps(
+            registered.semantic_manifest, ensure_ascii=False, sort_keys=True, default=str
+        )
+
+    # worker당 2개 정도의 chunk로 나눠 항목별 변환 시간 편차를 흡수합니다.
+    # max_workers를 지정하면 chunk를 그 수만큼만 만들어 이 배치가 동시에 쓰는 worker 수를 제한합니다.
+    chunk_count = min(len(smqs), workers * 2 if max_workers is None else workers)
+    chunk_size = -(-len(smqs) // chunk_count)
+    chunks = [smqs[i : i + chunk_size] for i in range(0, len(smqs), chunk_size)]
+
+    # pool은 JoinError 분할 변환과 함께 쓰므로 요청의 max_workers와 무관하게 설정된 worker 수로 만듭니다.
+    executor = get_compile_pool()
+    futures = [
+        executor.submit(_compile_chunk, serialized_manifest, chunk, dialect, cte, optimize)
+        for chunk in chunks
+    ]
+
+    results: List[Dict[str, Any]] = []
+    pool_broken = False
+    for chunk, future in zip(chunks, futures):
+        try:
+            results.extend(future.result())
+        except Exception as e:
+            logger.error("❌ Batch chunk failed: %s", str(e))
+            pool_broken = pool_broken or isinstance(e, BrokenProcessPool)
+            results.extend({"success": False, "error": str(e)} for _ in chunk)
+
+    # worker가 비정상 종료되면 pool을 다시 쓸 수 없으므로 다음 배치에서 새로 만들게 합니다.
+    if pool_broken:
+        shutdown_compile_pool()
+    return results
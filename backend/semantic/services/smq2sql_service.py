@@ -1,68 +1,114 @@
 import json
-from typing import Union, Dict, Any
+import os
+from typing import Union, Dict, Any, List, Optional, Tuple
 
 import vendor_setup  # vendor 경로 설정 및 벤더 패키지 로드를 위한 사이드 이펙트
-import sqlglot
 # from sqlglot import exp
 # import pandas as pd
 
 from backend.semantic.composer.pipeline.add_default_join import JoinError
 from backend.semantic.utils.metadata import collect_metadata_from_sql
-from backend.semantic.types.metric_type import load_metrics
 from backend.semantic.parser import SMQParser
 from backend.semantic.composer import SQLComposer
 from backend.semantic.utils.inline_converter import conver_cte_to_inline
+from backend.semantic.utils.sql_optimizer import optimize_sql, normalize_optimize_level
+from backend.semantic.utils.bind_params import bind_parameters, parameterize_filters
 from backend.semantic.utils.distribute_smq import distribute_smq_with_designated_models
+from backend.semantic.utils.manifest_index import ManifestIndex, ensure_manifest_index
+from backend.semantic.utils.compile_metrics import compile_metrics
+from backend.semantic.utils.request_profiler import profiled
+from backend.semantic.utils.tracing import current_span, traced, tracer
+from backend.semantic.types.parsed_smq import ParsedSMQ
+from backend.semantic.services.compile_cache import compile_cache
+from backend.semantic.services.manifest_registry import RegisteredManifest, manifest_registry
 
 from backend.utils.logger import setup_logger
 
 
 logger = setup_logger("smq2sql_service")
 
+# JoinError로 나눈 model set별 SMQ를 compile_pool worker에서 동시에 변환할지 여부
+# 기본은 꺼져 있습니다. 작업마다 직렬화된 manifest를 worker로 보내는 비용 때문에 측정한 환경에서는 순차 변환보다 느렸습니다.
+# (분할 2개 기준 약 10ms -> 12.6ms) 코어가 많은 환경에서 이득이 확인되면 SMQ_DISTRIBUTED_COMPILE_PARALLEL=1로 켭니다.
+DISTRIBUTED_COMPILE_PARALLEL = (
+    os.getenv("SMQ_DISTRIBUTED_COMPILE_PARALLEL", "0").lower() in ("1", "true", "yes")
+)
 
+
+@profiled()
+@traced("smq.prepare_smq_to_sql")
 def prepare_smq_to_sql(
-    smq: Dict, manifest_content: Union[str, dict], dialect: str, cte: bool = True
+    smq: Dict,
+    manifest_content: Union[str, dict, None],
+    dialect: str,
+    cte: bool = True,
+    use_cache: bool = True,
+    manifest_id: Optional[str] = None,
+    optimize: Optional[str] = "none",
+    parameterize: bool = False,
 ) -> Dict:
     """
     SMQ를 SQL로 변환하기 위한 준비 작업을 수행합니다.
     manifest를 파싱하고 semantic models/metrics를 로드합니다.
+    manifest_id가 주어지면 manifest_registry에 등록된 manifest를 사용하고, 아니면 manifest_content를 등록해서 사용합니다.
+    같은 SMQ/manifest/dialect/cte/optimize 조합은 compile_cache에서 바로 반환합니다. (use_cache=False면 항상 새로 변환)
+    optimize: "none" | "safe" | "aggressive" (sql_optimizer.optimize_sql 참고)
+    parameterize=True면 filter 값을 bind 변수로 뺀 SQL을 만들고, 쿼리마다 "params"(placeholder 순서의 값 목록)를 함께 반환합니다.
     """
+    span = current_span()
     try:
-        # manifest_content를 JSON으로 파싱
-        if isinstance(manifest_content, dict):
-            semantic_manifest = manifest_content
-        else:
-            try:
-                semantic_manifest = json.loads(manifest_content)
-            except json.JSONDecodeError as e:
-                return {"success": False, "error": f"Invalid manifest JSON: {str(e)}"}
-        # Manifest 구조 검증
-        if "semantic_models" not in semantic_manifest:
-            return {"success": False, "error": "Manifest missing 'semantic_models' key"}
-
-        if "metrics" not in semantic_manifest:
-            return {"success": False, "error": "Manifest missing 'metrics' key"}
+        optimize = normalize_optimize_level(optimize)
 
-        # Metrics 로드
+        # manifest 파싱/검증/metrics 로드는 registry에서 manifest 내용당 한 번만 수행됩니다.
         try:
-            metrics = load_metrics(semantic_manifest["metrics"])
-        except Exception as e:
-            return {"success": False, "error": f"Failed to load metrics: {str(e)}"}
+            registered = manifest_registry.resolve(manifest_content, manifest_id)
+        except ValueError as e:
+            span.set_error(str(e))
+            return {"success": False, "error": str(e)}
+        if span.recording:
+            # 요청 SMQ 직렬화는 span이 샘플링되어 export될 때만 합니다.
+            span.set_attributes(
+                dialect=dialect,
+                cte=cte,
+                optimize=optimize,
+                manifest_id=registered.manifest_id,
+                smq=lambda: json.dumps(smq, ensure_ascii=False, default=str),
+            )
 
-        logger.info(
-            "  📊 Requested smq:\n%s", json.dumps(smq, indent=2, ensure_ascii=False)
-        )
+        cache_key = None
+        if use_cache:
+            cache_key = compile_cache.make_key(
+                smq, registered.manifest_id, dialect, cte, optimize, parameterize
+            )
+            cached_queries = compile_cache.get(cache_key)
+            compile_metrics.record_cache_lookup(dialect, cached_queries is not None)
+            if span.recording:
+                span.set_attribute("cache_hit", cached_queries is not None)
+            if cached_queries is not None:
+                return {
+                    "success": True,
+                    "results": {"queries": cached_queries},
+                    "source_engine": dialect,
+                }
+
+        metrics = registered.metrics
+        manifest_index = registered.manifest_index
+
+        # SMQ 항목은 여기서 한 번만 파싱하고, JoinError로 나눈 SMQ들도 같은 파싱 결과를 공유합니다.
+        parsed_request = ParsedSMQ.from_request(smq)
 
         try:
-            logger.info("🔵 smq_to_sql 함수 호출 시작...")
-            result = smq_to_sql(semantic_manifest, metrics, smq, dialect, cte)
-            logger.info("🔵 smq_to_sql 함수 호출 완료, success: %s", result.get("success"))
+            result = smq_to_sql(
+                manifest_index, metrics, parsed_request, dialect, cte, optimize, parameterize
+            )
         except JoinError as e:
-            logger.error(f"Caught Join Error. You should process: {e.model_sets}")
+            logger.error("Caught Join Error. You should process: %s", e.model_sets)
+            compile_metrics.record_join_error_split(dialect)
+            if span.recording:
+                span.set_attribute("join_error.model_sets", [list(m) for m in e.model_sets])
             smqs = distribute_smq_with_designated_models(
-                smq, e.model_sets, semantic_manifest
+                parsed_request, e.model_sets, manifest_index
             )
-            logger.info(f"🔧 distributed_smq: {smqs}")
             
             # 분배 결과 검증
             if not smqs or len(smqs) == 0:
@@ -72,42 +118,27 @@ def prepare_smq_to_sql(
                     f"원본 SMQ: {smq}"
                 )
             
-            result = []
             for model_set_tuple, distributed_smq in smqs.items():
-                # distributed_smq에 model_sets가 있는지 확인
-                if "model_sets" not in distributed_smq:
-                    distributed_smq["model_sets"] = list(model_set_tuple)
-                
-                logger.info(f"Processing SMQ for models: {distributed_smq.get('model_sets', model_set_tuple)}")
-                
                 # 필수 키 검증
                 if "metrics" not in distributed_smq or not distributed_smq["metrics"]:
                     raise ValueError(
                         f"분배된 SMQ에 metrics가 없습니다. "
-                        f"model sets: {distributed_smq.get('model_sets', model_set_tuple)}, "
+                        f"model sets: {list(model_set_tuple)}, "
                         "joins 조건이 부족하여 SMQ를 제대로 분배할 수 없습니다."
                     )
-                
-                partial_result = smq_to_sql(
-                    semantic_manifest, metrics, distributed_smq, dialect, cte
-                )
+
+            result = []
+            for partial_result in _compile_distributed_smqs(
+                registered, list(smqs.items()), dialect, cte, optimize, parameterize
+            ):
                 if not partial_result.get("success", False):
                     raise ValueError(partial_result.get("error", "Unknown error"))
                 result.append(partial_result)
 
         # result가 1개인 경우(list가 아닌 경우)
         if not isinstance(result, list):
-            logger.info("🔧 Processing single query result...")
-            logger.info(
-                "  Result keys: %s",
-                result.keys() if isinstance(result, dict) else "Not a dict",
-            )
-            logger.info("  Success: %s", result.get("success"))
             if result.get("success"):
-                queries = [{"query": result["sql"], "metadata": result["metadata"]}]
-                logger.info(
-                    "  ✅ Created query with SQL length: %d", len(result["sql"])
-                )
+                queries = [_to_query(result)]
             else:
                 # smq_to_sql에서 이미 상세한 에러 로그를 출력했으므로 여기서는 간단히만 로그
                 error_msg = result.get("error", "Unknown error")
@@ -118,15 +149,13 @@ def prepare_smq_to_sql(
 
         # result가 n개인 경우(list인 경우)
         else:
-            logger.info(
-                "🔧 Processing multiple query results (count: %d)...", len(result)
-            )
             # 여러 쿼리 결과를 표준 형식으로 변환: {"sql": ...} -> {"query": ...}
-            queries = [{"query": q["sql"], "metadata": q["metadata"]} for q in result]
+            queries = [_to_query(q) for q in result]
 
-        logger.info(
-            "✅ Successfully converted smq to sql, total queries: %d", len(queries)
-        )
+        if span.recording:
+            span.set_attribute("queries", len(queries))
+        if cache_key is not None:
+            compile_cache.put(cache_key, queries)
         # 단일 쿼리를 queries 배열로 래핑
         # TODO: SMQ 하나에서 여러 쿼리를 생성할 수 있도록 확장
         #       현재는 하나의 쿼리만 생성하지만, 향후 복잡한 SMQ에서
@@ -141,6 +170,7 @@ def prepare_smq_to_sql(
         # ValueError는 이미 smq_to_sql에서 상세 로그를 출력했으므로 여기서는 간단히만
         error_msg = str(e)
         logger.error("❌ Failed to process request: %s", error_msg)
+        span.set_error(error_msg)
         return {"success": False, "error": error_msg}
     except Exception as e:
         # 예상치 못한 다른 예외인 경우에만 상세 로그 출력
@@ -154,81 +184,305 @@ def prepare_smq_to_sql(
         )
         logger.error("  📋 Traceback: %s", traceback.format_exc())
         error_msg = str(e)
+        span.set_error(error_msg)
         return {"success": False, "error": error_msg}
 
 
+def prepare_smq_to_sql_multi(
+    smq: Dict,
+    manifest_content: Union[str, dict, None],
+    dialects: List[str],
+    cte: bool = True,
+    manifest_id: Optional[str] = None,
+    optimize: Optional[str] = "none",
+    source_dialect: Optional[str] = None,
+) -> Dict:
+    """
+    같은 SMQ를 여러 dialect의 SQL로 변환합니다. source_dialect를 주면 compose는 한 번만 하고 dialect마다 render만 합니다. (smq_to_sql_multi 참고)
+    results는 dialect별로 prepare_smq_to_sql과 같은 형식의 결과이며, 한 dialect가 실패해도 나머지 결과는 그대로 반환합니다.
+    compile_cache는 쓰지 않습니다. (source_dialect를 주면 다른 dialect의 결과는 단일 dialect 변환 결과와 다를 수 있으므로)
+    """
+    try:
+        optimize = normalize_optimize_level(optimize)
+        dialects = list(dict.fromkeys(d for d in dialects or [] if d))
+        if not dialects:
+            raise ValueError("dialects가 비어 있습니다.")
+        registered = manifest_registry.resolve(manifest_content, manifest_id)
+        manifest_index = registered.manifest_index
+        parsed_request = ParsedSMQ.from_request(smq)
+
+        try:
+            partial_results = [
+                smq_to_sql_multi(
+                    manifest_index, registered.metrics, parsed_request, dialects, cte, optimize, source_dialect
+                )
+            ]
+        except JoinError as e:
+            logger.error("Caught Join Error. You should process: %s", e.model_sets)
+            compile_metrics.record_join_error_split(source_dialect or dialects[0])
+            smqs = distribute_smq_with_designated_models(
+                parsed_request, e.model_sets, manifest_index
+            )
+            if not smqs:
+                raise ValueError(
+                    "joins 조건이 부족하거나, SMQ의 항목들이 지정된 model sets에 매핑되지 않습니다. "
+                    f"요청된 model sets: {e.model_sets}, "
+                    f"원본 SMQ: {smq}"
+                )
+            # 분할된 SMQ들은 현재 프로세스에서 순차 변환합니다.
+            partial_results = [
+                smq_to_sql_multi(
+                    manifest_index, registered.metrics, distributed_smq, dialects, cte, optimize, source_dialect
+                )
+                for distributed_smq in smqs.values()
+            ]
+
+        results = {}
+        for dialect in dialects:
+            failed = next(
+                (partial[dialect] for partial in partial_results if not partial[dialect].get("success")),
+                None,
+            )
+            if failed is not None:
+                results[dialect] = {"success": False, "error": failed.get("error", "Unknown error")}
+                continue
+            results[dialect] = {
+                "success": True,
+                "results": {"queries": [_to_query(partial[dialect]) for partial in partial_results]},
+                "source_engine": dialect,
+            }
+        return {"success": True, "results": results}
+
+    except Exception as e:
+        logger.error("❌ Failed to process multi-dialect request: %s", str(e))
+        return {"success": False, "error": str(e)}
+
+
+def _to_query(result: Dict[str, Any]) -> Dict[str, Any]:
+    query = {"query": result["sql"], "metadata": result["metadata"]}
+    if "params" in result:
+        query["params"] = result["params"]
+    return query
+
+
+def _compile_distributed_smqs(
+    registered: RegisteredManifest,
+    distributed_smqs: List[Tuple[Tuple[str, ...], ParsedSMQ]],
+    dialect: str,
+    cte: bool,
+    optimize: Optional[str],
+    parameterize: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    JoinError로 나눈 model set별 SMQ들을 변환하고, 입력 순서대로 smq_to_sql 결과를 반환합니다.
+
+    model set끼리는 서로 독립이므로, 첫 번째 SMQ는 현재 프로세스에서 (원래 SMQ의 파싱 결과를 공유하며) 변환하고
+    나머지는 compile_pool의 worker에서 동시에 변환합니다. worker는 등록된 manifest/metrics/join graph를 재사용합니다.
+    다음 경우에는 현재 프로세스에서 순차 변환합니다.
+    - SMQ가 하나뿐이거나, SMQ_DISTRIBUTED_COMPILE_PARALLEL이 켜져 있지 않거나(기본), pool worker 수가 1 이하인 경우
+    - 이미 pool worker 안에서 실행 중인 경우 (배치 변환)
+    """
+    # process pool 관련 모듈은 분할 변환이 필요할 때만 import 합니다. (import 시간 예산)
+    from concurrent.futures.process import BrokenProcessPool
+    from backend.semantic.services.compile_pool import (
+        DEFAULT_MAX_WORKERS,
+        get_compile_pool,
+        in_compile_worker,
+        shutdown_compile_pool,
+    )
+
+    def compile_here(model_set_tuple, distributed_smq):
+        return smq_to_sql(
+            registered.manifest_index,
+            registered.metrics,
+            distributed_smq,
+            dialect,
+            cte,
+            optimize,
+            parameterize,
+        )
+
+    if (
+        len(distributed_smqs) <= 1
+        or not DISTRIBUTED_COMPILE_PARALLEL
+        or DEFAULT_MAX_WORKERS <= 1
+        or in_compile_worker()
+    ):
+        return [compile_here(*item) for item in distributed_smqs]
+
+    futures = []
+    try:
+        executor = get_compile_pool()
+        for model_set_tuple, distributed_smq in distributed_smqs[1:]:
+            futures.append(
+                executor.submit(
+                    _compile_distributed_smq_in_worker,
+                    registered.serialized,
+                    distributed_smq.to_dict(),
+                    dialect,
+                    cte,
+                    optimize,
+                    parameterize,
+                )
+            )
+    except Exception as e:
+        # pool을 만들거나 작업을 넣지 못하면 남은 SMQ는 현재 프로세스에서 변환합니다.
+        logger.warning("⚠️ Compile pool unavailable, compiling distributed smqs sequentially: %s", str(e))
+
+    results = [compile_here(*distributed_smqs[0])]
+    for index, (model_set_tuple, distributed_smq) in enumerate(distributed_smqs[1:]):
+        if index >= len(futures):
+            results.append(compile_here(model_set_tuple, distributed_smq))
+            continue
+        try:
+            results.append(futures[index].result())
+        except Exception as e:
+            logger.warning(
+                "⚠️ Distributed compile failed in worker, retrying in process: %s", str(e)
+            )
+            if isinstance(e, BrokenProcessPool):
+                shutdown_compile_pool()
+            results.append(compile_here(model_set_tuple, distributed_smq))
+    return results
+
+
+def _compile_distributed_smq_in_worker(
+    manifest_content: str,
+    smq: Dict[str, Any],
+    dialect: str,
+    cte: bool,
+    optimize: Optional[str],
+    parameterize: bool = False,
+) -> Dict[str, Any]:
+    # compile_pool worker 프로세스 안에서 실행됩니다. manifest는 worker의 manifest_registry에 한 번만 등록됩니다.
+    # smq는 이미 SMQ_KEYS로 맞춰진 dict이므로 from_request를 거치지 않고 바로 ParsedSMQ로 만듭니다.
+    registered = manifest_registry.resolve(manifest_content)
+    try:
+        return smq_to_sql(
+            registered.manifest_index,
+            registered.metrics,
+            ParsedSMQ(smq),
+            dialect,
+            cte,
+            optimize,
+            parameterize,
+        )
+    except JoinError as e:
+        # JoinError는 model_sets 인자 때문에 프로세스 간에 그대로 전달되지 않으므로 실패 결과로 바꿉니다.
+        return {"success": False, "error": str(e), "sql": None, "metadata": []}
+
+
 def smq_to_sql(
-    semantic_manifest, metrics, smq: Dict, dialect: str, cte: bool = True
+    semantic_manifest: Union[ManifestIndex, dict],
+    metrics,
+    smq: Union[ParsedSMQ, Dict],
+    dialect: str,
+    cte: bool = True,
+    optimize: Optional[str] = "none",
+    parameterize: bool = False,
 ) -> Dict[str, Any]:
     """
     SMQ를 SQL로 변환합니다.
     semantic models와 metrics를 사용하여 실제 SQL 쿼리를 생성합니다.
+    semantic_manifest로는 raw manifest dict 또는 미리 만들어 둔 ManifestIndex를 받습니다.
+    smq로는 요청 SMQ dict 또는 ParsedSMQ를 받습니다. (ParsedSMQ면 항목 파싱 결과를 그대로 재사용)
+    optimize가 "none"이 아니면 compose된 SQL에 sqlglot optimizer 규칙을 적용합니다.
+    (최적화 후 결과 칼럼이 달라지면 최적화 전 SQL을 그대로 사용합니다.)
+    parameterize=True면 filters의 문자열/숫자 literal을 dialect의 bind placeholder(%s, :1, @p1, ?)로 바꾼 SQL과
+    placeholder 순서대로의 값 목록("params")을 반환합니다. 값만 다른 요청이 같은 SQL 문자열이 되므로
+    warehouse의 plan cache/prepared statement를 재사용할 수 있습니다. (bind_params 참고)
 
     Returns:
-        Dict with keys: 'sql', 'metadata', 'success'
+        Dict with keys: 'sql', 'metadata', 'success' (+ 'params' if parameterize)
+        'metadata'는 'sql'의 결과 칼럼 설명이며, optimize를 켜도 최적화 전 compose된 SQL에서 수집합니다. (_finish_sql 참고)
+    """
+    # 전체 소요 시간과 성공/실패를 compile_metrics에 기록합니다. (JoinError는 호출한 쪽에서 분할 처리)
+    with compile_metrics.time_compile(dialect):
+        if parameterize:
+            smq, values = parameterize_filters(ParsedSMQ.from_request(smq), dialect)
+        result = _smq_to_sql(semantic_manifest, metrics, smq, dialect, cte, optimize)
+        if parameterize and result.get("success"):
+            result["sql"], result["params"] = bind_parameters(result["sql"], values, dialect)
+    compile_metrics.record_compile(dialect, result.get("success", False))
+    return result
+
+
+def smq_to_sql_multi(
+    semantic_manifest: Union[ManifestIndex, dict],
+    metrics,
+    smq: Union[ParsedSMQ, Dict],
+    dialects: List[str],
+    cte: bool = True,
+    optimize: Optional[str] = "none",
+    source_dialect: Optional[str] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    SMQ를 여러 dialect의 SQL로 변환해서 {dialect: smq_to_sql 결과}를 반환합니다.
+
+    - source_dialect가 없으면 dialect마다 그 dialect로 manifest/SMQ 식을 읽고 compose 합니다.
+      결과 SQL은 dialect별로 smq_to_sql을 따로 호출한 것과 byte 단위로 같습니다. (요청 SMQ 파싱과 manifest index만 공유)
+    - source_dialect를 주면 식을 source_dialect로 한 번만 읽고 compose한 LayerPlan을 dialect마다 render 합니다.
+      source_dialect로는 smq_to_sql과 같은 SQL이 나오고, 다른 dialect로는 그 식을 sqlglot으로 transpile한 SQL이 나옵니다.
+      (smq_to_sql은 출력 dialect로 식을 읽으므로 SUBSTR/SUBSTRING, 나눗셈 타입 처리 등에서 결과가 다를 수 있습니다.)
+      이때 dialect별로 실행하는 것은 bigquery 전용 단계(backtick, 특수문자 치환), write_sql(실제 테이블 quote 포함),
+      최적화, SQL 문자열 생성, 메타데이터 수집뿐입니다.
+    - 한 dialect의 compose/render가 실패해도 다른 dialect 결과에는 영향이 없습니다. JoinError는 호출한 쪽에서 분할 처리합니다.
     """
+    manifest_index = ensure_manifest_index(semantic_manifest)
+    smq = ParsedSMQ.from_request(smq)
+    _validate_metrics(smq, metrics)
+    shared_plan = None
+    if source_dialect:
+        with compile_metrics.time_compile(source_dialect):
+            composer = SQLComposer(dialect=source_dialect, manifest_index=manifest_index)
+            ast = SMQParser(manifest_index=manifest_index, dialect=source_dialect).parse(smq)
+            shared_plan = composer.compose_plan(ast, smq)
+
+    results = {}
+    for dialect in dialects:
+        with compile_metrics.time_compile(dialect):
+            try:
+                if shared_plan is not None:
+                    dialect_plan = shared_plan.copy()
+                else:
+                    composer = SQLComposer(dialect=dialect, manifest_index=manifest_index)
+                    ast = SMQParser(manifest_index=manifest_index, dialect=dialect).parse(smq)
+                    dialect_plan = composer.compose_plan(ast, smq)
+                sql = composer.render(dialect_plan, smq, dialect)
+                results[dialect] = _finish_sql(
+                    sql, dialect_plan, manifest_index, dialect, cte, optimize
+                )
+            except JoinError:
+                raise
+            except Exception as e:
+                logger.error("❌ SQL render failed (%s): %s", dialect, str(e))
+                results[dialect] = {"success": False, "error": str(e), "sql": None, "metadata": []}
+        compile_metrics.record_compile(dialect, results[dialect].get("success", False))
+    return results
+
+
+def _smq_to_sql(
+    semantic_manifest: Union[ManifestIndex, dict],
+    metrics,
+    smq: Union[ParsedSMQ, Dict],
+    dialect: str,
+    cte: bool,
+    optimize: Optional[str],
+) -> Dict[str, Any]:
     try:
-        logger.info("🟢 smq_to_sql 함수 시작")
+        manifest_index = ensure_manifest_index(semantic_manifest)
         # SMQ 설정
-        smq = {
-            "limit": smq.get("limit"),
-            "filters": smq.get("filters", []),
-            "groups": smq.get("groupBy") or smq.get("group_by", []),
-            "metrics": smq.get("metrics", []),
-            "orders": smq.get("orderBy") or smq.get("order_by", []),
-            "joins": smq.get("joins") or [],
-        }
-        logger.info("🟢 SMQ 설정 완료: %s", json.dumps(smq, ensure_ascii=False)[:200])
+        smq = ParsedSMQ.from_request(smq)
 
         # 입력 검증
-        if not smq["metrics"]:
-            raise ValueError("No metrics specified in request")
-
-        logger.info("🟢 Metrics 검증 시작...")
-        available_metric_names = [m.name for m in metrics]
-        for metric in smq["metrics"]:
-            if metric not in available_metric_names:
-                try:
-                    sqlglot.parse_one(metric)
-                    continue  # 식인 경우 통과
-                except Exception as e:
-                    raise ValueError(
-                        f"Metric '{metric}' not found. Available metrics: {available_metric_names}, Error: {str(e)}"
-                    )
-        logger.info("🟢 Metrics 검증 완료")
+        _validate_metrics(smq, metrics)
 
-        logger.info("🟢 SMQParser 초기화 시작...")
-        parser = SMQParser(semantic_manifest=semantic_manifest, dialect=dialect)
-        logger.info("🟢 SQLComposer 초기화 시작...")
-        composer = SQLComposer(dialect=dialect, semantic_manifest=semantic_manifest)
-        logger.info("🟢 Parser/Composer 초기화 완료")
+        parser = SMQParser(manifest_index=manifest_index, dialect=dialect)
+        composer = SQLComposer(dialect=dialect, manifest_index=manifest_index)
 
-        logger.info("🟢 parser.parse 시작...")
         ast = parser.parse(smq)
-        logger.info("🟢 parser.parse 완료")
-
-        logger.info("🟢 composer.compose 시작...")
         sql = composer.compose(parsed_smq=ast, original_smq=smq)
-        # sql이 Expression 객체일 수 있으므로 문자열로 변환 후 슬라이싱
-        sql_str = sql.sql(dialect=dialect, pretty=True) if sql else None
-        logger.info("✅ SqlComposer created sql: %s", sql_str[:200] if sql_str else "None")
-
-        # CTE를 인라인 뷰로 변환
-        if cte is False:
-            sql = conver_cte_to_inline(sql)
-
-        # 메타데이터 수집
-        metadata = collect_metadata_from_sql(sql, ast, semantic_manifest)
-        logger.info("metadata: %s", metadata)
-
-        if not metadata:
-            raise ValueError("No metadata found")
-
-        return {
-            "success": True,
-            "sql": sql_str,  # 이미 위에서 변환된 문자열 사용
-            "metadata": metadata,
-        }
+        return _finish_sql(sql, ast, manifest_index, dialect, cte, optimize)
 
     except JoinError as e:
         raise e
@@ -258,3 +512,85 @@ def smq_to_sql(
             "metadata": [],
         }
 
+
+def _validate_metrics(smq: ParsedSMQ, metrics) -> None:
+    if not smq["metrics"]:
+        raise ValueError("No metrics specified in request")
+
+    available_metric_names = [m.name for m in metrics]
+    for item in smq.entries("metrics"):
+        metric = item.raw
+        if metric not in available_metric_names:
+            try:
+                item.node()
+                continue  # 식인 경우 통과
+            except Exception as e:
+                raise ValueError(
+                    f"Metric '{metric}' not found. Available metrics: {available_metric_names}, Error: {str(e)}"
+                )
+
+
+def _finish_sql(sql, ast, manifest_index: ManifestIndex, dialect: str, cte: bool, optimize: Optional[str]) -> Dict[str, Any]:
+    """
+    compose된 SQL AST를 최적화/문자열 생성하고 메타데이터를 모아 smq_to_sql 결과로 만듭니다.
+    metadata는 최적화 전 compose된 SQL에서 수집합니다. optimizer는 CTE를 합치고 식을 바꿔 써서 layer 구조로
+    칼럼의 출처(metric/dimension)를 찾을 수 없기 때문입니다. 반환하는 "sql"이 최적화된 SQL이어도 결과 칼럼의
+    이름/순서는 _optimize_with_output_guard가 compose된 SQL과 같음을 보장하므로, metadata는 반환하는 SQL의 결과 칼럼을 설명합니다.
+    """
+    composed_sql = sql
+    if optimize and optimize != "none":
+        with compile_metrics.time_stage("postprocess", "optimize", dialect), tracer.span(
+            "smq.postprocess", stage="optimize", dialect=dialect, optimize=optimize
+        ):
+            sql = _optimize_with_output_guard(sql, dialect, optimize)
+    # sql이 Expression 객체일 수 있으므로 문자열로 변환
+    with compile_metrics.time_stage("postprocess", "generate_sql", dialect), tracer.span(
+        "smq.postprocess", stage="generate_sql", dialect=dialect
+    ) as span:
+        sql_str = sql.sql(dialect=dialect, pretty=True) if sql else None
+        if span.recording:
+            span.set_attribute("sql_length", len(sql_str) if sql_str else 0)
+
+    # CTE를 인라인 뷰로 변환
+    if cte is False:
+        sql = conver_cte_to_inline(sql)
+
+    # 메타데이터 수집 (최적화 전 compose된 SQL 기준. 위 docstring 참고)
+    with compile_metrics.time_stage("postprocess", "collect_metadata", dialect), tracer.span(
+        "smq.postprocess", stage="collect_metadata", dialect=dialect
+    ):
+        metadata = collect_metadata_from_sql(composed_sql, ast, manifest_index)
+
+    if not metadata:
+        raise ValueError("No metadata found")
+
+    return {
+        "success": True,
+        "sql": sql_str,  # 이미 위에서 변환된 문자열 사용
+        "metadata": metadata,
+    }
+
+
+def _optimize_with_output_guard(sql, dialect: str, optimize: str):
+    """
+    optimize_sql을 적용하되, 최종 SELECT의 결과 칼럼(이름/순서)이 최적화 전과 같을 때만 최적화된 SQL을 사용합니다.
+    메타데이터는 최적화 전 SQL 기준으로 수집하므로, 결과 칼럼이 같으면 메타데이터도 그대로 유효합니다.
+    optimizer가 실패하거나 결과 칼럼이 달라지면 경고만 남기고 원래 SQL을 반환합니다.
+    """
+    try:
+        optimized = optimize_sql(sql, dialect, optimize)
+    except Exception as e:
+        logger.warning("⚠️ SQL optimize(%s) failed, using composed sql: %s", optimize, str(e))
+        return sql
+
+    original_columns = [select.alias_or_name for select in sql.selects]
+    optimized_columns = [select.alias_or_name for select in optimized.selects]
+    if optimized_columns != original_columns:
+        logger.warning(
+            "⚠️ SQL optimize(%s) changed output columns, using composed sql: %s -> %s",
+            optimize,
+            original_columns,
+            optimized_columns,
+        )
+        return sql
+    return optimized
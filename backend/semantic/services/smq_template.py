@@ -0,0 +1,298 @@
+import json
+import math
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Union
+
+import vendor_setup  # noqa: F401
+import sqlglot
+from sqlglot import exp
+from sqlglot.dialects.dialect import Dialect
+
+from backend.semantic.services.compile_cache import canonicalize_smq, manifest_fingerprint
+from backend.semantic.services.manifest_registry import manifest_registry
+from backend.semantic.services.smq2sql_service import prepare_smq_to_sql
+from backend.semantic.utils.bind_params import slot_literal, split_slots
+from backend.semantic.utils.sql_optimizer import normalize_optimize_level
+from backend.utils.logger import setup_logger
+
+
+logger = setup_logger("smq_template")
+
+# placeholder 타입. "any"면 채울 때 값의 Python 타입으로 판단합니다.
+PARAM_TYPES = ("any", "string", "number", "boolean")
+
+_generators = threading.local()
+
+
+def _generator(dialect: Optional[str]):
+    """dialect별 sqlglot Generator (thread마다 하나씩 재사용)"""
+    cache = getattr(_generators, "cache", None)
+    if cache is None:
+        cache = _generators.cache = {}
+    generator = cache.get(dialect)
+    if generator is None:
+        generator = cache[dialect] = Dialect.get_or_raise(dialect).generator()
+    return generator
+
+
+def _check_type(name: str, value: Any, param_type: str) -> None:
+    if value is None or param_type == "any":
+        return
+    if param_type == "string" and isinstance(value, str):
+        return
+    if param_type == "number" and isinstance(value, (int, float)) and not isinstance(value, bool):
+        return
+    if param_type == "boolean" and isinstance(value, bool):
+        return
+    raise ValueError(
+        f"파라미터 '{name}'는 {param_type} 타입이어야 합니다. (받은 값: {value!r})"
+    )
+
+
+def render_literal(value: Any, dialect: Optional[str]) -> str:
+    """Python 값을 dialect에 맞는 SQL literal로 (문자열 escape는 sqlglot generator 규칙을 따릅니다.)"""
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return _generator(dialect).sql(exp.Boolean(this=value))
+    if isinstance(value, (int, float)):
+        if isinstance(value, float) and not math.isfinite(value):
+            raise ValueError(f"유한한 숫자만 사용할 수 있습니다. (받은 값: {value!r})")
+        return _generator(dialect).sql(exp.Literal.number(value))
+    if isinstance(value, str):
+        return _generator(dialect).sql(exp.Literal.string(value))
+    raise ValueError(f"SQL literal로 바꿀 수 없는 값입니다: {value!r}")
+
+
+@dataclass
+class TemplateQuery:
+    """
+    compile된 쿼리 하나의 SQL 골격
+    segments[i]와 segments[i + 1] 사이에 slots[i] 파라미터 값이 들어갑니다. (len(segments) == len(slots) + 1)
+    """
+
+    segments: List[str]
+    slots: List[str]
+    metadata: List[Dict[str, Any]]
+
+
+@dataclass
+class SMQTemplate:
+    """filters에 이름 있는 placeholder(:name)가 있는 SMQ를 한 번 compile해 둔 결과"""
+
+    template_id: str
+    manifest_id: str
+    dialect: str
+    cte: bool
+    optimize: str
+    params: Dict[str, str]
+    queries: List[TemplateQuery] = field(default_factory=list)
+
+    def render(self, values: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        파라미터 값을 literal로 바꿔 SQL 골격에 채웁니다. 다시 파싱/compose 하지 않습니다.
+        list 값은 IN (:codes) 같은 자리에 쉼표로 이어 붙입니다.
+        """
+        missing = [name for name in self.params if name not in values]
+        if missing:
+            raise ValueError(f"값이 없는 파라미터가 있습니다: {missing}")
+        unknown = [name for name in values if name not in self.params]
+        if unknown:
+            raise ValueError(f"템플릿에 없는 파라미터입니다: {unknown} (사용 가능: {list(self.params)})")
+
+        literals = {}
+        for name, value in values.items():
+            param_type = self.params[name]
+            if isinstance(value, (list, tuple)):
+                if not value:
+                    raise ValueError(f"파라미터 '{name}'의 list가 비어 있습니다.")
+                for item in value:
+                    _check_type(name, item, param_type)
+                literals[name] = ", ".join(render_literal(item, self.dialect) for item in value)
+            else:
+                _check_type(name, value, param_type)
+                literals[name] = render_literal(value, self.dialect)
+
+        rendered = []
+        for query in self.queries:
+            parts = [query.segments[0]]
+            for slot, segment in zip(query.slots, query.segments[1:]):
+                parts.append(literals[slot])
+                parts.append(segment)
+            rendered.append({"query": "".join(parts), "metadata": query.metadata})
+        return rendered
+
+
+def _replace_placeholders(smq: Dict[str, Any], dialect: str):
+    """
+    filters의 이름 있는 placeholder를 slot 문자열 literal로 바꾼 SMQ와 slot별 파라미터 이름 목록을 반환합니다.
+    placeholder가 있는 filter만 dialect로 다시 출력하고, 나머지는 원래 문자열을 그대로 둡니다.
+    """
+    slot_names: List[str] = []
+    filters = []
+    for value in smq.get("filters") or []:
+        parsed = sqlglot.parse_one(value, read=dialect)
+        placeholders = list(parsed.find_all(exp.Placeholder))
+        if not placeholders:
+            filters.append(value)
+            continue
+        for placeholder in placeholders:
+            name = placeholder.name
+            if not name:
+                raise ValueError(
+                    f"filter '{value}'의 placeholder에 이름이 없습니다. ':start'처럼 이름을 붙여 주세요."
+                )
+            placeholder.replace(slot_literal(len(slot_names)))
+            slot_names.append(name)
+        filters.append(parsed.sql(dialect=dialect))
+    return {**smq, "filters": filters}, slot_names
+
+
+def _split_query(sql: str, slot_names: List[str]) -> TemplateQuery:
+    segments, slots = split_slots(sql)
+    return TemplateQuery(segments=segments, slots=[slot_names[slot] for slot in slots], metadata=[])
+
+
+class SMQTemplateRegistry:
+    """
+    SMQ 템플릿을 template_id 기준으로 메모리에 보관하는 레지스트리
+
+    - register: placeholder를 slot으로 바꿔 SMQParser/SQLComposer로 한 번만 compile하고 SQL 골격을 저장합니다.
+    - render: 저장된 골격에 literal만 채웁니다. (manifest 조회/파싱/compose 없음)
+    - 같은 SMQ/manifest/dialect/cte/optimize/파라미터 타입 조합은 같은 template_id가 되어 다시 compile하지 않습니다.
+    - 보관 개수가 maxsize를 넘으면 가장 오래 쓰이지 않은 템플릿부터 버립니다.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, SMQTemplate]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def register(
+        self,
+        smq: Dict[str, Any],
+        manifest_content: Union[str, Dict[str, Any], None] = None,
+        manifest_id: Optional[str] = None,
+        dialect: str = "bigquery",
+        cte: bool = True,
+        optimize: Optional[str] = "none",
+        param_types: Optional[Dict[str, str]] = None,
+    ) -> SMQTemplate:
+        """템플릿을 compile해서 등록합니다. compile에 실패하거나 파라미터 정의가 잘못되면 ValueError"""
+        optimize = normalize_optimize_level(optimize)
+        registered = manifest_registry.resolve(manifest_content, manifest_id)
+        param_types = dict(param_types or {})
+
+        template_id = manifest_fingerprint(
+            json.dumps(
+                [canonicalize_smq(smq), registered.manifest_id, (dialect or "").lower(), bool(cte), optimize, param_types],
+                ensure_ascii=False,
+                sort_keys=True,
+            )
+        )
+        existing = self.get(template_id)
+        if existing is not None:
+            return existing
+
+        slot_smq, slot_names = _replace_placeholders(smq, dialect)
+        if not slot_names:
+            raise ValueError("filters에 placeholder(:name)가 없습니다. 일반 SMQ는 /smq2sql을 사용해 주세요.")
+
+        params = {}
+        for name in slot_names:
+            param_type = param_types.get(name, "any")
+            if param_type not in PARAM_TYPES:
+                raise ValueError(
+                    f"파라미터 '{name}'의 타입 '{param_type}'을(를) 지원하지 않습니다. 가능한 값: {PARAM_TYPES}"
+                )
+            params[name] = param_type
+        unknown = [name for name in param_types if name not in params]
+        if unknown:
+            raise ValueError(f"filters에 없는 파라미터의 타입이 지정되었습니다: {unknown}")
+
+        result = prepare_smq_to_sql(
+            slot_smq,
+            None,
+            dialect,
+            cte,
+            use_cache=False,
+            manifest_id=registered.manifest_id,
+            optimize=optimize,
+        )
+        if not result.get("success"):
+            raise ValueError(result.get("error", "Unknown error"))
+
+        queries = []
+        for query in result["results"]["queries"]:
+            template_query = _split_query(query["query"], slot_names)
+            template_query.metadata = query["metadata"]
+            queries.append(template_query)
+
+        template = SMQTemplate(
+            template_id=template_id,
+            manifest_id=registered.manifest_id,
+            dialect=dialect,
+            cte=cte,
+            optimize=optimize,
+            params=params,
+            queries=queries,
+        )
+        self._store(template)
+        logger.info(
+            "SMQ template registered: %s (params=%s, queries=%d)", template_id, params, len(queries)
+        )
+        return template
+
+    def get(self, template_id: str) -> Optional[SMQTemplate]:
+        with self._lock:
+            template = self._entries.get(template_id)
+            if template is not None:
+                self._entries.move_to_end(template_id)
+            return template
+
+    def render(self, template_id: str, values: Dict[str, Any]) -> Dict[str, Any]:
+        """prepare_smq_to_sql과 같은 형식의 결과를 반환합니다."""
+        template = self.get(template_id)
+        if template is None:
+            return {
+                "success": False,
+                "error": f"Unknown template_id '{template_id}'. 템플릿을 다시 등록해 주세요.",
+            }
+        try:
+            queries = template.render(values)
+        except ValueError as e:
+            return {"success": False, "error": str(e)}
+        return {
+            "success": True,
+            "results": {"queries": queries},
+            "source_engine": template.dialect,
+        }
+
+    def remove(self, template_id: str) -> bool:
+        with self._lock:
+            return self._entries.pop(template_id, None) is not None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "count": len(self._entries),
+                "maxsize": self.maxsize,
+                "evictions": self.evictions,
+            }
+
+    def _store(self, template: SMQTemplate) -> None:
+        with self._lock:
+            self._entries[template.template_id] = template
+            self._entries.move_to_end(template.template_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+
+smq_template_registry = SMQTemplateRegistry(
+    maxsize=int(os.getenv("SMQ_TEMPLATE_REGISTRY_SIZE", "1024"))
+)
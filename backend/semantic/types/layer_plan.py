@@ -0,0 +1,251 @@
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import vendor_setup  # noqa: F401
+from sqlglot import exp
+
+
+# layer 이름: proj layer는 semantic model 이름을 그대로 쓰고, 그 위로 agg -> deriv 순서로 쌓입니다.
+AGG_LAYER = "agg"
+DERIV_LAYER = "deriv"
+# list가 아닌 단일 값으로 들어가는 clause
+SCALAR_CLAUSES = ("limit",)
+
+
+def node_fingerprint(node: exp.Expression) -> int:
+    """
+    SQL 문자열을 만들지 않고 계산하는 node의 구조 해시 (sqlglot Expression.__hash__)
+    식별자는 대소문자/따옴표 여부까지 구분하므로, 같은 SQL로 출력되는 node는 같은 값이 됩니다.
+    """
+    return hash(node)
+
+
+def _copy_node(node):
+    return node.copy() if isinstance(node, exp.Expression) else node
+
+
+class ClauseNodes(list):
+    """
+    한 layer의 한 clause(metrics, groups, filters, ...)에 들어가는 sqlglot node 목록
+
+    순서는 list 그대로 유지하고, name / alias / 구조 해시 index를 옆에 둬서
+    "이미 같은 항목이 있는지"를 O(1)로 확인합니다. (node.sql()을 만들지 않습니다.)
+
+    주의) list를 통해 바뀌는 경우는 자동으로 index를 다시 만들지만, 들어 있는 node를 직접 바꾸는 경우
+         (identifier에 따옴표 추가, 하위 node replace 등)는 알 수 없으므로 invalidate()를 불러야 합니다.
+         SQLComposer는 pipeline 단계마다, SMQParser는 SMQ 키마다 LayerPlan.invalidate_indexes()를 부릅니다.
+    """
+
+    def __init__(self, nodes: Iterable[Any] = ()):
+        super().__init__(nodes)
+        self._names: Set[str] = set()
+        self._aliases: Set[str] = set()
+        self._fingerprints: Set[int] = set()
+        self._dirty = True
+
+    # ---- index ----
+    def invalidate(self) -> None:
+        self._dirty = True
+
+    def _ensure_index(self) -> None:
+        if not self._dirty:
+            return
+        self._names = set()
+        self._aliases = set()
+        self._fingerprints = set()
+        for node in self:
+            self._index(node)
+        self._dirty = False
+
+    def _index(self, node) -> None:
+        if not isinstance(node, exp.Expression):
+            return
+        if node.name:
+            self._names.add(node.name)
+        if node.alias:
+            self._aliases.add(node.alias)
+        self._fingerprints.add(node_fingerprint(node))
+
+    def has_name(self, name: Optional[str]) -> bool:
+        """node.name(칼럼 이름, Alias면 안쪽 칼럼 이름)이 name인 항목이 있는지"""
+        self._ensure_index()
+        return bool(name) and name in self._names
+
+    def has_alias(self, alias: Optional[str]) -> bool:
+        self._ensure_index()
+        return bool(alias) and alias in self._aliases
+
+    def has_output_name(self, name: Optional[str]) -> bool:
+        """SELECT 결과 칼럼 이름(name 또는 alias)으로 name을 쓰는 항목이 있는지"""
+        return self.has_name(name) or self.has_alias(name)
+
+    def names(self) -> Set[str]:
+        self._ensure_index()
+        return set(self._names)
+
+    def aliases(self) -> Set[str]:
+        self._ensure_index()
+        return set(self._aliases)
+
+    def contains_equivalent(self, node: exp.Expression) -> bool:
+        """name이 같거나, alias가 같거나, 구조가 같은 항목이 이미 있는지 (append_node의 중복 기준)"""
+        self._ensure_index()
+        if node.name and node.name in self._names:
+            return True
+        if node.alias and node.alias in self._aliases:
+            return True
+        return node_fingerprint(node) in self._fingerprints
+
+    def add(self, node: exp.Expression) -> bool:
+        """중복이 아니면 끝에 추가하고 True, 이미 같은 항목이 있으면 추가하지 않고 False"""
+        if self.contains_equivalent(node):
+            return False
+        self.append(node)
+        return True
+
+    # ---- list 변경 시 index 갱신 ----
+    def append(self, node) -> None:
+        super().append(node)
+        if not self._dirty:
+            self._index(node)
+
+    def extend(self, nodes) -> None:
+        super().extend(nodes)
+        self._dirty = True
+
+    def insert(self, index, node) -> None:
+        super().insert(index, node)
+        if not self._dirty:
+            self._index(node)
+
+    def remove(self, node) -> None:
+        super().remove(node)
+        self._dirty = True
+
+    def pop(self, *args):
+        self._dirty = True
+        return super().pop(*args)
+
+    def clear(self) -> None:
+        super().clear()
+        self._dirty = True
+
+    def __setitem__(self, index, value) -> None:
+        super().__setitem__(index, value)
+        self._dirty = True
+
+    def __delitem__(self, index) -> None:
+        super().__delitem__(index)
+        self._dirty = True
+
+    def __iadd__(self, nodes):
+        result = super().__iadd__(nodes)
+        self._dirty = True
+        return result
+
+
+class Layer(dict):
+    """
+    layer 하나 (clause 이름 -> ClauseNodes, limit은 단일 값)
+
+    list를 넣으면 ClauseNodes로 감싸서 저장합니다.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.update(*args, **kwargs)
+
+    def __setitem__(self, key, value) -> None:
+        if isinstance(value, list) and not isinstance(value, ClauseNodes):
+            value = ClauseNodes(value)
+        super().__setitem__(key, value)
+
+    def update(self, *args, **kwargs) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def clause(self, key: str) -> ClauseNodes:
+        """clause가 없으면 빈 ClauseNodes (layer에는 추가하지 않음)"""
+        value = self.get(key)
+        return value if isinstance(value, ClauseNodes) else ClauseNodes()
+
+    def invalidate_indexes(self) -> None:
+        for value in self.values():
+            if isinstance(value, ClauseNodes):
+                value.invalidate()
+
+
+class LayerPlan(dict):
+    """
+    SMQParser가 만들고 SQLComposer pipeline이 다듬는 layer별 query IR
+
+    - key: layer 이름 (proj layer = semantic model 이름, "agg", "deriv")
+    - value: Layer (clause 이름 -> ClauseNodes)
+    - 없는 layer에 접근하면 빈 Layer를 만들어 둡니다. (기존 defaultdict(lambda: defaultdict())와 같은 동작)
+    """
+
+    def __missing__(self, key) -> Layer:
+        layer = Layer()
+        super().__setitem__(key, layer)
+        return layer
+
+    def __setitem__(self, key, value) -> None:
+        if isinstance(value, dict) and not isinstance(value, Layer):
+            value = Layer(value)
+        super().__setitem__(key, value)
+
+    def append(self, layer_name: str, key: str, node) -> "LayerPlan":
+        """
+        layer_name.key에 node를 추가합니다. 같은 name/alias/구조의 node가 이미 있으면 추가하지 않습니다.
+        limit처럼 단일 값인 clause는 덮어씁니다.
+        """
+        layer = self[layer_name]
+        if key in SCALAR_CLAUSES:
+            layer[key] = node
+            return self
+        clause = layer.get(key)
+        if clause is None:
+            clause = ClauseNodes()
+            layer[key] = clause
+        clause.add(node)
+        return self
+
+    def clause(self, layer_name: str, key: str) -> ClauseNodes:
+        """layer/clause가 없으면 빈 ClauseNodes (plan에는 추가하지 않음)"""
+        layer = self.get(layer_name)
+        return layer.clause(key) if layer is not None else ClauseNodes()
+
+    def proj_layer_names(self) -> List[str]:
+        return [name for name in self if name not in (AGG_LAYER, DERIV_LAYER)]
+
+    def invalidate_indexes(self) -> None:
+        """node를 직접 바꾸는 단계가 끝난 뒤 호출합니다. 다음 조회 때 index를 다시 만듭니다."""
+        for layer in self.values():
+            if isinstance(layer, Layer):
+                layer.invalidate_indexes()
+
+    def copy(self) -> "LayerPlan":
+        """node까지 복사한 LayerPlan (원본 plan을 바꾸지 않고 dialect별로 render 할 때 씁니다.)"""
+        plan = LayerPlan()
+        for name, layer in self.items():
+            plan[name] = Layer(
+                {
+                    key: [_copy_node(node) for node in value] if isinstance(value, list) else value
+                    for key, value in layer.items()
+                }
+            )
+        return plan
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """디버깅/로그용 plain dict"""
+        return {
+            name: {
+                key: list(value) if isinstance(value, list) else value
+                for key, value in layer.items()
+            }
+            for name, layer in self.items()
+        }
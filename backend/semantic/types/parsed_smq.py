@@ -0,0 +1,161 @@
+from typing import Any, Dict, FrozenSet, Iterator, List, Mapping, Optional, Tuple
+
+import vendor_setup  # noqa: F401
+import sqlglot
+from sqlglot import exp
+
+
+# SMQParser/SQLComposer가 쓰는 SMQ 키 (요청에서는 groupBy/group_by, orderBy/order_by로도 들어옵니다.)
+SMQ_KEYS = ("limit", "filters", "groups", "metrics", "orders", "joins")
+
+
+class SMQItem:
+    """
+    SMQ의 항목 하나 (metric, filter, group, order, join 문자열)
+
+    dialect별 파싱 결과와 "model__column" 참조를 처음 필요할 때 한 번만 계산해 둡니다.
+    같은 SMQItem을 여러 ParsedSMQ(예: JoinError로 나눈 SMQ)가 공유해도 다시 파싱하지 않습니다.
+    """
+
+    __slots__ = ("raw", "_nodes", "_column_refs")
+
+    def __init__(self, raw: str):
+        self.raw = raw
+        self._nodes: Dict[Optional[str], exp.Expression] = {}
+        self._column_refs: Optional[Tuple[Tuple[str, str], ...]] = None
+
+    def __repr__(self) -> str:
+        return f"SMQItem({self.raw!r})"
+
+    def node(self, dialect: Optional[str] = None) -> exp.Expression:
+        """캐시된 파싱 결과. 여러 단계가 공유하므로 수정하면 안 됩니다. (수정하려면 parse()를 쓰세요.)"""
+        node = self._nodes.get(dialect)
+        if node is None:
+            node = sqlglot.parse_one(self.raw, read=dialect)
+            self._nodes[dialect] = node
+        return node
+
+    def parse(self, dialect: Optional[str] = None) -> exp.Expression:
+        """파싱 결과의 복사본. 반환된 AST는 자유롭게 replace/set 해도 됩니다."""
+        return self.node(dialect).copy()
+
+    @property
+    def alias(self) -> str:
+        node = self.node()
+        return node.alias if isinstance(node, exp.Alias) else ""
+
+    @property
+    def column_refs(self) -> Tuple[Tuple[str, str], ...]:
+        """항목 안의 "model__column" 칼럼들을 (model, column) 목록으로 (등장 순서, 중복 제거)"""
+        if self._column_refs is None:
+            refs = []
+            for column in self.node().find_all(exp.Column):
+                if "__" not in column.name:
+                    continue
+                ref = tuple(column.name.split("__", 1))
+                if ref not in refs:
+                    refs.append(ref)
+            self._column_refs = tuple(refs)
+        return self._column_refs
+
+    @property
+    def tables(self) -> FrozenSet[str]:
+        return frozenset(table for table, _ in self.column_refs)
+
+
+class ParsedSMQ(Mapping):
+    """
+    SMQ 요청을 한 번만 파싱해서 parser/composer/distribute_smq가 함께 쓰는 객체
+
+    - Mapping으로는 원래 값(문자열 목록, limit)을 그대로 돌려주므로 기존 dict처럼 get/[]로 읽을 수 있습니다.
+    - entries(key)는 같은 키의 SMQItem 목록을 돌려줍니다. 파싱 결과는 SMQItem에 캐시됩니다.
+    - 값을 바꾸지 않습니다. 다른 SMQ가 필요하면 SMQItem을 담은 dict로 새 ParsedSMQ를 만듭니다.
+    """
+
+    def __init__(self, smq: Mapping[str, Any]):
+        self._raw: Dict[str, Any] = {}
+        self._entries: Dict[str, List[SMQItem]] = {}
+        for key, value in smq.items():
+            if isinstance(value, list) and key != "limit":
+                items = [v if isinstance(v, SMQItem) else SMQItem(v) for v in value]
+                self._entries[key] = items
+                self._raw[key] = [item.raw for item in items]
+            else:
+                self._raw[key] = value
+        self._table_of_column: Dict[str, Optional[str]] = {}
+
+    @classmethod
+    def from_request(cls, smq: Mapping[str, Any]) -> "ParsedSMQ":
+        """
+        요청 SMQ의 키 이름(groupBy/group_by, orderBy/order_by)을 SMQ_KEYS로 맞춥니다.
+        이미 ParsedSMQ면(예: distribute_smq가 나눈 SMQ) 키가 맞춰져 있으므로 그대로 돌려줍니다.
+        """
+        if isinstance(smq, ParsedSMQ):
+            return smq
+        return cls(
+            {
+                "limit": smq.get("limit"),
+                "filters": smq.get("filters", []),
+                "groups": smq.get("groupBy") or smq.get("group_by", []),
+                "metrics": smq.get("metrics", []),
+                "orders": smq.get("orderBy") or smq.get("order_by", []),
+                "joins": smq.get("joins") or [],
+            }
+        )
+
+    def __getitem__(self, key: str) -> Any:
+        return self._raw[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._raw)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def __repr__(self) -> str:
+        return f"ParsedSMQ({self._raw!r})"
+
+    def entries(self, key: str) -> List[SMQItem]:
+        return self._entries.get(key, [])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self._raw)
+
+    @property
+    def tables(self) -> FrozenSet[str]:
+        """SMQ 항목에 "model__column"으로 직접 등장하는 model 이름 (metric 안의 model은 포함하지 않음)"""
+        return frozenset(
+            table for items in self._entries.values() for item in items for table in item.tables
+        )
+
+    def find_table_of_column(self, column: str) -> Optional[str]:
+        """
+        SMQ 항목에서 column을 "model__column" 형태로 참조하는 model 이름을 찾습니다.
+        column이 어떤 항목의 alias이면 None을 돌려줍니다. 결과는 column별로 캐시합니다.
+        """
+        if column not in self._table_of_column:
+            self._table_of_column[column] = self._find_table_of_column(column)
+        return self._table_of_column[column]
+
+    def _find_table_of_column(self, column: str) -> Optional[str]:
+        for items in self._entries.values():
+            for item in items:
+                if "__" not in item.raw or column not in item.raw:
+                    continue
+                node = item.node()
+                if isinstance(node, exp.Alias) and node.alias == column:
+                    return None
+                if not isinstance(node, exp.Column):
+                    selected_columns = [
+                        col for col in node.find_all(exp.Column) if column in col.name
+                    ]
+                    if selected_columns:
+                        if len(selected_columns) == 1:
+                            node = selected_columns[0]
+                        if "__" not in node.this.name:
+                            return None
+                extracted_name = node.this.name
+                table_name, splited_column_name = extracted_name.split("__", 1)
+                if column == splited_column_name:
+                    return table_name
+        return None
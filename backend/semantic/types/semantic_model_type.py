@@ -55,6 +55,8 @@ class Entity:
     description: Optional[str] = None
     role: Optional[str] = None
     label: Optional[str] = None
+    # foreign entity: 값이 항상 있고 참조하는 primary에 반드시 매칭되면 True (INNER JOIN 허용)
+    required: Optional[bool] = None
 
     @staticmethod
     def from_dict(d: Dict[str, Any]) -> "Entity":
@@ -65,6 +67,7 @@ class Entity:
             description=d.get("description"),
             role=d.get("role"),
             label=d.get("label"),
+            required=d.get("required"),
         )
 
     def to_dict(self) -> Dict[str, Any]:
@@ -167,6 +170,8 @@ class SemanticModel:
     dimensions: List[Dimension] = field(default_factory=list)
     label: Optional[str] = None
     config: Optional[Dict[str, Any]] = None
+    # {"row_count": int | None, "distinct_counts": {column: int}} (조인 순서 결정용, 선택)
+    stats: Optional[Dict[str, Any]] = None
 
     @staticmethod
     def from_dict(d: Dict[str, Any]) -> "SemanticModel":
@@ -186,6 +191,7 @@ class SemanticModel:
                 dimensions=[Dimension.from_dict(x) for x in d.get("dimensions", [])],
                 label=d.get("label"),
                 config=d.get("config"),
+                stats=d.get("stats"),
             )
         except Exception as e:
             raise ValueError(
@@ -203,6 +209,7 @@ class SemanticModel:
             "dimensions": list_to_dict(self.dimensions),
             "label": self.label,
             "config": self.config,
+            "stats": self.stats,
         }
 
 
@@ -1,3 +1,7 @@
+from .manifest_index import ManifestIndex, ensure_manifest_index
+from .metric_graph import MetricGraph, MetricCycleError
+from .join_graph import JoinGraph
+from .parse_cache import parse_expr, parse_cache_info, clear_parse_cache
 from .utils import (
     ARITHMETIC_EXPRESSIONS,
     AGGREGATION_EXPRESSIONS,
@@ -15,6 +19,14 @@ from .utils import (
 )
 
 __all__ = [
+    ManifestIndex,
+    ensure_manifest_index,
+    MetricGraph,
+    MetricCycleError,
+    JoinGraph,
+    parse_expr,
+    parse_cache_info,
+    clear_parse_cache,
     ARITHMETIC_EXPRESSIONS,
     AGGREGATION_EXPRESSIONS,
     FILTER_EXPRESSIONS,
@@ -0,0 +1,97 @@
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+import vendor_setup  # noqa: F401
+from sqlglot import exp
+
+from backend.semantic.types.parsed_smq import ParsedSMQ, SMQItem
+
+
+# compile 동안 값 자리를 표시하는 문자열 literal. 어느 dialect에서도 '...' 그대로 출력되므로
+# compile이 끝난 SQL 문자열에서 위치를 다시 찾을 수 있습니다. (dialect마다 placeholder 출력이 달라서 쓰지 않음)
+SLOT_NAME = "__smq_slot_{}__"
+SLOT_PATTERN = re.compile(r"'__smq_slot_(\d+)__'")
+
+# dialect별 bind placeholder ({n}은 1부터 시작하는 위치). 없는 dialect는 "?"
+PLACEHOLDERS = {
+    "postgres": "%s",
+    "redshift": "%s",
+    "oracle": ":{n}",
+    "tsql": "@p{n}",
+}
+DEFAULT_PLACEHOLDER = "?"
+
+# 이 안의 literal은 bind 변수로 바꿀 수 없습니다. (INTERVAL '1' DAY, VARCHAR(10), LIMIT 10 등)
+_UNBINDABLE_PARENTS = (exp.Interval, exp.DataType, exp.Limit, exp.Offset, exp.Fetch)
+
+
+def slot_literal(index: int) -> exp.Literal:
+    return exp.Literal.string(SLOT_NAME.format(index))
+
+
+def split_slots(sql: str) -> Tuple[List[str], List[int]]:
+    """
+    SQL 문자열을 slot 기준으로 나눕니다.
+    segments[i]와 segments[i + 1] 사이에 slots[i]번 slot이 있습니다. (len(segments) == len(slots) + 1)
+    """
+    pieces = SLOT_PATTERN.split(sql)
+    # re.split은 [segment, slot 번호, segment, slot 번호, ..., segment] 순서로 돌려줍니다.
+    return pieces[0::2], [int(index) for index in pieces[1::2]]
+
+
+def literal_value(literal: exp.Literal) -> Any:
+    """literal node의 Python 값 (숫자는 int/float, 나머지는 str)"""
+    if literal.is_string:
+        return literal.this
+    if literal.is_int:
+        return int(literal.this)
+    return float(literal.this)
+
+
+def parameterize_filters(smq: ParsedSMQ, dialect: Optional[str]) -> Tuple[ParsedSMQ, List[Any]]:
+    """
+    filters 안의 문자열/숫자 literal을 slot literal로 바꾼 ParsedSMQ와 slot별 원래 값 목록을 반환합니다.
+    literal이 없는 filter와 다른 키의 항목은 원래 SMQItem(파싱 결과)을 그대로 공유합니다.
+    """
+    values: List[Any] = []
+    filters = []
+    for item in smq.entries("filters"):
+        literals = [
+            literal
+            for literal in item.node(dialect).find_all(exp.Literal)
+            if not literal.find_ancestor(*_UNBINDABLE_PARENTS)
+        ]
+        if not literals:
+            filters.append(item)
+            continue
+        node = item.parse(dialect)
+        for literal in list(node.find_all(exp.Literal)):
+            if literal.find_ancestor(*_UNBINDABLE_PARENTS):
+                continue
+            literal.replace(slot_literal(len(values)))
+            values.append(literal_value(literal))
+        filters.append(SMQItem(node.sql(dialect=dialect)))
+
+    if not values:
+        return smq, values
+    fields: Dict[str, Any] = {key: smq.entries(key) or smq[key] for key in smq}
+    fields["filters"] = filters
+    return ParsedSMQ(fields), values
+
+
+def bind_parameters(sql: str, values: List[Any], dialect: Optional[str]) -> Tuple[str, List[Any]]:
+    """
+    slot이 든 SQL을 dialect의 bind placeholder(%s, :1, @p1, ?)로 바꾸고, placeholder 순서대로 값 목록을 반환합니다.
+    같은 slot이 여러 번 나오면(예: 여러 layer로 내려간 filter) 값도 그 횟수만큼 들어갑니다.
+    """
+    segments, slots = split_slots(sql)
+    placeholder = PLACEHOLDERS.get((dialect or "").lower(), DEFAULT_PLACEHOLDER)
+    if placeholder == "%s":
+        # pyformat 계열 드라이버(psycopg2 등)는 값이 있으면 SQL의 %를 형식 문자로 해석하므로 %%로 바꿉니다.
+        segments = [segment.replace("%", "%%") for segment in segments]
+
+    parts = [segments[0]]
+    for position, (slot, segment) in enumerate(zip(slots, segments[1:]), start=1):
+        parts.append(placeholder.format(n=position))
+        parts.append(segment)
+    return "".join(parts), [values[slot] for slot in slots]
@@ -0,0 +1,255 @@
+import bisect
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import vendor_setup  # vendor 경로 설정 및 벤더 패키지 로드를 위한 사이드 이펙트
+from sqlglot.dialects.dialect import Dialects
+
+
+# 초 단위 bucket 상한. parser 키/composer 단계 하나는 보통 수 ms 안에 끝나므로 작은 쪽을 촘촘하게 둡니다.
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0,
+)
+
+LabelValues = Tuple[str, ...]
+
+# dialect label에 쓸 수 있는 값. 요청의 dialect는 검증 전에 기록되므로, 그대로 쓰면 임의의 문자열마다 series가 생깁니다.
+_KNOWN_DIALECTS = frozenset(dialect.value for dialect in Dialects if dialect.value)
+
+
+def _dialect_label(dialect: Optional[str]) -> str:
+    """sqlglot이 아는 dialect 이름이면 소문자 이름을, 아니면 "other"를 label 값으로 씁니다."""
+    name = (dialect or "").lower()
+    return name if name in _KNOWN_DIALECTS else "other"
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(
+    names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None
+) -> str:
+    pairs = [f'{name}="{_escape_label_value(value)}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """label 조합별로 단조 증가하는 값 (Prometheus counter)"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        return self._values.get(labelvalues, 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labelvalues, value in items:
+            labels = _format_labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}{labels} {_format_number(value)}")
+        return lines
+
+
+class Histogram:
+    """
+    label 조합별 관측값 분포 (Prometheus histogram)
+
+    p50/p95/p99는 bucket 누적 개수로부터 Prometheus 쪽에서 계산합니다.
+    예) histogram_quantile(0.95, sum by (le, stage, dialect) (rate(smq_compile_stage_seconds_bucket[5m])))
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label 조합 -> [bucket별 개수(마지막은 +Inf), 합계]
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = ([0] * (len(self.buckets) + 1), [0.0])
+                self._series[labelvalues] = series
+            series[0][index] += 1
+            series[1][0] += value
+
+    def count(self, *labelvalues: str) -> int:
+        series = self._series.get(labelvalues)
+        return sum(series[0]) if series else 0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted(
+                (labelvalues, (list(counts), total[0]))
+                for labelvalues, (counts, total) in self._series.items()
+            )
+        for labelvalues, (counts, total) in items:
+            cumulative = 0
+            for upper, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, labelvalues, ("le", _format_number(upper)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}_sum{labels} {_format_number(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class _StageTimer:
+    __slots__ = ("_histogram", "_labelvalues", "_started_at")
+
+    def __init__(self, histogram: Histogram, labelvalues: LabelValues):
+        self._histogram = histogram
+        self._labelvalues = labelvalues
+
+    def __enter__(self):
+        self._started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._histogram.observe(time.perf_counter() - self._started_at, *self._labelvalues)
+        return False
+
+
+class _NoopTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_TIMER = _NoopTimer()
+
+
+class CompileMetrics:
+    """
+    SMQ → SQL 변환 지표 모음. /metrics 엔드포인트가 render()를 Prometheus text 형식으로 내보냅니다.
+
+    - smq_compile_stage_seconds: parser 키 핸들러 / composer pipeline 단계별 소요 시간 (phase, stage, dialect)
+    - smq_compile_seconds: smq_to_sql 한 번의 전체 소요 시간 (dialect)
+    - smq_compile_total: 변환 성공/실패 횟수 (dialect, result)
+    - smq_compile_join_error_splits_total: JoinError로 SMQ를 model set별로 나눠 변환한 횟수 (dialect)
+    - smq_compile_cache_requests_total: compile_cache 조회 hit/miss 횟수 (dialect, result)
+    - smq_request_executor_tasks_total: request_executor에 넘긴 작업의 결과별 횟수 (task, result=completed/failed/timeout/rejected)
+
+    주의) 값은 프로세스 메모리에만 쌓입니다. 배치 변환이나 JoinError 분할 변환을 맡은 process pool worker에서 측정된 값은 포함되지 않습니다.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.stage_seconds = Histogram(
+            "smq_compile_stage_seconds",
+            "Time spent in each SMQ parser key handler and SQL composer stage.",
+            ("phase", "stage", "dialect"),
+        )
+        self.compile_seconds = Histogram(
+            "smq_compile_seconds",
+            "Time spent compiling one SMQ into SQL.",
+            ("dialect",),
+        )
+        self.compiles_total = Counter(
+            "smq_compile_total",
+            "SMQ compiles by result.",
+            ("dialect", "result"),
+        )
+        self.join_error_splits_total = Counter(
+            "smq_compile_join_error_splits_total",
+            "SMQ compiles split into per-model-set queries after a JoinError.",
+            ("dialect",),
+        )
+        self.cache_requests_total = Counter(
+            "smq_compile_cache_requests_total",
+            "Compile cache lookups by result.",
+            ("dialect", "result"),
+        )
+        self.request_executor_tasks_total = Counter(
+            "smq_request_executor_tasks_total",
+            "Tasks dispatched to the request executor by result.",
+            ("task", "result"),
+        )
+
+    def time_stage(self, phase: str, stage: str, dialect: Optional[str]):
+        """with 블록의 소요 시간을 smq_compile_stage_seconds에 기록합니다."""
+        if not self.enabled:
+            return _NOOP_TIMER
+        return _StageTimer(self.stage_seconds, (phase, stage, _dialect_label(dialect)))
+
+    def time_compile(self, dialect: Optional[str]):
+        if not self.enabled:
+            return _NOOP_TIMER
+        return _StageTimer(self.compile_seconds, (_dialect_label(dialect),))
+
+    def record_compile(self, dialect: Optional[str], success: bool) -> None:
+        if self.enabled:
+            self.compiles_total.inc(_dialect_label(dialect), "success" if success else "failure")
+
+    def record_join_error_split(self, dialect: Optional[str]) -> None:
+        if self.enabled:
+            self.join_error_splits_total.inc(_dialect_label(dialect))
+
+    def record_cache_lookup(self, dialect: Optional[str], hit: bool) -> None:
+        if self.enabled:
+            self.cache_requests_total.inc(_dialect_label(dialect), "hit" if hit else "miss")
+
+    def record_dispatch(self, task: str, result: str) -> None:
+        if self.enabled:
+            self.request_executor_tasks_total.inc(task, result)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in (
+            self.stage_seconds,
+            self.compile_seconds,
+            self.compiles_total,
+            self.join_error_splits_total,
+            self.cache_requests_total,
+            self.request_executor_tasks_total,
+        ):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+compile_metrics = CompileMetrics(
+    enabled=os.getenv("SMQ_COMPILE_METRICS", "1").lower() not in ("0", "false", "no"),
+)
@@ -1,10 +1,16 @@
 from collections import defaultdict
 from sqlglot import expressions as exp
-import sqlglot
-from backend.semantic.utils import find_metric_by_name
+from backend.semantic.utils import find_metric_by_name, parse_expr
+from backend.semantic.types.parsed_smq import ParsedSMQ
 
 
-def distribute_smq_with_designated_models(smq, model_sets, semantic_manifest):
+def distribute_smq_with_designated_models(smq, model_sets, manifest_index):
+    """
+    SMQ 항목들을 model set별로 나눕니다. (JoinError로 한 쿼리로 join할 수 없는 경우)
+    반환값은 model set tuple -> ParsedSMQ이며, 나눈 SMQ들은 원래 SMQ의 SMQItem(파싱 결과)을 그대로 공유합니다.
+    """
+    if not isinstance(smq, ParsedSMQ):
+        smq = ParsedSMQ(smq)
 
     distributed_smqs = {}
     model_sets_in_tuple = []
@@ -24,30 +30,28 @@ def distribute_smq_with_designated_models(smq, model_sets, semantic_manifest):
         if items is None:
             continue
 
-        for item in items:
-            item_tables = _extract_tables_from_smq_item(item, semantic_manifest)
+        for item in smq.entries(key):
+            item_tables = _extract_tables_from_smq_item(item, manifest_index)
             for model_set in model_sets_in_tuple:
                 if item_tables.issubset(set(model_set)):
                     distributed_smqs[model_set][key].append(item)
                     break
 
-    # 각 distributed_smq에 model_sets 정보 추가 및 검증
+    # 각 distributed_smq 검증 (model set 정보는 반환 dict의 key로 전달합니다.)
     validated_smqs = {}
     for model_set_tuple, smq_dict in distributed_smqs.items():
-        # model_sets 정보 추가
-        smq_dict["model_sets"] = list(model_set_tuple)
         # 필수 키들이 있는지 확인
         if "metrics" not in smq_dict or not smq_dict["metrics"]:
             # metrics가 없으면 이 model_set에 대한 SMQ는 건너뛰기
             continue
-        validated_smqs[model_set_tuple] = smq_dict
+        validated_smqs[model_set_tuple] = ParsedSMQ(smq_dict)
     
     return validated_smqs
 
 
-def _extract_tables_from_smq_item(item, semantic_manifest):
+def _extract_tables_from_smq_item(item, manifest_index):
     tables = set()
-    parsed_item = sqlglot.parse_one(item)
+    parsed_item = item.node()
 
     for col in parsed_item.find_all(exp.Column):
         col_name = col.name
@@ -57,9 +61,9 @@ def _extract_tables_from_smq_item(item, semantic_manifest):
             tables.add(table_name)
         # metric인 경우 -> metric expr을 파싱해서 나오는 모든 칼럼의 table_name을 붙임
         else:
-            metric = find_metric_by_name(col_name, semantic_manifest)
+            metric = find_metric_by_name(col_name, manifest_index)
             if metric:
-                parsed_metric_expr = sqlglot.parse_one(metric["expr"])
+                parsed_metric_expr = parse_expr(metric["expr"])
                 for metric_col in parsed_metric_expr.find_all(exp.Column):
                     if "__" in metric_col.name:
                         table_name, _ = metric_col.name.split("__", 1)
@@ -0,0 +1,147 @@
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
+
+
+JoinPairs = List[Tuple[str, str]]
+
+
+class JoinGraph:
+    """
+    semantic model 간 entity(foreign -> primary) 조인 그래프. manifest를 읽을 때 한 번만 만듭니다.
+
+    - foreign_joins[(lhm, rhm)]: lhm의 foreign entity -> rhm의 primary entity 조인 키 쌍들
+    - adjacency: model별로 직접 조인 가능한 model 이름들 (방향 무관)
+    - component_of: 전체 그래프 기준 connected component 번호
+    - required_joins: lhm의 foreign entity가 모두 required(값이 항상 있고 rhm의 primary에 반드시 매칭)인 간선
+    - row_counts / distinct_counts: semantic model의 stats(행 수, 컬럼별 distinct 값 수). 조인 순서 결정에 사용합니다.
+    - 두 model 사이의 최단 조인 경로(중간 bridge model 포함)는 출발 model별로 처음 요청될 때 계산해 캐싱합니다.
+    """
+
+    def __init__(self, models: Dict[str, Dict]):
+        self.model_names: List[str] = list(models.keys())
+        self.foreign_joins: Dict[Tuple[str, str], JoinPairs] = {}
+        self.adjacency: Dict[str, List[str]] = {name: [] for name in self.model_names}
+        self._neighbor_sets: Dict[str, set] = {name: set() for name in self.model_names}
+        self.component_of: Dict[str, int] = {}
+        self.required_joins: Set[Tuple[str, str]] = set()
+        self.row_counts: Dict[str, int] = {}
+        self.distinct_counts: Dict[Tuple[str, str], int] = {}
+        self._paths_from: Dict[str, Dict[str, Optional[str]]] = {}
+
+        # 1) model별 primary entity: entity 이름 -> expr (같은 이름이 여러 번 나오면 마지막 것)
+        primary_by_model: Dict[str, Dict[str, str]] = {}
+        for name, model in models.items():
+            primaries = {}
+            for ent in model.get("entities", None) or []:
+                if ent.get("type") == "primary" and ent.get("name"):
+                    primaries[ent["name"]] = ent.get("expr") or ent["name"]
+            primary_by_model[name] = primaries
+
+        # 2) entity 이름 -> 그 entity를 primary로 가진 model들
+        models_by_primary: Dict[str, List[str]] = {}
+        for name, primaries in primary_by_model.items():
+            for ent_name in primaries:
+                models_by_primary.setdefault(ent_name, []).append(name)
+
+        # 3) foreign entity마다 같은 이름의 primary를 가진 model과 연결합니다.
+        #    모든 model 쌍을 비교하지 않고 entity 이름으로 바로 찾으므로 entity 수에 비례합니다.
+        optional_joins: Set[Tuple[str, str]] = set()
+        for name, model in models.items():
+            for ent in model.get("entities", None) or []:
+                if ent.get("type") != "foreign" or not ent.get("name"):
+                    continue
+                ent_name = ent["name"]
+                for right_name in models_by_primary.get(ent_name, []):
+                    if right_name == name:
+                        continue
+                    self.foreign_joins.setdefault((name, right_name), []).append(
+                        (ent.get("expr") or ent_name, primary_by_model[right_name][ent_name])
+                    )
+                    if not ent.get("required"):
+                        optional_joins.add((name, right_name))
+                    self._add_edge(name, right_name)
+        self.required_joins = set(self.foreign_joins) - optional_joins
+
+        # 4) semantic model의 stats (선택)
+        for name, model in models.items():
+            stats = model.get("stats", None) or {}
+            if stats.get("row_count") is not None:
+                self.row_counts[name] = int(stats["row_count"])
+            for column_name, distinct_count in (stats.get("distinct_counts", None) or {}).items():
+                if distinct_count is not None:
+                    self.distinct_counts[(name, column_name)] = int(distinct_count)
+
+        # 5) 전체 그래프 기준 connected component
+        component_id = -1
+        for start in self.model_names:
+            if start in self.component_of:
+                continue
+            component_id += 1
+            self.component_of[start] = component_id
+            stack = [start]
+            while stack:
+                current = stack.pop()
+                for neighbor in self.adjacency[current]:
+                    if neighbor not in self.component_of:
+                        self.component_of[neighbor] = component_id
+                        stack.append(neighbor)
+
+    def _add_edge(self, left: str, right: str) -> None:
+        if right not in self._neighbor_sets[left]:
+            self._neighbor_sets[left].add(right)
+            self.adjacency[left].append(right)
+        if left not in self._neighbor_sets[right]:
+            self._neighbor_sets[right].add(left)
+            self.adjacency[right].append(left)
+
+    def has_edge(self, left: str, right: str) -> bool:
+        return right in self._neighbor_sets.get(left, ())
+
+    def join_path(self, sm1: str, sm2: str) -> Optional[Tuple[str, str, JoinPairs]]:
+        """
+        두 model을 직접 조인하는 (lhm, rhm, [(lhe, rhe), ...]) or None
+        find_join_path와 같은 규칙: sm1.foreign -> sm2.primary를 먼저, 없으면 sm2.foreign -> sm1.primary
+        """
+        join_pairs = self.foreign_joins.get((sm1, sm2))
+        if join_pairs:
+            return (sm1, sm2, list(join_pairs))
+        join_pairs = self.foreign_joins.get((sm2, sm1))
+        if join_pairs:
+            return (sm2, sm1, list(join_pairs))
+        return None
+
+    def is_required(self, lhm: str, rhm: str) -> bool:
+        """lhm.foreign -> rhm.primary 조인이 INNER JOIN으로 바꿔도 행이 사라지지 않는지 여부"""
+        return (lhm, rhm) in self.required_joins
+
+    def distinct_count(self, model_name: str, column_name: str) -> Optional[int]:
+        return self.distinct_counts.get((model_name, column_name))
+
+    def same_component(self, models: List[str]) -> bool:
+        """전체 그래프에서(중간 bridge model을 거쳐서라도) 모두 연결되어 있는지 여부"""
+        return len({self.component_of.get(model) for model in models}) <= 1
+
+    def shortest_path(self, source: str, target: str) -> Optional[List[str]]:
+        """source에서 target까지 조인 홉이 가장 적은 model 경로 (양 끝 포함). 연결되지 않으면 None"""
+        if source not in self.component_of or target not in self.component_of:
+            return None
+        if self.component_of[source] != self.component_of[target]:
+            return None
+
+        parents = self._paths_from.get(source)
+        if parents is None:
+            parents = {source: None}
+            queue = deque([source])
+            while queue:
+                current = queue.popleft()
+                for neighbor in self.adjacency[current]:
+                    if neighbor not in parents:
+                        parents[neighbor] = current
+                        queue.append(neighbor)
+            self._paths_from[source] = parents
+
+        path = [target]
+        while path[-1] != source:
+            path.append(parents[path[-1]])
+        path.reverse()
+        return path
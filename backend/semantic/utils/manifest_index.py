@@ -0,0 +1,87 @@
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from backend.semantic.utils.join_graph import JoinGraph
+from backend.semantic.utils.metric_graph import MetricGraph
+
+
+class ManifestIndex:
+    """semantic manifest를 한 번만 훑어서 metric/measure/dimension 조회용 해시맵을 만들어 두는 객체
+
+    parser/composer pipeline은 raw manifest dict 대신 이 객체를 받아서 O(1)로 조회합니다.
+    원본 manifest는 `manifest` 속성으로 그대로 접근할 수 있습니다.
+    metric 의존 그래프(metric_graph)도 함께 만들며, metric 간 순환 참조가 있으면 MetricCycleError가 발생합니다.
+    model 간 entity 조인 그래프(join_graph)도 여기서 한 번만 만듭니다.
+    """
+
+    def __init__(self, semantic_manifest: Dict[str, Any]):
+        self.manifest = semantic_manifest
+
+        self.metrics: Dict[str, Dict[str, Any]] = {}
+        self.models: Dict[str, Dict[str, Any]] = {}
+        self.measures: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.dimensions: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        # "model__column" -> (model, column): measure를 먼저, 없으면 dimension
+        self.identifiers: Dict[str, Tuple[str, str]] = {}
+        # dimension 이름 -> model 순서상 처음 나오는 dimension (메타데이터 수집용)
+        self.dimensions_by_column_name: Dict[str, Dict[str, Any]] = {}
+
+        # 주의) 이름이 중복되면 기존 선형 탐색과 동일하게 먼저 나온 항목을 사용합니다.
+        for metric in semantic_manifest.get("metrics", None) or []:
+            self.metrics.setdefault(metric["name"], metric)
+
+        for model in semantic_manifest.get("semantic_models", None) or []:
+            model_name = model["name"]
+            if model_name in self.models:
+                continue
+            self.models[model_name] = model
+            for measure in model.get("measures", None) or []:
+                self.measures.setdefault((model_name, measure["name"]), measure)
+            for dimension in model.get("dimensions", None) or []:
+                self.dimensions.setdefault((model_name, dimension["name"]), dimension)
+                self.dimensions_by_column_name.setdefault(dimension["name"], dimension)
+
+        for model_name, column_name in list(self.measures) + list(self.dimensions):
+            self.identifiers.setdefault(
+                f"{model_name}__{column_name}", (model_name, column_name)
+            )
+
+        self.metric_graph = MetricGraph(self.metrics)
+        self.join_graph = JoinGraph(self.models)
+
+    @property
+    def semantic_models(self) -> List[Dict[str, Any]]:
+        return list(self.models.values())
+
+    def find_metric(self, metric_name) -> Optional[Dict[str, Any]]:
+        return self.metrics.get(metric_name)
+
+    def find_model(self, model_name) -> Optional[Dict[str, Any]]:
+        return self.models.get(model_name)
+
+    def find_measure(self, model_name, measure_name) -> Optional[Dict[str, Any]]:
+        return self.measures.get((model_name, measure_name))
+
+    def find_dimension(self, model_name, dimension_name) -> Optional[Dict[str, Any]]:
+        return self.dimensions.get((model_name, dimension_name))
+
+    def find_dimension_by_column_name(self, dimension_name) -> Optional[Dict[str, Any]]:
+        """model 구분 없이 dimension 이름으로 찾습니다. 여러 model에 있으면 먼저 나온 model의 것"""
+        return self.dimensions_by_column_name.get(dimension_name)
+
+    def find_column(self, model_name, column_name) -> Optional[Dict[str, Any]]:
+        """measure를 먼저 찾고, 없으면 dimension에서 찾습니다."""
+        key = (model_name, column_name)
+        return self.measures.get(key) or self.dimensions.get(key)
+
+    def resolve_identifier(self, identifier: str) -> Optional[Tuple[str, str]]:
+        """"model__column" 식별자를 (model, column)으로 변환합니다. manifest에 없으면 None"""
+        return self.identifiers.get(identifier)
+
+
+def ensure_manifest_index(
+    semantic_manifest: Union[ManifestIndex, Dict[str, Any]],
+) -> ManifestIndex:
+    """raw manifest dict가 들어오면 ManifestIndex로 감싸고, 이미 index면 그대로 반환합니다."""
+    if isinstance(semantic_manifest, ManifestIndex):
+        return semantic_manifest
+    return ManifestIndex(semantic_manifest)
@@ -1,11 +1,11 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 
-import pandas as pd
 import vendor_setup
 from sqlglot import expressions as exp
 
 from backend.semantic.types.semantic_model_type import SemanticModel
 from backend.semantic.types.metric_type import Metric
+from backend.semantic.utils.manifest_index import ManifestIndex, ensure_manifest_index
 
 
 def has_division(expr) -> bool:
@@ -24,7 +24,7 @@ def has_division(expr) -> bool:
 
 def infer_deriv_type(
     dependencies: list,
-    metrics_df: pd.DataFrame,
+    metrics_by_name: Dict[str, Dict[str, Any]],
     expr: Any
 ) -> str:
     """
@@ -32,7 +32,7 @@ def infer_deriv_type(
     
     Args:
         dependencies: 의존하는 metric 이름들
-        metrics_df: metrics DataFrame
+        metrics_by_name: metric 이름 -> metric dict (ManifestIndex.metrics)
         expr: sqlglot Expression (연산식)
     
     Returns:
@@ -44,9 +44,8 @@ def infer_deriv_type(
     # 의존 metric들의 타입 수집
     dep_types = []
     for dep_name in dependencies:
-        dep_rows = metrics_df[metrics_df["name"] == dep_name]
-        if not dep_rows.empty:
-            dep_metric = dep_rows.iloc[0]
+        dep_metric = metrics_by_name.get(dep_name)
+        if dep_metric is not None:
             # type 필드가 있으면 사용, 없으면 numeric
             dep_type = dep_metric.get("type", "numeric")
             if dep_type is not None:
@@ -94,85 +93,78 @@ def infer_deriv_type(
 
 
 def get_select_metadata(
-    select_clause: pd.DataFrame,
-    metrics_df: pd.DataFrame,
-    dimensions_df: pd.DataFrame
+    select_clause: List[Dict[str, Any]],
+    manifest_index: ManifestIndex
 ) -> List[Dict[str, str]]:
     """
     select_clause에서 최종 SELECT에 포함될 컬럼들의 메타데이터를 수집합니다.
     agg CTE의 컬럼들과 deriv metric들을 포함합니다.
     
     Args:
-        select_clause: QueryAssembler의 select_clause DataFrame
-        metrics_df: metrics DataFrame
-        dimensions_df: dimensions DataFrame
+        select_clause: collect_select_clause_from_sql이 만든 row 리스트
+        manifest_index: metric/dimension 이름 조회용 ManifestIndex
         
     Returns:
         List of metadata dictionaries with 'column', 'type', 'label' keys
     """
     metadata = []
+    metrics_by_name = manifest_index.metrics
     
     # agg level 컬럼들 (dimensions + metrics)
-    agg_rows = select_clause[select_clause["level"] == "agg"]
+    agg_rows = [row for row in select_clause if row["level"] == "agg"]
     
-    for row in agg_rows.itertuples(index=False):
-        model = row.model
-        name = row.name
+    for row in agg_rows:
+        model = row["model"]
+        name = row["name"]
         
-        # metrics_df에서 먼저 확인
+        # metric에서 먼저 확인
         if model == "metric" or not model or model == "":
             # Metric 처리
-            metric_rows = metrics_df[metrics_df["name"] == name]
-            if not metric_rows.empty:
-                metric = metric_rows.iloc[0]
+            metric = metrics_by_name.get(name)
+            if metric is not None:
                 # metric.type은 데이터 타입 (integer, float, decimal, number, varchar, date, datetime, array, map)
                 # metric.metric_type은 메트릭 분류 (simple, ratio, derived, conversion, cumulative)
                 metadata.append({
                     "column": name,
-                    "type": metric.type or "numeric",  # 기본값으로 numeric 사용
-                    "label": metric.label or name
+                    "type": metric.get("type") or "numeric",  # 기본값으로 numeric 사용
+                    "label": metric.get("label") or name
                 })
                 continue  # Metric을 찾았으면 다음 row로
         
         # Dimension 처리
         # if model and model != "":
         #     # model이 있는 경우: semantic_model과 name으로 정확히 매칭
-        #     dim_rows = dimensions_df[
-        #         (dimensions_df["name"] == name) & 
-        #         (dimensions_df["semantic_model"] == model)
-        #     ]
+        #     dimension = manifest_index.find_dimension(model, name)
         # else:
         #     # model이 비어있는 경우: name만으로 검색 (첫 번째 매칭 결과 사용)
-        dim_rows = dimensions_df[dimensions_df["name"] == name]
+        dimension = manifest_index.find_dimension_by_column_name(name)
         
-        if not dim_rows.empty:
-            dimension = dim_rows.iloc[0]
+        if dimension is not None:
             metadata.append({
                 "column": name,
-                "type": dimension.type,
-                "label": dimension.label or name
+                "type": dimension.get("type"),
+                "label": dimension.get("label") or name
             })
     
     # deriv level 컬럼들 (파생 metric 식들) - 개선된 타입 추론
-    deriv_rows = select_clause[select_clause["level"] == "deriv"]
-    for row in deriv_rows.itertuples(index=False):
-        name = row.name
-        dependencies = getattr(row, "dependencies", []) or []
-        expr = getattr(row, "expr", None)
+    deriv_rows = [row for row in select_clause if row["level"] == "deriv"]
+    for row in deriv_rows:
+        name = row["name"]
+        dependencies = row.get("dependencies") or []
+        expr = row.get("expr")
         
         # semantic_manifest.json에 정의된 derived metric인지 먼저 확인
-        metric_rows = metrics_df[metrics_df["name"] == name]
-        if not metric_rows.empty:
+        metric = metrics_by_name.get(name)
+        if metric is not None:
             # 정의된 metric이 있으면 그 label과 type을 그대로 사용
-            metric = metric_rows.iloc[0]
             metadata.append({
                 "column": name,
-                "type": metric.type or "numeric",
-                "label": metric.label or name
+                "type": metric.get("type") or "numeric",
+                "label": metric.get("label") or name
             })
         else:
             # 정의되지 않은 동적 파생 metric인 경우에만 추론
-            inferred_type = infer_deriv_type(dependencies, metrics_df, expr)
+            inferred_type = infer_deriv_type(dependencies, metrics_by_name, expr)
             
             metadata.append({
                 "column": name,
@@ -186,19 +178,19 @@ def get_select_metadata(
 def collect_select_clause_from_sql(
     sql: exp.Select,
     parsed_dsl: Dict[str, Any],
-    semantic_manifest: Dict[str, Any]
-) -> pd.DataFrame:
+    semantic_manifest: Union[ManifestIndex, Dict[str, Any]]
+) -> List[Dict[str, Any]]:
     """
-    SQL의 SELECT 절과 parsed_dsl에서 select_clause DataFrame을 생성합니다.
+    SQL의 SELECT 절과 parsed_dsl에서 select_clause row 리스트를 생성합니다.
     agg 레이어와 deriv 레이어의 컬럼 정보를 모두 포함합니다.
     
     Args:
         sql: sqlglot Select 객체 (최종 SELECT 쿼리)
         parsed_dsl: SMQParser가 파싱한 결과
-        semantic_manifest: semantic manifest 딕셔너리
+        semantic_manifest: ManifestIndex 또는 semantic manifest 딕셔너리
         
     Returns:
-        select_clause DataFrame with columns: model, name, level, dependencies, expr
+        select_clause rows with keys: model, name, level, dependencies, expr
     """
     rows = []
     
@@ -286,52 +278,34 @@ def collect_select_clause_from_sql(
                             "expr": deriv_metric.this,
                         })
     
-    # DataFrame 생성
-    if rows:
-        select_clause = pd.DataFrame(rows)
-    else:
-        select_clause = pd.DataFrame(columns=["model", "name", "level", "dependencies", "expr"])
-    
-    return select_clause
+    return rows
 
 
 def collect_metadata_from_sql(
     sql: exp.Select,
     parsed_dsl: Dict[str, Any],
-    semantic_manifest: Dict[str, Any]
+    semantic_manifest: Union[ManifestIndex, Dict[str, Any]]
 ) -> List[Dict[str, str]]:
     """
     SQL과 parsed_dsl에서 메타데이터를 수집합니다.
+    metric/dimension은 ManifestIndex의 이름별 해시맵에서 조회하므로 manifest 크기와 무관합니다.
     
     Args:
         sql: sqlglot Select 객체 (최종 SELECT 쿼리)
         parsed_dsl: SMQParser가 파싱한 결과
-        semantic_manifest: semantic manifest 딕셔너리
+        semantic_manifest: ManifestIndex 또는 semantic manifest 딕셔너리
         
     Returns:
         List of metadata dictionaries with 'column', 'type', 'label' keys
     """
-    # select_clause DataFrame 생성
-    select_clause = collect_select_clause_from_sql(sql, parsed_dsl, semantic_manifest)
-    
-    # metrics와 dimensions DataFrame 생성
-    metrics_df = pd.DataFrame(semantic_manifest["metrics"])
-    sm = semantic_manifest["semantic_models"]
-    
-    dimensions_df: pd.DataFrame = pd.DataFrame(
-        [
-            {
-                **d,
-                "semantic_model": m["name"],
-            }
-            for m in sm
-            for d in m["dimensions"]
-        ]
-    )
+    manifest_index = ensure_manifest_index(semantic_manifest)
+
+    # select_clause row 생성
+    select_clause = collect_select_clause_from_sql(sql, parsed_dsl, manifest_index)
     
     # 메타데이터 수집
-    if not select_clause.empty:
-        metadata = get_select_metadata(select_clause, metrics_df, dimensions_df)
+    if select_clause:
+        metadata = get_select_metadata(select_clause, manifest_index)
     else:
         metadata = []
     
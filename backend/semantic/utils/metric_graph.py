@@ -0,0 +1,136 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+import vendor_setup
+from sqlglot import expressions as exp
+
+from backend.semantic.utils.parse_cache import parse_expr
+
+
+class MetricCycleError(ValueError):
+    """metric 정의 사이에 순환 참조가 있는 경우"""
+
+
+@dataclass
+class MetricNode:
+    """
+    metric 하나의 의존 관계 정보
+
+    - dependencies: expr에서 직접 참조하는 metric 이름들
+    - expanded_expr: derived metric을 모두 펼쳐서 simple metric(다른 metric을 참조하지 않는 metric)만 남긴 식
+    - base_expr: simple metric까지 모두 펼쳐서 measure/dimension(model__column)만 남긴 식
+    - measures: 전이적으로 참조하는 (model, column) 집합
+    - models: 전이적으로 참조하는 model 이름 집합
+    - depth: simple metric은 0, derived metric은 1 + 의존 metric들의 최대 depth
+    """
+
+    name: str
+    expr: exp.Expression
+    dependencies: List[str] = field(default_factory=list)
+    expanded_expr: Optional[exp.Expression] = None
+    base_expr: Optional[exp.Expression] = None
+    measures: Set[Tuple[str, str]] = field(default_factory=set)
+    models: Set[str] = field(default_factory=set)
+    depth: int = 0
+
+    @property
+    def is_derived(self) -> bool:
+        return bool(self.dependencies)
+
+
+class MetricGraph:
+    """
+    manifest의 metric 의존 그래프. manifest를 읽을 때 한 번만 위상 정렬 순서로 계산합니다.
+    순환 참조가 있으면 생성 시점에 MetricCycleError를 발생시킵니다.
+    """
+
+    def __init__(self, metrics: Dict[str, Dict]):
+        self.nodes: Dict[str, MetricNode] = {}
+        # 의존하는 metric이 항상 먼저 나오는 순서
+        self.order: List[str] = []
+
+        for name, metric in metrics.items():
+            expr = metric.get("expr", None)
+            if not expr:
+                continue
+            parsed_expr = parse_expr(expr)
+            dependencies = []
+            for ident in parsed_expr.find_all(exp.Identifier):
+                if ident.name in metrics and ident.name not in dependencies:
+                    dependencies.append(ident.name)
+            self.nodes[name] = MetricNode(
+                name=name, expr=parsed_expr, dependencies=dependencies
+            )
+
+        visiting: List[str] = []
+        for name in self.nodes:
+            self._visit(name, visiting)
+
+    def get(self, metric_name) -> Optional[MetricNode]:
+        return self.nodes.get(metric_name)
+
+    def is_derived(self, metric_name) -> bool:
+        node = self.nodes.get(metric_name)
+        return node is not None and node.is_derived
+
+    def expand(self, metric_name) -> Optional[exp.Expression]:
+        """derived metric을 simple metric 단위까지 펼친 식의 복사본을 반환합니다."""
+        node = self.nodes.get(metric_name)
+        if node is None:
+            return None
+        return node.expanded_expr.copy()
+
+    def _visit(self, name: str, visiting: List[str]) -> None:
+        node = self.nodes[name]
+        if node.expanded_expr is not None:
+            return
+        if name in visiting:
+            cycle_path = " → ".join(visiting[visiting.index(name):] + [name])
+            raise MetricCycleError(
+                f"Metric 간 순환 참조가 감지되었습니다: {cycle_path}. "
+                f"시멘틱 모델의 metric 정의에서 순환 의존성을 제거해 주세요."
+            )
+
+        visiting.append(name)
+        for dependency in node.dependencies:
+            if dependency in self.nodes:
+                self._visit(dependency, visiting)
+        visiting.pop()
+
+        expanded_expr = node.expr.copy()
+        base_expr = node.expr.copy()
+        if node.is_derived:
+            expanded_expr = _replace_metric_columns(
+                expanded_expr, self.nodes, lambda dep: dep.is_derived, "expanded_expr"
+            )
+        base_expr = _replace_metric_columns(
+            base_expr, self.nodes, lambda dep: True, "base_expr"
+        )
+
+        for ident in node.expr.find_all(exp.Identifier):
+            if "__" in ident.name and ident.name not in self.nodes:
+                model_name, column_name = ident.name.split("__", 1)
+                node.measures.add((model_name, column_name))
+                node.models.add(model_name)
+        for dependency in node.dependencies:
+            dependency_node = self.nodes.get(dependency)
+            if dependency_node is None:
+                continue
+            node.measures |= dependency_node.measures
+            node.models |= dependency_node.models
+            node.depth = max(node.depth, dependency_node.depth + 1)
+
+        node.expanded_expr = expanded_expr
+        node.base_expr = base_expr
+        self.order.append(name)
+
+
+def _replace_metric_columns(expr, nodes, should_replace, attr):
+    # 주의) 루트 노드 자체가 치환 대상이면 replace가 아니라 새 노드를 반환해야 합니다.
+    if isinstance(expr, exp.Column) and expr.name in nodes and should_replace(nodes[expr.name]):
+        return getattr(nodes[expr.name], attr).copy()
+    for column in list(expr.find_all(exp.Column)):
+        dependency = nodes.get(column.name)
+        if dependency is not None and should_replace(dependency):
+            column.replace(getattr(dependency, attr).copy())
+    return expr
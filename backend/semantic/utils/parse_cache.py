@@ -0,0 +1,31 @@
+import vendor_setup  # noqa: F401
+from functools import lru_cache
+from typing import Optional
+
+import sqlglot
+from sqlglot import expressions as exp
+
+# manifest의 expr 문자열 종류는 manifest 크기에 비례하므로 넉넉하게 잡습니다.
+PARSE_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_one_cached(expr: str, dialect: Optional[str]) -> exp.Expression:
+    return sqlglot.parse_one(expr, read=dialect)
+
+
+def parse_expr(expr: str, dialect: Optional[str] = None) -> exp.Expression:
+    """
+    (expr, dialect) 단위로 파싱 결과를 LRU 캐시에 보관하고, 매번 복사본을 돌려줍니다.
+    pipeline은 반환된 AST를 자유롭게 replace/set 해도 캐시된 원본은 바뀌지 않습니다.
+    """
+    return _parse_one_cached(expr, dialect).copy()
+
+
+def parse_cache_info():
+    """hits, misses, maxsize, currsize를 담은 캐시 통계를 반환합니다."""
+    return _parse_one_cached.cache_info()
+
+
+def clear_parse_cache() -> None:
+    _parse_one_cached.cache_clear()
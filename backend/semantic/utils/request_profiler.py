@@ -0,0 +1,424 @@
+import contextvars
+import functools
+import hmac
+import json
+import os
+import random
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from backend.utils.logger import setup_logger
+
+
+logger = setup_logger("request_profiler")
+
+# 요청 ID로 받을 수 있는 문자 (파일 이름으로 쓰므로 경로 문자는 받지 않습니다.)
+_REQUEST_ID_RE = re.compile(r"^[A-Za-z0-9_.-]{1,64}$")
+_TRUE_VALUES = ("1", "true", "yes", "on")
+
+ARTIFACT_KINDS = {
+    "pstats": "application/octet-stream",
+    "collapsed": "text/plain; charset=utf-8",
+}
+
+_current_session: "contextvars.ContextVar[Optional[ProfileSession]]" = contextvars.ContextVar(
+    "profile_session", default=None
+)
+_thread_state = threading.local()
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+
+class _StackSampler:
+    """
+    프로파일 중인 thread들의 Python stack을 주기적으로 읽어 session에 쌓는 thread 하나 (collapsed stack 용)
+    프로파일 중인 thread가 없으면 대기만 하고, 처음 필요할 때 시작합니다.
+    """
+
+    def __init__(self, interval_s: float):
+        self.interval_s = interval_s
+        self._targets: Dict[int, Tuple["ProfileSession", str, int, Any]] = {}
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, thread_id: int, session: "ProfileSession", label: str, skip: int, code=None) -> None:
+        with self._condition:
+            self._targets[thread_id] = (session, label, skip, code)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="profile-sampler", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def remove(self, thread_id: int) -> None:
+        with self._condition:
+            self._targets.pop(thread_id, None)
+
+    def _loop(self) -> None:
+        while True:
+            with self._condition:
+                while not self._targets:
+                    self._condition.wait()
+                targets = dict(self._targets)
+            frames = sys._current_frames()
+            for thread_id, (session, label, skip, code) in targets.items():
+                frame = frames.get(thread_id)
+                stack = []
+                while frame is not None:
+                    stack.append(frame)
+                    frame = frame.f_back
+                stack.reverse()
+                # 감싼 함수 바깥(thread pool, event loop, cProfile.runcall 등)의 frame은 빼고 호출 이름을 맨 아래에 둡니다.
+                # 감싼 함수가 아직 시작 전이거나 이미 끝난 순간(프로파일러 자체 코드)의 sample은 버립니다.
+                start = skip
+                if code is not None:
+                    start = next(
+                        (index for index in range(skip, len(stack)) if stack[index].f_code is code), None
+                    )
+                if start is None or start >= len(stack):
+                    continue
+                stack = stack[start:]
+                session.add_sample(";".join([label] + [_frame_label(frame) for frame in stack]))
+            del frames, frame
+            time.sleep(self.interval_s)
+
+
+class ProfileSession:
+    """
+    프로파일링하기로 한 요청 하나. profiled()로 감싼 함수가 이 요청 안에서 불릴 때마다
+    cProfile 결과와 stack sample이 여기에 모입니다. (여러 thread에서 불려도 됩니다.)
+    """
+
+    def __init__(self, profiler: "RequestProfiler", request_id: str, label: str):
+        self.profiler = profiler
+        self.request_id = request_id
+        self.label = label
+        self.created_at = time.time()
+        self.calls: List[Dict[str, Any]] = []
+        self.profiles: List[Any] = []
+        self.samples: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def add_sample(self, stack: str) -> None:
+        with self._lock:
+            self.samples[stack] += 1
+
+    def run(self, label: str, fn: Callable[..., Any], args, kwargs) -> Any:
+        # 같은 thread에서 이미 프로파일 중이면(감싼 함수가 감싼 함수를 부르는 경우) 바깥 프로파일에 포함됩니다.
+        if getattr(_thread_state, "active", False):
+            return fn(*args, **kwargs)
+
+        import cProfile
+
+        profile = cProfile.Profile()
+        thread_id = threading.get_ident()
+        depth = 0
+        frame = sys._getframe()
+        while frame is not None:
+            depth += 1
+            frame = frame.f_back
+
+        _thread_state.active = True
+        code = getattr(getattr(fn, "__func__", fn), "__code__", None)
+        self.profiler.sampler.add(thread_id, self, label, depth, code)
+        started = time.perf_counter()
+        try:
+            return profile.runcall(fn, *args, **kwargs)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.profiler.sampler.remove(thread_id)
+            _thread_state.active = False
+            with self._lock:
+                self.calls.append({"name": label, "elapsed_ms": round(elapsed_ms, 3)})
+                self.profiles.append(profile)
+
+
+def profiled(name: Optional[str] = None):
+    """
+    요청 프로파일링 대상 함수에 붙이는 decorator (prepare_smq_to_sql, lint_semantic_models, LangGraphAgent 노드 등)
+    프로파일링 중인 요청이 아니면 원래 함수를 그대로 부릅니다. (ContextVar 조회 한 번)
+    """
+
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            session = _current_session.get()
+            if session is None:
+                return fn(*args, **kwargs)
+            return session.run(label, fn, args, kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class RequestProfiler:
+    """
+    요청 단위 on-demand 프로파일러
+
+    - sample_rate 확률로 뽑히거나, 요청이 X-Profile: 1 헤더나 ?profile=1 로 요청하면 프로파일링합니다.
+      요청에 의한 프로파일링(opt-in)은 cProfile 오버헤드와 파일 저장을 아무 클라이언트나 일으킬 수 없도록
+      allow_opt_in이 켜져 있거나, 요청이 X-Profile-Token 헤더로 opt_in_token을 보낸 경우(내부 호출)에만 받습니다.
+      sample_rate/allow_opt_in은 /semantic_model/profiles/config로 재시작 없이 바꿀 수 있습니다.
+    - 요청 안에서 profiled()로 감싼 함수 호출마다 cProfile을 켜고, 같은 thread의 stack을 interval마다 sample 합니다.
+      JoinError 분할 변환처럼 compile_pool(process)에서 실행되는 부분은 포함되지 않습니다.
+    - 요청이 끝나면 요청 ID별로 <directory>/<request_id>.pstats(cProfile 합산), .collapsed(flamegraph.pl /
+      speedscope가 읽는 "a;b;c 횟수" 형식), .json(호출별 시간, 상위 함수) 파일을 남깁니다.
+      보관 개수가 max_artifacts를 넘으면 오래된 것부터 지웁니다.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        sample_rate: float = 0.0,
+        max_artifacts: int = 100,
+        sample_interval_s: float = 0.005,
+        allow_opt_in: bool = False,
+        opt_in_token: Optional[str] = None,
+    ):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.max_artifacts = max_artifacts
+        self.allow_opt_in = allow_opt_in
+        self.opt_in_token = opt_in_token or None
+        self.sampler = _StackSampler(sample_interval_s)
+        self._artifacts: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.profiled_requests = 0
+
+    def configure(
+        self, sample_rate: Optional[float] = None, allow_opt_in: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        if sample_rate is not None:
+            if not 0.0 <= sample_rate <= 1.0:
+                raise ValueError(f"sample_rate는 0과 1 사이여야 합니다. (받은 값: {sample_rate})")
+            self.sample_rate = sample_rate
+        if allow_opt_in is not None:
+            self.allow_opt_in = allow_opt_in
+        logger.info(
+            "request profiler configured: sample_rate=%s, allow_opt_in=%s", self.sample_rate, self.allow_opt_in
+        )
+        return self.stats()
+
+    def is_trusted(self, token: Optional[str]) -> bool:
+        """token이 opt_in_token과 같으면 True (opt_in_token이 설정되지 않았으면 항상 False)"""
+        if not self.opt_in_token or not token:
+            return False
+        return hmac.compare_digest(token.encode("utf-8"), self.opt_in_token.encode("utf-8"))
+
+    def start(
+        self,
+        request_id: Optional[str] = None,
+        requested: bool = False,
+        label: str = "",
+        token: Optional[str] = None,
+    ) -> Optional[ProfileSession]:
+        """이 요청을 프로파일링할지 정합니다. 프로파일링하지 않으면 None"""
+        if not (requested and (self.allow_opt_in or self.is_trusted(token))):
+            if self.sample_rate <= 0.0 or random.random() >= self.sample_rate:
+                return None
+        if not request_id or not _REQUEST_ID_RE.match(request_id):
+            request_id = uuid.uuid4().hex
+        return ProfileSession(self, request_id, label)
+
+    @staticmethod
+    def activate(session: Optional[ProfileSession]) -> contextvars.Token:
+        return _current_session.set(session)
+
+    @staticmethod
+    def deactivate(token: contextvars.Token) -> None:
+        _current_session.reset(token)
+
+    def finish(self, session: ProfileSession) -> Optional[Dict[str, Any]]:
+        """
+        session의 결과를 파일로 저장하고 요약(meta)을 반환합니다.
+        요청 안에서 감싼 함수가 한 번도 불리지 않았으면 아무것도 남기지 않고 None
+        """
+        with session._lock:
+            profiles = list(session.profiles)
+            calls = list(session.calls)
+            samples = dict(session.samples)
+        if not profiles:
+            return None
+
+        import pstats
+
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+
+        top_functions = []
+        for (filename, line, function), (_, calls_count, tottime, cumtime, _) in sorted(
+            stats.stats.items(), key=lambda item: item[1][3], reverse=True
+        )[:20]:
+            top_functions.append(
+                {
+                    "function": f"{function} ({os.path.basename(filename)}:{line})",
+                    "calls": calls_count,
+                    "tottime_ms": round(tottime * 1000, 3),
+                    "cumtime_ms": round(cumtime * 1000, 3),
+                }
+            )
+
+        meta = {
+            "request_id": session.request_id,
+            "label": session.label,
+            "created_at": session.created_at,
+            "total_ms": round(sum(call["elapsed_ms"] for call in calls), 3),
+            "calls": calls,
+            "samples": sum(samples.values()),
+            "top_functions": top_functions,
+            "artifacts": sorted(ARTIFACT_KINDS),
+        }
+
+        os.makedirs(self.directory, exist_ok=True)
+        stats.dump_stats(self._path(session.request_id, "pstats"))
+        with open(self._path(session.request_id, "collapsed"), "w", encoding="utf-8") as f:
+            for stack, count in sorted(samples.items()):
+                f.write(f"{stack} {count}\n")
+        with open(self._path(session.request_id, "json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+
+        with self._lock:
+            self.profiled_requests += 1
+            self._artifacts.pop(session.request_id, None)
+            self._artifacts[session.request_id] = meta
+            evicted = []
+            while len(self._artifacts) > self.max_artifacts:
+                evicted.append(self._artifacts.popitem(last=False)[0])
+        for request_id in evicted:
+            self._remove_files(request_id)
+        logger.info(
+            "request profiled: %s (%s, %.1f ms, %d calls)", session.request_id, session.label, meta["total_ms"], len(calls)
+        )
+        return meta
+
+    def get(self, request_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._artifacts.get(request_id)
+
+    def artifacts(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            metas = list(self._artifacts.values())
+        return [
+            {key: meta[key] for key in ("request_id", "label", "created_at", "total_ms", "samples")}
+            for meta in reversed(metas)
+        ]
+
+    def artifact_path(self, request_id: str, kind: str) -> Optional[str]:
+        if kind not in ARTIFACT_KINDS or self.get(request_id) is None:
+            return None
+        path = self._path(request_id, kind)
+        return path if os.path.exists(path) else None
+
+    def remove(self, request_id: str) -> bool:
+        with self._lock:
+            removed = self._artifacts.pop(request_id, None) is not None
+        if removed:
+            self._remove_files(request_id)
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._artifacts.clear()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "sample_rate": self.sample_rate,
+                "allow_opt_in": self.allow_opt_in,
+                "opt_in_token_configured": self.opt_in_token is not None,
+                "directory": self.directory,
+                "artifacts": len(self._artifacts),
+                "max_artifacts": self.max_artifacts,
+                "profiled_requests": self.profiled_requests,
+            }
+
+    def _path(self, request_id: str, kind: str) -> str:
+        return os.path.join(self.directory, f"{request_id}.{kind}")
+
+    def _remove_files(self, request_id: str) -> None:
+        for kind in list(ARTIFACT_KINDS) + ["json"]:
+            try:
+                os.remove(self._path(request_id, kind))
+            except FileNotFoundError:
+                pass
+
+
+class ProfilingMiddleware:
+    """
+    HTTP 요청마다 프로파일링 여부를 정하는 ASGI middleware
+    프로파일링하는 요청에는 응답 헤더 X-Profile-Id(요청 ID, X-Request-ID가 있으면 그 값)를 붙입니다.
+    """
+
+    def __init__(self, app, profiler: Optional[RequestProfiler] = None):
+        self.app = app
+        self.profiler = profiler or request_profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        requested = False
+        request_id = None
+        token = None
+        for key, value in scope.get("headers") or []:
+            if key == b"x-profile":
+                requested = value.decode("latin-1").lower() in _TRUE_VALUES
+            elif key == b"x-request-id":
+                request_id = value.decode("latin-1")
+            elif key == b"x-profile-token":
+                token = value.decode("latin-1")
+        query_string = scope.get("query_string") or b""
+        if not requested and b"profile" in query_string:
+            values = parse_qs(query_string.decode("latin-1")).get("profile") or [""]
+            requested = values[-1].lower() in _TRUE_VALUES
+
+        session = self.profiler.start(
+            request_id, requested, label=f"{scope.get('method')} {scope.get('path')}", token=token
+        )
+        if session is None:
+            return await self.app(scope, receive, send)
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers") or [])
+                headers.append((b"x-profile-id", session.request_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        import asyncio
+
+        token = self.profiler.activate(session)
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            self.profiler.deactivate(token)
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, self.profiler.finish, session)
+            except Exception as e:
+                logger.error("Failed to save profile %s: %s", session.request_id, str(e))
+
+
+request_profiler = RequestProfiler(
+    directory=os.getenv("SMQ_PROFILE_DIR", os.path.join(tempfile.gettempdir(), "smq_profiles")),
+    sample_rate=float(os.getenv("SMQ_PROFILE_SAMPLE_RATE", "0")),
+    max_artifacts=int(os.getenv("SMQ_PROFILE_MAX_ARTIFACTS", "100")),
+    sample_interval_s=float(os.getenv("SMQ_PROFILE_SAMPLE_INTERVAL_MS", "5")) / 1000,
+    allow_opt_in=os.getenv("SMQ_PROFILE_ALLOW_OPT_IN", "0").lower() in _TRUE_VALUES,
+    opt_in_token=os.getenv("SMQ_PROFILE_OPT_IN_TOKEN"),
+)
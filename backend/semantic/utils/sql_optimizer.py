@@ -0,0 +1,77 @@
+import vendor_setup  # noqa: F401
+import sqlglot
+from sqlglot import exp
+
+
+OPTIMIZE_LEVELS = ("none", "safe", "aggressive")
+
+
+def normalize_optimize_level(level) -> str:
+    """None/대소문자를 정리한 optimize level. 지원하지 않는 값이면 ValueError"""
+    level = (level or "none").lower()
+    if level not in OPTIMIZE_LEVELS:
+        raise ValueError(
+            f"Unsupported optimize level '{level}'. Available levels: {list(OPTIMIZE_LEVELS)}"
+        )
+    return level
+
+
+def optimize_sql(root: exp.Expression, dialect: str, level: str = "none") -> exp.Expression:
+    """
+    compose된 SQL AST에 vendored sqlglot optimizer 규칙 중 골라 둔 것만 적용한 새 AST를 반환한다.
+
+    - none: 그대로 반환
+    - safe: 쿼리 구조는 그대로 두고, 참조되지 않는 CTE 제거(eliminate_ctes)와 식 단순화(simplify)만 수행
+    - aggressive: 테이블/칼럼을 qualify한 뒤 subquery를 CTE로 모으고(eliminate_subqueries),
+      단순 CTE를 바깥 쿼리에 합치고(merge_subqueries), 타입 기반 정리(canonicalize)까지 수행
+
+    주의) sqlglot의 qualify()는 identifier 대소문자를 dialect 규칙으로 바꾸므로(oracle은 대문자)
+         결과 칼럼 이름이 달라집니다. 그래서 normalize_identifiers/quote_identifiers 없이 필요한 단계만 직접 호출합니다.
+    """
+    level = normalize_optimize_level(level)
+    if level == "none":
+        return root
+
+    # optimizer 모듈은 import 비용이 커서(sqlglot.optimizer 전체가 로드됨) 실제로 쓸 때만 import 합니다.
+    from sqlglot.dialects.dialect import Dialect
+    from sqlglot.optimizer.annotate_types import annotate_types
+    from sqlglot.optimizer.canonicalize import canonicalize
+    from sqlglot.optimizer.eliminate_ctes import eliminate_ctes
+    from sqlglot.optimizer.eliminate_subqueries import eliminate_subqueries
+    from sqlglot.optimizer.merge_subqueries import merge_subqueries
+    from sqlglot.optimizer.qualify_columns import (
+        pushdown_cte_alias_columns,
+        qualify_columns,
+    )
+    from sqlglot.optimizer.qualify_tables import qualify_tables
+    from sqlglot.optimizer.simplify import simplify
+    from sqlglot.schema import MappingSchema
+
+    # compose 단계에서 만든 AST는 식별자/칼럼 노드 모양이 파서 결과와 다를 수 있어서
+    # (칼럼 안의 칼럼, meta 등) 한 번 SQL로 만든 뒤 다시 파싱한 AST에 규칙을 적용합니다.
+    root = sqlglot.parse_one(root.sql(dialect=dialect), read=dialect)
+
+    # 기본 스키마는 칼럼 이름을 dialect 규칙으로 정규화하면서 AST를 바꾸므로 정규화를 끕니다.
+    schema = MappingSchema(dialect=dialect, normalize=False)
+
+    # 1) aggressive: merge 규칙이 칼럼 출처를 알 수 있도록 먼저 qualify
+    if level == "aggressive":
+        root = qualify_tables(root, dialect=dialect)
+        if Dialect.get_or_raise(dialect).PREFER_CTE_ALIAS_COLUMN:
+            root = pushdown_cte_alias_columns(root)
+        # 스키마 없이 compose된 SQL만 보므로 칼럼 출처는 FROM 절에서 추론합니다.
+        root = qualify_columns(root, schema=schema, infer_schema=True, dialect=dialect)
+        root = eliminate_subqueries(root)
+        root = merge_subqueries(root)
+
+    # 2) 공통: 참조되지 않는 CTE 제거
+    root = eliminate_ctes(root)
+
+    # 3) aggressive: 타입을 추론해 중복 cast 등을 정리
+    if level == "aggressive":
+        root = annotate_types(root, schema=schema, dialect=dialect)
+        root = canonicalize(root, dialect=dialect)
+
+    # 4) 공통: 식 단순화 (상수 접기, 중복 조건 제거 등)
+    root = simplify(root, dialect=dialect)
+    return root
@@ -0,0 +1,423 @@
+import atexit
+import contextvars
+import functools
+import json
+import os
+import queue
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.utils.logger import setup_logger
+
+
+logger = setup_logger("tracing")
+
+_current_span: "contextvars.ContextVar[Any]" = contextvars.ContextVar("trace_span", default=None)
+
+# 샘플링되지 않은 root 아래라는 표시. 이 아래의 span은 모두 no-op입니다.
+_UNSAMPLED = object()
+
+
+class _NoopSpan:
+    """tracing이 꺼져 있거나 샘플링되지 않은 경우의 span. 아무것도 하지 않습니다."""
+
+    __slots__ = ()
+    recording = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, **attributes) -> None:
+        pass
+
+    def set_error(self, message: str) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class _UnsampledSpan(_NoopSpan):
+    """샘플링되지 않은 root. 들어가 있는 동안 하위 span도 만들지 않도록 context에 표시만 합니다."""
+
+    __slots__ = ("_token",)
+
+    def __enter__(self):
+        self._token = _current_span.set(_UNSAMPLED)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _current_span.reset(self._token)
+        return False
+
+
+class Span:
+    """
+    기록 중인 span 하나
+    attribute 값으로 인자 없는 callable을 넣으면 span이 끝날 때(샘플링된 경우에만) 한 번 호출해서 값으로 씁니다.
+    """
+
+    __slots__ = (
+        "tracer", "name", "trace_id", "span_id", "parent_span_id",
+        "start_ns", "end_ns", "attributes", "status", "error", "_token",
+    )
+    recording = True
+
+    def __init__(self, tracer: "Tracer", name: str, trace_id: str, parent_span_id: Optional[str], attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = "%016x" % random.getrandbits(64)
+        self.parent_span_id = parent_span_id
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.status = "ok"
+        self.error: Optional[str] = None
+        self._token = None
+
+    def __enter__(self):
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _current_span.reset(self._token)
+        if exc is not None:
+            self.status = "error"
+            self.error = f"{exc_type.__name__}: {exc}"
+        self.end()
+        return False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+    def set_error(self, message: str) -> None:
+        """예외 없이 실패를 반환하는 함수(success=False 응답 등)의 span을 실패로 표시합니다."""
+        self.status = "error"
+        self.error = message
+
+    def end(self) -> None:
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        attributes = {}
+        for key, value in self.attributes.items():
+            if callable(value):
+                try:
+                    value = value()
+                except Exception as e:
+                    value = f"<attribute error: {e}>"
+            attributes[key] = value
+        self.attributes = attributes
+        self.tracer._enqueue(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "name": self.name,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "status": self.status,
+            "error": self.error,
+        }
+
+
+class JsonLinesSpanExporter:
+    """span 하나를 JSON 한 줄로 파일에 덧붙입니다."""
+
+    def __init__(self, path: str, service_name: str):
+        self.path = path
+        self.service_name = service_name
+
+    def export(self, spans: List[Span]) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            for span in spans:
+                record = span.to_dict()
+                record["service"] = self.service_name
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_otlp_value(item) for item in value]}}
+    return {"stringValue": value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, default=str)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items() if value is not None]
+
+
+class OtlpHttpSpanExporter:
+    """
+    OTLP/HTTP JSON 형식(POST <endpoint>, 기본 http://localhost:4318/v1/traces)으로 보냅니다.
+    OpenTelemetry Collector나 같은 형식을 받는 stand-in(backend.benchmarks.trace_collector)에 보낼 수 있습니다.
+    """
+
+    def __init__(self, endpoint: str, service_name: str, timeout_s: float = 2.0):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.timeout_s = timeout_s
+
+    def export(self, spans: List[Span]) -> None:
+        from urllib.request import Request, urlopen
+
+        payload = {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": _otlp_attributes({"service.name": self.service_name})},
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "backend.semantic"},
+                            "spans": [
+                                {
+                                    "traceId": span.trace_id,
+                                    "spanId": span.span_id,
+                                    "parentSpanId": span.parent_span_id or "",
+                                    "name": span.name,
+                                    "kind": 1,
+                                    "startTimeUnixNano": str(span.start_ns),
+                                    "endTimeUnixNano": str(span.end_ns),
+                                    "attributes": _otlp_attributes(span.attributes),
+                                    "status": (
+                                        {"code": 2, "message": span.error or ""}
+                                        if span.status == "error"
+                                        else {"code": 1}
+                                    ),
+                                }
+                                for span in spans
+                            ],
+                        }
+                    ],
+                }
+            ]
+        }
+        request = Request(
+            self.endpoint,
+            data=json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urlopen(request, timeout=self.timeout_s) as response:
+            response.read()
+
+
+class Tracer:
+    """
+    SMQ 변환/에이전트 경로의 구조화된 tracing
+
+    - sample_rate가 0이거나 exporter가 없으면 span()은 공유 no-op span을 돌려줍니다. (attribute 계산, 문자열 포맷 없음)
+    - root span(부모가 없는 span)마다 sample_rate 확률로 샘플링하고, 그 아래 span은 root의 결정을 따릅니다.
+    - 끝난 span은 queue에 넣고 background thread가 batch로 exporter에 넘깁니다. (요청 thread에서 I/O 없음)
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 0.0,
+        exporter=None,
+        batch_size: int = 256,
+        flush_interval_s: float = 1.0,
+        max_queue: int = 10000,
+    ):
+        self.sample_rate = sample_rate
+        self.exporter = exporter
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+        self.max_queue = max_queue
+        self._queue: "queue.Queue[Optional[Span]]" = queue.Queue(maxsize=max_queue)
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.exported = 0
+        self.dropped = 0
+        self.export_errors = 0
+        # span()마다 확인하므로 property 대신 configure()에서 갱신하는 속성으로 둡니다.
+        self.enabled = sample_rate > 0.0 and exporter is not None
+
+    def configure(self, sample_rate: Optional[float] = None, exporter=None) -> Dict[str, Any]:
+        if sample_rate is not None:
+            if not 0.0 <= sample_rate <= 1.0:
+                raise ValueError(f"sample_rate는 0과 1 사이여야 합니다. (받은 값: {sample_rate})")
+            self.sample_rate = sample_rate
+        if exporter is not None:
+            self.exporter = exporter
+        self.enabled = self.sample_rate > 0.0 and self.exporter is not None
+        return self.stats()
+
+    def span(self, name: str, **attributes):
+        """
+        with tracer.span("smq.parse", key=k) as span: ... 형태로 씁니다.
+        부모 span이 context에 있으면 그 trace의 하위 span이 됩니다.
+        """
+        parent = _current_span.get()
+        if parent is None:
+            if not self.enabled:
+                return NOOP_SPAN
+            if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+                return _UnsampledSpan()
+            return Span(self, name, "%032x" % random.getrandbits(128), None, attributes)
+        if parent is _UNSAMPLED:
+            return NOOP_SPAN
+        return Span(self, name, parent.trace_id, parent.span_id, attributes)
+
+    @staticmethod
+    def activate(span) -> Optional[contextvars.Token]:
+        """
+        with 문을 쓸 수 없는 경우(websocket 메시지 처리 task 등) span()으로 만든 span을 context에 넣습니다.
+        deactivate(token)로 되돌리고, span은 따로 end()로 끝냅니다.
+        """
+        if isinstance(span, Span):
+            return _current_span.set(span)
+        if isinstance(span, _UnsampledSpan):
+            return _current_span.set(_UNSAMPLED)
+        return None
+
+    @staticmethod
+    def deactivate(token: Optional[contextvars.Token]) -> None:
+        if token is not None:
+            _current_span.reset(token)
+
+    def _enqueue(self, span: Span) -> None:
+        if self._worker is None:
+            self._start_worker()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _start_worker(self) -> None:
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+                self._worker.start()
+                atexit.register(self.flush)
+
+    def _run(self) -> None:
+        while True:
+            batch: List[Span] = []
+            deadline = time.monotonic() + self.flush_interval_s
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    span = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if span is None:
+                    # flush() 요청: 지금까지 모인 것을 바로 내보냅니다.
+                    self._export(batch)
+                    batch = []
+                    self._queue.task_done()
+                    continue
+                batch.append(span)
+                self._queue.task_done()
+            self._export(batch)
+
+    def _export(self, batch: List[Span]) -> None:
+        if not batch or self.exporter is None:
+            return
+        try:
+            self.exporter.export(batch)
+            self.exported += len(batch)
+        except Exception as e:
+            self.export_errors += 1
+            # exporter가 계속 실패해도 로그가 쌓이지 않게 처음과 이후 100번마다만 남깁니다.
+            if self.export_errors % 100 == 1:
+                logger.warning("Failed to export %d spans (%d errors so far): %s", len(batch), self.export_errors, str(e))
+
+    def flush(self, timeout_s: float = 5.0) -> None:
+        """queue에 쌓인 span을 모두 내보낼 때까지 기다립니다. (프로세스 종료, 벤치마크 끝 등)"""
+        if self._worker is None:
+            return
+        try:
+            self._queue.put(None, timeout=timeout_s)
+        except queue.Full:
+            return
+        deadline = time.monotonic() + timeout_s
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "exporter": type(self.exporter).__name__ if self.exporter is not None else None,
+            "queued": self._queue.qsize(),
+            "exported": self.exported,
+            "dropped": self.dropped,
+            "export_errors": self.export_errors,
+        }
+
+
+def current_span():
+    """context의 기록 중인 span (없거나 샘플링되지 않았으면 NOOP_SPAN). 부가 attribute를 붙일 때 씁니다."""
+    span = _current_span.get()
+    return span if isinstance(span, Span) else NOOP_SPAN
+
+
+def traced(name: Optional[str] = None, **attributes):
+    """함수 호출 전체를 span 하나로 기록하는 decorator (tracing이 꺼져 있으면 ContextVar 조회 한 번)"""
+
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        span_name = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with tracer.span(span_name, **attributes):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def exporter_from_env(
+    kind: str,
+    path: str,
+    endpoint: str,
+    service_name: str,
+):
+    """SMQ_TRACE_EXPORTER 값("jsonl" | "otlp" | "none")으로 exporter를 만듭니다."""
+    kind = (kind or "none").lower()
+    if kind == "jsonl":
+        return JsonLinesSpanExporter(path, service_name)
+    if kind == "otlp":
+        return OtlpHttpSpanExporter(endpoint, service_name)
+    return None
+
+
+tracer = Tracer(
+    sample_rate=float(os.getenv("SMQ_TRACE_SAMPLE_RATE", "0")),
+    exporter=exporter_from_env(
+        os.getenv("SMQ_TRACE_EXPORTER", "jsonl"),
+        os.getenv("SMQ_TRACE_FILE", "smq_traces.jsonl"),
+        os.getenv("SMQ_TRACE_OTLP_ENDPOINT", "http://localhost:4318/v1/traces"),
+        os.getenv("SMQ_TRACE_SERVICE_NAME", "semantic-agent"),
+    ),
+)
@@ -1,9 +1,8 @@
 from typing import List
 from sqlglot import expressions as exp
-import sqlglot
-from backend.utils.logger import setup_logger
-
-logger = setup_logger("smq_parser")
+from backend.semantic.utils.manifest_index import ManifestIndex
+from backend.semantic.types.layer_plan import LayerPlan
+from backend.semantic.types.parsed_smq import ParsedSMQ
 
 ARITHMETIC_EXPRESSIONS = (
     exp.Add,
@@ -36,90 +35,51 @@ FILTER_EXPRESSIONS = (
 )
 
 
-def find_metric_by_name(metric_name, semantic_manifest):
+def find_metric_by_name(metric_name, manifest_index: ManifestIndex):
     """Semantic manifest에서 metric 이름으로 검색"""
-    logger.info("🔵 find_metric_by_name 시작 - metric_name: %s", metric_name)
-    metrics = semantic_manifest.get("metrics", [])
-    logger.info("🔵 find_metric_by_name - metrics 개수: %d", len(metrics))
-    for idx, metric in enumerate(metrics):
-        if metric["name"] == metric_name:
-            logger.info("🔵 find_metric_by_name 완료 - 찾음 (index: %d)", idx)
-            return metric
-    logger.info("🔵 find_metric_by_name 완료 - 없음")
-    return None
-
-
-def find_dimension_by_name(model_name, dimension_name, semantic_manifest):
+    return manifest_index.find_metric(metric_name)
+
+
+def find_dimension_by_name(model_name, dimension_name, manifest_index: ManifestIndex):
     """Semantic manifest에서 dimension 이름으로 검색"""
-    logger.info("🔵 find_dimension_by_name 시작 - model_name: %s, dimension_name: %s", model_name, dimension_name)
-    models = semantic_manifest.get("semantic_models", [])
-    logger.info("🔵 find_dimension_by_name - semantic_models 개수: %d", len(models))
-    for model_idx, model in enumerate(models):
-        if model["name"] == model_name:
-            logger.info("🔵 find_dimension_by_name - 모델 찾음 (index: %d), dimensions 검색 시작", model_idx)
-            dimensions = model.get("dimensions", [])
-            logger.info("🔵 find_dimension_by_name - dimensions 개수: %d", len(dimensions))
-            for dim_idx, dimension in enumerate(dimensions):
-                if dimension["name"] == dimension_name:
-                    logger.info("🔵 find_dimension_by_name 완료 - 찾음 (model_index: %d, dim_index: %d)", model_idx, dim_idx)
-                    return dimension
-            logger.info("🔵 find_dimension_by_name - 해당 모델에서 dimension 없음")
-    logger.info("🔵 find_dimension_by_name 완료 - 없음")
-    return None
-
-
-def find_measure_by_name(model_name, measure_name, semantic_manifest):
+    return manifest_index.find_dimension(model_name, dimension_name)
+
+
+def find_measure_by_name(model_name, measure_name, manifest_index: ManifestIndex):
     """Semantic manifest에서 measure 이름으로 검색"""
-    logger.info("🔵 find_measure_by_name 시작 - model_name: %s, measure_name: %s", model_name, measure_name)
-    models = semantic_manifest.get("semantic_models", [])
-    logger.info("🔵 find_measure_by_name - semantic_models 개수: %d", len(models))
-    for model_idx, model in enumerate(models):
-        if model["name"] == model_name:
-            logger.info("🔵 find_measure_by_name - 모델 찾음 (index: %d), measures 검색 시작", model_idx)
-            measures = model.get("measures", [])
-            logger.info("🔵 find_measure_by_name - measures 개수: %d", len(measures))
-            for measure_idx, measure in enumerate(measures):
-                if measure["name"] == measure_name:
-                    logger.info("🔵 find_measure_by_name 완료 - 찾음 (model_index: %d, measure_index: %d)", model_idx, measure_idx)
-                    return measure
-            logger.info("🔵 find_measure_by_name - 해당 모델에서 measure 없음")
-    logger.info("🔵 find_measure_by_name 완료 - 없음")
-    return None
-
-
-def is_metric_in_expr(expr, semantic_manifest):
+    return manifest_index.find_measure(model_name, measure_name)
+
+
+def is_metric_in_expr(expr, manifest_index):
     idents = list(expr.find_all(exp.Identifier))
     if not idents:
         idents = list(expr.find_all(exp.Literal))
         for ident in idents:
-            metric = find_metric_by_name(ident.this, semantic_manifest)
+            metric = find_metric_by_name(ident.this, manifest_index)
             if metric:
                 return True
             continue
     for ident in idents:
-        metric = find_metric_by_name(ident.name, semantic_manifest)
+        metric = find_metric_by_name(ident.name, manifest_index)
         if metric:
             return True
         continue
     return False
 
 
-def derived_metric_in_expr(expr, semantic_manifest):
-    idents = expr.find_all(exp.Identifier)
-    for ident in idents:
-        metric = find_metric_by_name(ident.name, semantic_manifest)
-        if metric:
-            expr = metric.get("expr", None) if metric else None
-            if expr:
-                parsed_expr = sqlglot.parse_one(expr)
-                expr_idents = parsed_expr.find_all(exp.Identifier)
-                for expr_ident in expr_idents:
-                    if is_metric_in_expr(expr_ident, semantic_manifest):
-                        return True
-    return False
+def derived_metric_in_expr(expr, manifest_index):
+    """expr 안에 다른 metric을 참조하는 derived metric이 있는지 확인합니다."""
+    return any(
+        manifest_index.metric_graph.is_derived(ident.name)
+        for ident in expr.find_all(exp.Identifier)
+    )
 
 
 def append_node(smq, table, key, node):
+    # LayerPlan이면 name/alias/구조 해시 index로 중복을 확인합니다.
+    if isinstance(smq, LayerPlan):
+        return smq.append(table, key, node)
+
     if table not in smq:
         smq[table] = {}
 
@@ -144,49 +104,18 @@ def append_node(smq, table, key, node):
     return smq
 
 
-def find_table_of_column_from_original_smq(column: str, original_smq: dict):
-    for key in original_smq:
-        if key == "limit":
-            continue
-        if original_smq[key] is None:
-            continue
-        for clause in original_smq[key]:
-            if "__" in clause and column in clause:
-                parsed_cluase = sqlglot.parse_one(clause)
-                if (
-                    isinstance(parsed_cluase, exp.Alias)
-                    and parsed_cluase.alias == column
-                ):
-                    return None
-                if not isinstance(parsed_cluase, exp.Column):
-                    columns_in_pasred_cluase = parsed_cluase.find_all(exp.Column)
-                    selected_columns = [
-                        node for node in columns_in_pasred_cluase if column in node.name
-                    ]
-                    if selected_columns:
-                        if len(selected_columns) == 1:
-                            parsed_cluase = selected_columns[0]
-                        if "__" not in parsed_cluase.this.name:
-                            return None
-                extracted_name = parsed_cluase.this.name
-                table_name, splited_column_name = extracted_name.split("__", 1)
-                if column == splited_column_name:
-                    return table_name
-    return None
-
-
-def replace_from_with_real_table(base_select, semantic_manifest, dialect):
+def find_table_of_column_from_original_smq(column: str, original_smq):
+    """original_smq(ParsedSMQ 또는 SMQ dict)에서 column을 model__column으로 참조하는 model 이름을 찾습니다."""
+    if not isinstance(original_smq, ParsedSMQ):
+        original_smq = ParsedSMQ(original_smq)
+    return original_smq.find_table_of_column(column)
+
+
+def replace_from_with_real_table(base_select, manifest_index: ManifestIndex, dialect):
     table_name = base_select.args["from"].name
 
-    semantic_models = semantic_manifest.get("semantic_models", None)
-    table_info = None
-    for model in semantic_models:
-        if model["name"] != table_name:
-            continue
-        elif model["name"] == table_name:
-            table_info = model.get("node_relation", None)
-            break
-        return base_select
+    model = manifest_index.find_model(table_name)
+    table_info = model.get("node_relation", None) if model else None
 
     if not table_info:
         raise AttributeError(
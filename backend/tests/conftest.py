@@ -0,0 +1,47 @@
+"""
+pytest 공통 설정
+
+repo 루트에서 실행합니다:
+    python -m pytest -q backend/tests
+
+backend 모듈들은 `backend.` 패키지 경로와 backend 디렉터리 기준 경로(vendor_setup 등)를 함께 쓰므로 둘 다 sys.path에 넣습니다.
+"""
+import json
+import logging
+import os
+import sys
+
+import pytest
+
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_ROOT = os.path.dirname(BACKEND_DIR)
+for path in (BACKEND_DIR, REPO_ROOT):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+PLAYGROUND_MANIFEST = os.path.join(BACKEND_DIR, "playground", "semantic_manifest.json")
+DIALECTS = ("bigquery", "postgres", "oracle")
+
+
+@pytest.fixture(scope="session")
+def manifest():
+    with open(PLAYGROUND_MANIFEST, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture(autouse=True)
+def _quiet_service_logs():
+    # 실패 케이스를 일부러 만드는 테스트가 있으므로 서비스 로그(ERROR 포함)는 출력하지 않습니다.
+    logging.disable(logging.CRITICAL)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+def compile_queries(smq, manifest, dialect, **kwargs):
+    """prepare_smq_to_sql 결과의 쿼리 목록 (compile_cache는 쓰지 않음). 실패하면 AssertionError"""
+    from backend.semantic.services.smq2sql_service import prepare_smq_to_sql
+
+    result = prepare_smq_to_sql(json.loads(json.dumps(smq)), manifest, dialect, use_cache=False, **kwargs)
+    assert result.get("success"), result.get("error")
+    return result["results"]["queries"]
@@ -0,0 +1,69 @@
+import re
+
+import pytest
+
+from conftest import compile_queries
+from backend.semantic.utils.bind_params import SLOT_NAME, bind_parameters
+
+
+def _slot(index):
+    return "'" + SLOT_NAME.format(index) + "'"
+
+
+SLOT_SQL = f"SELECT a FROM t WHERE b = {_slot(0)} AND c IN ({_slot(1)}, {_slot(0)})"
+
+
+@pytest.mark.parametrize(
+    "dialect, expected",
+    [
+        ("postgres", "SELECT a FROM t WHERE b = %s AND c IN (%s, %s)"),
+        ("redshift", "SELECT a FROM t WHERE b = %s AND c IN (%s, %s)"),
+        ("oracle", "SELECT a FROM t WHERE b = :1 AND c IN (:2, :3)"),
+        ("tsql", "SELECT a FROM t WHERE b = @p1 AND c IN (@p2, @p3)"),
+        ("bigquery", "SELECT a FROM t WHERE b = ? AND c IN (?, ?)"),
+        ("duckdb", "SELECT a FROM t WHERE b = ? AND c IN (?, ?)"),
+        (None, "SELECT a FROM t WHERE b = ? AND c IN (?, ?)"),
+    ],
+)
+def test_placeholder_per_paramstyle(dialect, expected):
+    sql, params = bind_parameters(SLOT_SQL, ["x", 3], dialect)
+    assert sql == expected
+    # 같은 slot이 두 번 나오면 값도 placeholder 순서대로 두 번 들어갑니다.
+    assert params == ["x", 3, "x"]
+
+
+def test_pyformat_escapes_percent():
+    sql, params = bind_parameters(f"SELECT a FROM t WHERE b LIKE 'x%' AND c = {_slot(0)}", [1], "postgres")
+    assert sql == "SELECT a FROM t WHERE b LIKE 'x%%' AND c = %s"
+    assert params == [1]
+
+
+def test_no_slots_leaves_sql_unchanged():
+    assert bind_parameters("SELECT 1", [], "oracle") == ("SELECT 1", [])
+
+
+PLACEHOLDER_RE = {
+    "postgres": re.compile(r"%s"),
+    "oracle": re.compile(r":\d+"),
+    "bigquery": re.compile(r"\?"),
+}
+
+
+@pytest.mark.parametrize("dialect", sorted(PLACEHOLDER_RE))
+def test_parameterized_compile_binds_filter_literals(manifest, dialect):
+    smq = {
+        "metrics": ["total_acco_bal", "deposit__gds_type"],
+        "group_by": ["deposit__gds_type"],
+        "filters": ["deposit__gds_type = 'A'", "deposit__base_dt >= '20240101'"],
+        "limit": 10,
+    }
+    (query,) = compile_queries(smq, manifest, dialect, parameterize=True)
+    sql = query["query"]
+    assert "'A'" not in sql and "'20240101'" not in sql and "__smq_slot_" not in sql
+    assert len(PLACEHOLDER_RE[dialect].findall(sql)) == len(query["params"])
+    assert sorted(query["params"]) == ["20240101", "A"]
+    # LIMIT 값은 bind 변수로 바꾸지 않습니다.
+    assert "10" in sql
+
+    (inlined,) = compile_queries(smq, manifest, dialect)
+    assert inlined["metadata"] == query["metadata"]
@@ -0,0 +1,98 @@
+import copy
+import json
+
+import pytest
+
+from backend.semantic.services.compile_cache import CompileCache, compile_cache
+from backend.semantic.services.smq2sql_service import prepare_smq_to_sql
+
+
+SMQ = {
+    "metrics": ["total_acco_bal", "deposit__gds_type"],
+    "group_by": ["deposit__gds_type"],
+    "filters": ["deposit__gds_type = 'A'"],
+}
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    compile_cache.clear()
+    yield
+    compile_cache.clear()
+
+
+def _cached_compile(smq, manifest, dialect, **kwargs):
+    result = prepare_smq_to_sql(json.loads(json.dumps(smq)), manifest, dialect, **kwargs)
+    assert result.get("success"), result.get("error")
+    return result["results"]["queries"]
+
+
+def test_make_key_separates_every_compile_option():
+    base = CompileCache.make_key(SMQ, "m1", "postgres", True, "none", False)
+    variants = [
+        CompileCache.make_key(SMQ, "m2", "postgres", True, "none", False),
+        CompileCache.make_key(SMQ, "m1", "bigquery", True, "none", False),
+        CompileCache.make_key(SMQ, "m1", "postgres", False, "none", False),
+        CompileCache.make_key(SMQ, "m1", "postgres", True, "safe", False),
+        CompileCache.make_key(SMQ, "m1", "postgres", True, "none", True),
+        CompileCache.make_key({**SMQ, "filters": ["deposit__gds_type = 'B'"]}, "m1", "postgres", True, "none", False),
+    ]
+    assert len({base, *variants}) == len(variants) + 1
+
+
+def test_make_key_ignores_whitespace_and_filter_order():
+    smq = {**SMQ, "filters": ["deposit__base_dt >= '20240101'", "deposit__gds_type = 'A'"]}
+    reordered = {
+        **SMQ,
+        "filters": ["deposit__gds_type  =  'A'", " deposit__base_dt >= '20240101'"],
+    }
+    assert CompileCache.make_key(smq, "m1", "postgres", True) == CompileCache.make_key(
+        reordered, "m1", "postgres", True
+    )
+    # 따옴표 안의 공백은 값이므로 정규화하지 않습니다.
+    spaced = {**SMQ, "filters": ["deposit__gds_type = 'A '"]}
+    assert CompileCache.make_key(SMQ, "m1", "postgres", True) != CompileCache.make_key(
+        spaced, "m1", "postgres", True
+    )
+
+
+def test_cache_separates_dialects(manifest):
+    bigquery = _cached_compile(SMQ, manifest, "bigquery")
+    postgres = _cached_compile(SMQ, manifest, "postgres")
+    assert bigquery[0]["query"] != postgres[0]["query"]
+    assert _cached_compile(SMQ, manifest, "bigquery") == bigquery
+    assert _cached_compile(SMQ, manifest, "postgres") == postgres
+    assert compile_cache.stats()["hits"] == 2
+
+
+def test_cache_hit_returns_bind_params_of_its_own_request(manifest):
+    first = _cached_compile(SMQ, manifest, "postgres", parameterize=True)
+    other = _cached_compile({**SMQ, "filters": ["deposit__gds_type = 'B'"]}, manifest, "postgres", parameterize=True)
+    assert first[0]["query"] == other[0]["query"]
+    assert first[0]["params"] == ["A"] and other[0]["params"] == ["B"]
+
+    # cache hit도 params를 그대로 돌려주고, 인라인 결과와는 섞이지 않습니다.
+    assert _cached_compile(SMQ, manifest, "postgres", parameterize=True) == first
+    inlined = _cached_compile(SMQ, manifest, "postgres")
+    assert "params" not in inlined[0]
+    assert "'A'" in inlined[0]["query"]
+
+
+def test_cache_separates_manifests(manifest):
+    renamed = copy.deepcopy(manifest)
+    deposit = next(model for model in renamed["semantic_models"] if model["name"] == "deposit")
+    deposit["node_relation"]["alias"] = "waidp_d1010_l_v2"
+
+    original = _cached_compile(SMQ, manifest, "postgres")
+    changed = _cached_compile(SMQ, renamed, "postgres")
+    assert "waidp_d1010_l_v2" not in original[0]["query"]
+    assert "waidp_d1010_l_v2" in changed[0]["query"]
+
+
+def test_cached_results_are_copies(manifest):
+    queries = _cached_compile(SMQ, manifest, "postgres", parameterize=True)
+    queries[0]["metadata"][0]["label"] = "changed"
+    queries[0]["params"].append("leaked")
+    again = _cached_compile(SMQ, manifest, "postgres", parameterize=True)
+    assert again[0]["metadata"][0]["label"] != "changed"
+    assert again[0]["params"] == ["A"]
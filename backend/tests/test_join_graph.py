@@ -0,0 +1,69 @@
+from backend.semantic.utils.join_graph import JoinGraph
+
+
+def _model(primary=(), foreign=(), required=(), stats=None):
+    entities = [{"name": name, "type": "primary"} for name in primary]
+    entities += [
+        {"name": name, "type": "foreign", **({"required": True} if name in required else {})}
+        for name in foreign
+    ]
+    return {"entities": entities, **({"stats": stats} if stats else {})}
+
+
+MODELS = {
+    # deposit -> customer -> branch 로 이어지고, goods는 deposit에만, island는 어디에도 연결되지 않습니다.
+    "deposit": _model(primary=["acno"], foreign=["cstno", "gds_cd"], required=["cstno"]),
+    "customer": _model(primary=["cstno"], foreign=["brcd"], stats={"row_count": 10, "distinct_counts": {"brcd": 3}}),
+    "branch": _model(primary=["brcd"]),
+    "goods": _model(primary=["gds_cd"]),
+    "island": _model(primary=["island_id"]),
+}
+
+
+def test_edges_follow_foreign_to_primary():
+    graph = JoinGraph(MODELS)
+    assert graph.join_path("deposit", "customer") == ("deposit", "customer", [("cstno", "cstno")])
+    # 반대 방향으로 물어도 foreign 쪽이 lhm 입니다.
+    assert graph.join_path("customer", "deposit") == ("deposit", "customer", [("cstno", "cstno")])
+    assert graph.join_path("deposit", "branch") is None
+    assert graph.has_edge("goods", "deposit") and not graph.has_edge("goods", "branch")
+
+
+def test_required_joins():
+    graph = JoinGraph(MODELS)
+    assert graph.is_required("deposit", "customer")
+    assert not graph.is_required("deposit", "goods")
+    assert not graph.is_required("customer", "deposit")
+
+
+def test_components_and_shortest_path():
+    graph = JoinGraph(MODELS)
+    assert graph.same_component(["deposit", "branch", "goods"])
+    assert not graph.same_component(["deposit", "island"])
+    assert graph.shortest_path("goods", "branch") == ["goods", "deposit", "customer", "branch"]
+    assert graph.shortest_path("deposit", "deposit") == ["deposit"]
+    assert graph.shortest_path("deposit", "island") is None
+    assert graph.shortest_path("deposit", "unknown") is None
+
+
+def test_shortest_paths_are_cached_per_source():
+    graph = JoinGraph(MODELS)
+    graph.shortest_path("goods", "branch")
+    parents = graph._paths_from["goods"]
+    assert graph.shortest_path("goods", "customer") == ["goods", "deposit", "customer"]
+    assert graph._paths_from["goods"] is parents
+
+
+def test_stats():
+    graph = JoinGraph(MODELS)
+    assert graph.row_counts == {"customer": 10}
+    assert graph.distinct_count("customer", "brcd") == 3
+    assert graph.distinct_count("deposit", "acno") is None
+
+
+def test_manifest_index_builds_graph_once(manifest):
+    from backend.semantic.utils import ensure_manifest_index
+
+    index = ensure_manifest_index(manifest)
+    assert ensure_manifest_index(index) is index
+    assert index.join_graph.join_path("deposit", "branch") is not None
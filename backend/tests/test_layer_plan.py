@@ -0,0 +1,74 @@
+import vendor_setup  # noqa: F401
+import sqlglot
+from sqlglot import exp
+
+from backend.semantic.types.layer_plan import ClauseNodes, Layer, LayerPlan
+
+
+def _node(sql):
+    return sqlglot.parse_one(sql)
+
+
+def test_append_skips_same_name_alias_or_structure():
+    plan = LayerPlan()
+    plan.append("deposit", "metrics", _node("acco_bal"))
+    plan.append("deposit", "metrics", _node("acco_bal"))  # 같은 이름
+    plan.append("deposit", "metrics", _node("SUM(x) AS total"))
+    plan.append("deposit", "metrics", _node("MAX(y) AS total"))  # 같은 alias
+    plan.append("deposit", "metrics", _node("a + b"))
+    plan.append("deposit", "metrics", _node("a + b"))  # 같은 구조
+    assert [node.sql() for node in plan["deposit"]["metrics"]] == ["acco_bal", "SUM(x) AS total", "a + b"]
+
+
+def test_limit_is_overwritten():
+    plan = LayerPlan()
+    plan.append("agg", "limit", 10)
+    plan.append("agg", "limit", 20)
+    assert plan["agg"]["limit"] == 20
+
+
+def test_lists_are_wrapped_and_missing_layers_created():
+    plan = LayerPlan()
+    plan["deposit"]["metrics"] = [_node("a")]
+    plan["agg"] = {"groups": [_node("b")]}
+    assert isinstance(plan["deposit"]["metrics"], ClauseNodes)
+    assert isinstance(plan["agg"], Layer) and isinstance(plan["agg"]["groups"], ClauseNodes)
+    assert plan.proj_layer_names() == ["deposit"]
+    # clause() 조회는 plan을 바꾸지 않습니다.
+    assert len(plan.clause("loan", "metrics")) == 0
+    assert "loan" not in plan
+
+
+def test_index_follows_list_changes():
+    nodes = ClauseNodes([_node("a"), _node("b AS c")])
+    assert nodes.has_name("a") and nodes.has_alias("c") and nodes.has_output_name("c")
+    nodes.remove(nodes[0])
+    assert not nodes.has_name("a")
+    nodes[0] = _node("d")
+    assert nodes.names() == {"d"} and nodes.aliases() == set()
+    nodes.extend([_node("e AS f")])
+    assert nodes.has_alias("f")
+
+
+def test_invalidate_after_in_place_node_change():
+    plan = LayerPlan()
+    plan.append("deposit", "metrics", _node("a"))
+    clause = plan["deposit"]["metrics"]
+    assert clause.has_name("a")
+
+    # node를 직접 바꾸면 index는 알 수 없으므로 invalidate_indexes() 후에 반영됩니다.
+    clause[0].set("this", exp.to_identifier("renamed"))
+    plan.invalidate_indexes()
+    assert clause.has_name("renamed")
+    assert not clause.has_name("a")
+
+
+def test_copy_is_deep():
+    plan = LayerPlan()
+    plan.append("deposit", "metrics", _node("a"))
+    plan.append("agg", "limit", 5)
+    copied = plan.copy()
+    copied["deposit"]["metrics"][0].set("this", exp.to_identifier("b"))
+    copied.append("deposit", "metrics", _node("c"))
+    assert [node.sql() for node in plan["deposit"]["metrics"]] == ["a"]
+    assert copied["agg"]["limit"] == 5
@@ -0,0 +1,65 @@
+import vendor_setup  # noqa: F401
+import sqlglot
+
+import backend.semantic.composer.composer as composer_module
+from conftest import compile_queries
+from backend.semantic.composer.pipeline import prune_unreferenced_columns_of_proj_layers
+from backend.semantic.types.layer_plan import LayerPlan
+
+
+def _plan(proj_metrics, agg_metrics, agg_groups=()):
+    plan = LayerPlan()
+    for sql in proj_metrics:
+        plan.append("deposit", "metrics", sqlglot.parse_one(sql))
+    for sql in agg_metrics:
+        plan.append("agg", "metrics", sqlglot.parse_one(sql))
+    for sql in agg_groups:
+        plan.append("agg", "groups", sqlglot.parse_one(sql))
+    return plan
+
+
+def _proj_sql(plan):
+    return [node.sql() for node in plan["deposit"]["metrics"]]
+
+
+def test_unreferenced_columns_are_dropped():
+    plan = _plan(["acco_bal", "gds_type", "cls_dt AS closed"], ["SUM(deposit.acco_bal) AS total"])
+    prune_unreferenced_columns_of_proj_layers(plan)
+    assert _proj_sql(plan) == ["acco_bal"]
+
+
+def test_alias_kept_when_its_source_column_is_referenced():
+    # agg layer가 alias(ym) 대신 원본 칼럼(deposit__base_dt)으로 같은 식을 다시 쓰는 경우입니다.
+    plan = _plan(
+        ["acco_bal", "SUBSTRING(base_dt, 1, 6) AS ym", "gds_type"],
+        ["SUM(deposit__acco_bal) AS total", "SUBSTRING(deposit__base_dt, 1, 6) AS ym"],
+        ["SUBSTRING(deposit__base_dt, 1, 6)"],
+    )
+    prune_unreferenced_columns_of_proj_layers(plan)
+    assert _proj_sql(plan) == ["acco_bal", "SUBSTRING(base_dt, 1, 6) AS ym"]
+
+
+def test_star_and_unqualified_references_keep_everything():
+    star = _plan(["acco_bal", "gds_type"], ["*"])
+    prune_unreferenced_columns_of_proj_layers(star)
+    assert _proj_sql(star) == ["acco_bal", "gds_type"]
+
+    unqualified = _plan(["acco_bal", "gds_type"], ["SUM(deposit.acco_bal) AS total", "gds_type"])
+    prune_unreferenced_columns_of_proj_layers(unqualified)
+    assert _proj_sql(unqualified) == ["acco_bal", "gds_type"]
+
+
+def test_layer_is_never_pruned_to_empty():
+    plan = _plan(["acco_bal"], ["COUNT(*) AS cnt"])
+    prune_unreferenced_columns_of_proj_layers(plan)
+    assert _proj_sql(plan) == ["acco_bal"]
+
+
+def test_derived_group_sql_is_unchanged_by_pruning(manifest, monkeypatch):
+    smq = {
+        "metrics": ["SUBSTR(deposit__base_dt, 1, 6) AS ym", "total_acco_bal"],
+        "group_by": ["SUBSTR(deposit__base_dt, 1, 6) AS ym"],
+    }
+    pruned = compile_queries(smq, manifest, "postgres")
+    monkeypatch.setattr(composer_module, "prune_unreferenced_columns_of_proj_layers", lambda plan: plan)
+    assert pruned == compile_queries(smq, manifest, "postgres")
@@ -0,0 +1,50 @@
+import pytest
+
+from conftest import DIALECTS, compile_queries
+
+
+BASE_SMQ = {"metrics": ["total_acco_bal", "deposit__gds_type"], "group_by": ["deposit__gds_type"]}
+
+
+def _sql(manifest, dialect, **smq):
+    queries = compile_queries({**BASE_SMQ, **smq}, manifest, dialect)
+    assert len(queries) == 1
+    return queries[0]["query"]
+
+
+def _main_select(sql):
+    """CTE 정의를 뺀 마지막 SELECT (join 이후에 평가되는 부분)"""
+    return sql[sql.rindex("\nSELECT"):]
+
+
+@pytest.mark.parametrize("dialect", DIALECTS)
+def test_filters_split_or_and_give_same_predicates(manifest, dialect):
+    # branch는 deposit에 LEFT JOIN 되는 쪽이라, branch 조건은 proj CTE가 아닌 join 이후 WHERE에 있어야 합니다.
+    split = _sql(manifest, dialect, filters=["branch__brn_stcd = '01'", "deposit__gds_type = 'A'"])
+    combined = _sql(manifest, dialect, filters=["branch__brn_stcd = '01' AND deposit__gds_type = 'A'"])
+
+    for sql in (split, combined):
+        assert "LEFT JOIN" in sql
+        assert "'01'" in _main_select(sql)
+        assert sql.count("'01'") == 1
+    # CTE 순서는 달라도 되지만, 조건이 평가되는 위치(join 이후 WHERE)는 같아야 합니다.
+    assert _main_select(split) == _main_select(combined)
+
+
+@pytest.mark.parametrize("dialect", DIALECTS)
+def test_driving_model_filter_stays_in_proj_cte(manifest, dialect):
+    sql = _sql(manifest, dialect, filters=["deposit__gds_type = 'A'"])
+    # 집계 전에 거르는 조건은 base CTE 안에서 평가하고, 바깥 SELECT에는 남기지 않습니다.
+    assert "'A'" not in _main_select(sql)
+    assert "'A'" in sql
+
+
+def test_deriv_filter_on_dimension_is_pushed_below_aggregation(manifest):
+    sql = _sql(
+        manifest,
+        "postgres",
+        filters=["total_acco_bal > 100 AND deposit__gds_type = 'A'"],
+    )
+    # 집계 결과 조건은 집계 이후에, dimension 조건은 집계 이전에 평가합니다.
+    assert "total_acco_bal > 100" in _main_select(sql)
+    assert "'A'" not in _main_select(sql)
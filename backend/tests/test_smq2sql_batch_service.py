@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from backend.semantic.services.compile_pool import DEFAULT_MAX_WORKERS, shutdown_compile_pool
+from backend.semantic.services.smq2sql_batch_service import compile_many
+from backend.semantic.services.smq2sql_service import prepare_smq_to_sql
+
+
+SMQS = [
+    {"metrics": ["total_account_count"]},
+    {"metrics": ["total_acco_bal", "deposit__gds_type"], "group_by": ["deposit__gds_type"]},
+    {"metrics": ["no_such_metric"]},
+    {"metrics": ["total_acco_bal", "total_tax_inv_amt", "deposit__base_dt"], "group_by": ["deposit__base_dt"]},
+    {"metrics": ["avg_tax_inv_unit_price", "tax_inv__com_nm"], "group_by": ["tax_inv__com_nm"]},
+]
+
+
+def _expected(manifest, dialect):
+    return [
+        prepare_smq_to_sql(json.loads(json.dumps(smq)), manifest, dialect, use_cache=False)
+        for smq in SMQS
+    ]
+
+
+def _comparable(results):
+    return [result.get("results") if result.get("success") else False for result in results]
+
+
+def test_sequential_batch_keeps_order_and_per_item_errors(manifest):
+    results = compile_many(json.loads(json.dumps(SMQS)), manifest, "postgres", max_workers=1)
+    assert [result["success"] for result in results] == [True, True, False, True, True]
+    assert _comparable(results) == _comparable(_expected(manifest, "postgres"))
+
+
+@pytest.mark.skipif(DEFAULT_MAX_WORKERS < 2, reason="SMQ_COMPILE_WORKERS가 2 이상이어야 process pool을 씁니다.")
+def test_parallel_batch_matches_sequential(manifest):
+    try:
+        results = compile_many(json.loads(json.dumps(SMQS)), manifest, "bigquery", max_workers=2)
+    finally:
+        shutdown_compile_pool()
+    assert _comparable(results) == _comparable(_expected(manifest, "bigquery"))
+
+
+def test_invalid_manifest_fails_every_item():
+    results = compile_many(SMQS[:2], "{not json", "postgres")
+    assert len(results) == 2
+    assert all(not result["success"] and result["error"] for result in results)
+
+
+def test_empty_batch():
+    assert compile_many([], None) == []
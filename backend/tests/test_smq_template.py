@@ -0,0 +1,81 @@
+import pytest
+
+from conftest import DIALECTS, compile_queries
+from backend.semantic.services.smq_template import SMQTemplateRegistry, render_literal
+
+
+TEMPLATE_SMQ = {
+    "metrics": ["total_acco_bal", "deposit__gds_type"],
+    "group_by": ["deposit__gds_type"],
+    "filters": ["deposit__gds_type = :gds", "deposit__base_dt >= :from_dt"],
+}
+
+
+def _literal_smq(gds, from_dt):
+    return {
+        **TEMPLATE_SMQ,
+        "filters": [f"deposit__gds_type = {gds}", f"deposit__base_dt >= {from_dt}"],
+    }
+
+
+@pytest.fixture
+def registry():
+    return SMQTemplateRegistry()
+
+
+@pytest.mark.parametrize("dialect", DIALECTS)
+def test_rendered_template_matches_direct_compile(manifest, registry, dialect):
+    template = registry.register(TEMPLATE_SMQ, manifest, dialect=dialect)
+    assert set(template.params) == {"gds", "from_dt"}
+
+    for gds, from_dt in (("A", "20240101"), ("B", "20231231")):
+        result = registry.render(template.template_id, {"gds": gds, "from_dt": from_dt})
+        assert result["success"], result.get("error")
+        expected = compile_queries(_literal_smq(f"'{gds}'", f"'{from_dt}'"), manifest, dialect)
+        assert result["results"]["queries"] == expected
+
+
+def test_register_is_idempotent(manifest, registry):
+    first = registry.register(TEMPLATE_SMQ, manifest, dialect="postgres")
+    again = registry.register(dict(TEMPLATE_SMQ), manifest, dialect="postgres")
+    other_dialect = registry.register(TEMPLATE_SMQ, manifest, dialect="oracle")
+    assert again is first
+    assert other_dialect.template_id != first.template_id
+    assert registry.stats()["count"] == 2
+
+
+def test_list_values_and_quote_escaping(manifest, registry):
+    smq = {**TEMPLATE_SMQ, "filters": ["deposit__gds_type IN (:codes)"]}
+    template = registry.register(smq, manifest, dialect="postgres")
+    (query,) = template.render({"codes": ["A", "O'B"]})
+    assert "IN ('A', 'O''B')" in query["query"]
+
+
+def test_render_rejects_bad_values(manifest, registry):
+    template = registry.register(
+        TEMPLATE_SMQ, manifest, dialect="postgres", param_types={"gds": "string"}
+    )
+    assert not registry.render(template.template_id, {"gds": "A"})["success"]  # from_dt 누락
+    assert not registry.render(template.template_id, {"gds": 1, "from_dt": "x"})["success"]  # 타입 불일치
+    assert not registry.render(template.template_id, {"gds": "A", "from_dt": "x", "extra": 1})["success"]
+    assert not registry.render("unknown", {"gds": "A", "from_dt": "x"})["success"]
+
+
+@pytest.mark.parametrize(
+    "value, dialect, expected",
+    [
+        (None, "postgres", "NULL"),
+        (True, "postgres", "TRUE"),
+        (3, "oracle", "3"),
+        (1.5, "bigquery", "1.5"),
+        ("it's", "postgres", "'it''s'"),
+        ("it's", "bigquery", "'it\\'s'"),
+    ],
+)
+def test_render_literal(value, dialect, expected):
+    assert render_literal(value, dialect) == expected
+
+
+def test_render_literal_rejects_non_finite():
+    with pytest.raises(ValueError):
+        render_literal(float("nan"), "postgres")
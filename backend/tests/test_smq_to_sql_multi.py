@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+from conftest import DIALECTS, compile_queries
+from backend.semantic.services.smq2sql_service import prepare_smq_to_sql_multi
+
+
+CASES = [
+    {"metrics": ["total_acco_bal / total_account_count AS per_acct"]},
+    {"metrics": ["SUM(deposit__acco_bal) AS s", "deposit__gds_type"], "group_by": ["deposit__gds_type"]},
+    {
+        "metrics": ["total_acco_bal", "deposit__base_dt"],
+        "group_by": ["deposit__base_dt"],
+        "filters": ["deposit__base_dt IN (SELECT MAX(deposit__base_dt) FROM deposit)"],
+    },
+    {
+        "metrics": ["total_acco_bal", "branch__brn_stcd", "goods__dep_gds_gpcd"],
+        "group_by": ["branch__brn_stcd", "goods__dep_gds_gpcd"],
+        "filters": ["deposit__base_dt = '20240131'"],
+    },
+    {"metrics": ["total_acco_bal", "total_tax_inv_amt", "deposit__base_dt"], "group_by": ["deposit__base_dt"]},
+]
+
+
+def _multi(smq, manifest, dialects, **kwargs):
+    result = prepare_smq_to_sql_multi(json.loads(json.dumps(smq)), manifest, list(dialects), **kwargs)
+    assert result["success"], result.get("error")
+    return result["results"]
+
+
+@pytest.mark.parametrize("smq", CASES)
+@pytest.mark.parametrize("first", DIALECTS)
+def test_multi_matches_single_dialect_compile(manifest, smq, first):
+    # 요청 순서(첫 dialect)와 상관없이 dialect마다 단일 dialect 변환과 byte 단위로 같아야 합니다.
+    dialects = [first] + [dialect for dialect in DIALECTS if dialect != first]
+    results = _multi(smq, manifest, dialects)
+    for dialect in DIALECTS:
+        assert results[dialect]["success"], results[dialect].get("error")
+        assert results[dialect]["results"]["queries"] == compile_queries(smq, manifest, dialect)
+
+
+@pytest.mark.parametrize("source", DIALECTS)
+def test_subquery_tables_are_quoted_by_render_dialect(manifest, source):
+    # source_dialect로 한 번 compose한 plan이어도 subquery 안의 실제 테이블 quote는 출력 dialect를 따릅니다.
+    results = _multi(CASES[2], manifest, DIALECTS, source_dialect=source)
+    for dialect in DIALECTS:
+        sql = results[dialect]["results"]["queries"][0]["query"]
+        if dialect == "bigquery":
+            assert "FROM `waidp_d1010_l`" in sql
+        else:
+            assert "waidp_d1010_l" in sql
+            assert "`waidp_d1010_l`" not in sql and '"waidp_d1010_l"' not in sql
+
+
+@pytest.mark.parametrize("source", DIALECTS)
+def test_source_dialect_output_matches_single_dialect_compile(manifest, source):
+    for smq in CASES:
+        results = _multi(smq, manifest, DIALECTS, source_dialect=source)
+        assert results[source]["results"]["queries"] == compile_queries(smq, manifest, source)